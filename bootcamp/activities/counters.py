@@ -0,0 +1,147 @@
+"""Denormalized counters kept on ``Feed``, ``Question`` and ``Answer``.
+
+The counters are adjusted in place with ``F()`` expressions, so concurrent
+likes, votes or comments never overwrite each other and no ``COUNT(*)`` is
+needed on every click. ``reconcile`` recounts everything from the source
+tables and is meant to be run periodically through the
+``reconcile_counters`` management command.
+
+Models with a ``counters_version`` field get it stamped with the current
+time, in milliseconds, whenever one of their counters changes, so clients
+can ask only for the counters changed since the ``version`` they last
+received, see ``changed_since``.
+"""
+from __future__ import unicode_literals
+
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from bootcamp.activities.models import Activity
+from bootcamp.core import events
+
+VERSION_FIELD = 'counters_version'
+
+
+def new_version():
+    return int(time.time() * 1000)
+
+
+def has_version(model):
+    return any(field.name == VERSION_FIELD
+               for field in model._meta.concrete_fields)
+
+
+def _stamp(model, changes):
+    if has_version(model):
+        changes[VERSION_FIELD] = new_version()
+    return changes
+
+
+def changed_since(queryset, fields, version=None):
+    """Returns the ``version`` to ask the next changes from and the rows of
+    ``queryset`` whose counters changed after ``version``, every row when it
+    is ``None``, as ``(id, <fields>...)`` tuples. The next version is taken
+    before reading, minus ``COUNTERS_VERSION_MARGIN`` milliseconds to cover
+    the clock skew between the workers and the transactions still running,
+    so a change may be sent twice but is never missed.
+    """
+    next_version = new_version() - getattr(
+        settings, 'COUNTERS_VERSION_MARGIN', 5000)
+    if version is not None:
+        queryset = queryset.filter(**{
+            '{0}__gt'.format(VERSION_FIELD): int(version)})
+    return next_version, list(queryset.order_by().values_list('id', *fields))
+
+
+def increment(instance, field, delta=1):
+    """Atomically adds ``delta`` to the ``field`` counter of ``instance``,
+    stores the new value on the instance and returns it.
+    """
+    model = type(instance)
+    with transaction.atomic():
+        model.objects.filter(pk=instance.pk).update(
+            **_stamp(model, {field: F(field) + delta}))
+        value = model.objects.filter(pk=instance.pk).values_list(
+            field, flat=True).get()
+
+    setattr(instance, field, value)
+    events.publish(events.GLOBAL_CHANNEL, {
+        'type': 'counter',
+        'model': model._meta.model_name,
+        'id': instance.pk,
+        'field': field,
+        'value': value,
+        })
+    return value
+
+
+def decrement(instance, field, delta=1):
+    return increment(instance, field, -delta)
+
+
+def vote_value(activity_type):
+    if activity_type == Activity.UP_VOTE:
+        return 1
+
+    elif activity_type == Activity.DOWN_VOTE:
+        return -1
+
+    return 0
+
+
+def _count_by(queryset, field):
+    return dict(queryset.values_list(field).annotate(Count('id')).order_by())
+
+
+def _reconcile(model, fields, expected):
+    fixed = 0
+    for row in model.objects.values_list('id', *fields).iterator():
+        pk, values = row[0], dict(zip(fields, row[1:]))
+        changes = {}
+        for field in fields:
+            value = expected[field].get(pk, 0)
+            if values[field] != value:
+                changes[field] = value
+
+        if changes:
+            model.objects.filter(pk=pk).update(**_stamp(model, changes))
+            fixed += 1
+
+    return fixed
+
+
+def reconcile():
+    """Recounts every counter from the ``Activity`` and ``Feed`` tables and
+    fixes the rows which drifted. Returns the number of rows fixed.
+    """
+    Feed = apps.get_model('feeds', 'Feed')
+    Question = apps.get_model('questions', 'Question')
+    Answer = apps.get_model('questions', 'Answer')
+    activities = Activity.objects.all()
+    up_votes = activities.filter(activity_type=Activity.UP_VOTE)
+    down_votes = activities.filter(activity_type=Activity.DOWN_VOTE)
+
+    def votes(field):
+        counted = _count_by(up_votes.exclude(**{field: None}), field)
+        for pk, count in _count_by(down_votes.exclude(**{field: None}),
+                                   field).items():
+            counted[pk] = counted.get(pk, 0) - count
+        return counted
+
+    fixed = _reconcile(Feed, ['likes', 'comments'], {
+        'likes': _count_by(activities.filter(
+            activity_type=Activity.LIKE).exclude(feed=None), 'feed'),
+        'comments': _count_by(Feed.objects.exclude(parent=None), 'parent'),
+        })
+    fixed += _reconcile(Question, ['votes', 'favorites'], {
+        'votes': votes('question'),
+        'favorites': _count_by(activities.filter(
+            activity_type=Activity.FAVORITE).exclude(question=None),
+                               'question'),
+        })
+    fixed += _reconcile(Answer, ['votes'], {'votes': votes('answer')})
+    return fixed
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.activities import counters
+
+
+class Command(BaseCommand):
+    help = ('Recounts the likes, comments, votes and favorites counters and '
+            'fixes the ones which drifted. Meant to be run periodically, '
+            'e.g. from cron.')
+
+    def handle(self, *args, **options):
+        fixed = counters.reconcile()
+        self.stdout.write('Fixed the counters of {0} rows.'.format(fixed))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.activities.models import Notification
+
+
+class Command(BaseCommand):
+    help = ('Stores the HTML of the notifications which do not have it yet. '
+            'With --all, renders again every notification, e.g. to show '
+            'the current names of the users.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', default=False)
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        notifications = Notification.objects.select_related(
+            'from_user__profile').order_by('pk')
+        if options['all']:
+            Notification.objects.update(html='')
+        else:
+            notifications = notifications.filter(html='')
+
+        count = 0
+        last = 0
+        while True:
+            batch = Notification.hydrate(list(notifications.filter(
+                pk__gt=last)[:options['batch_size']]))
+            if not batch:
+                break
+
+            for notification in batch:
+                Notification.objects.filter(pk=notification.pk).update(
+                    html=notification.render())
+            count += len(batch)
+            last = batch[-1].pk
+
+        self.stdout.write('Rendered {0} notifications.'.format(count))
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:23
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicated_activities(apps, schema_editor):
+    Activity = apps.get_model('activities', 'Activity')
+    for target in ('feed', 'question', 'answer'):
+        duplicates = Activity.objects.exclude(**{target: None}).values(
+            'activity_type', target, 'user').annotate(
+                first=Min('id'), total=Count('id')).filter(
+                    total__gt=1).order_by()
+        for duplicate in duplicates:
+            Activity.objects.filter(
+                activity_type=duplicate['activity_type'],
+                user=duplicate['user'],
+                **{target: duplicate[target]}).exclude(
+                    id=duplicate['first']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('activities', '0002_auto_20170701_2036'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicated_activities,
+                             migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='activity',
+            unique_together=set([('activity_type', 'feed', 'user'), ('activity_type', 'question', 'user'), ('activity_type', 'answer', 'user')]),
+        ),
+    ]
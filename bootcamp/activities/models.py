@@ -1,14 +1,22 @@
 from __future__ import unicode_literals
 import json
+from datetime import timedelta
 
 from django.db.models.functions import TruncMonth, TruncDay
 from django.db.models import Count
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.html import escape
 
+from bootcamp.core import events, jobs
+from bootcamp.core.deletion import delete_rows
+
 
 @python_2_unicode_compatible
 class Activity(models.Model):
@@ -33,6 +41,13 @@ class Activity(models.Model):
     class Meta:
         verbose_name = 'Activity'
         verbose_name_plural = 'Activities'
+        # One like, favorite or vote of each type per user and target. The
+        # indexes also serve the (activity_type, target) lookups.
+        unique_together = (
+            ('activity_type', 'feed', 'user'),
+            ('activity_type', 'question', 'user'),
+            ('activity_type', 'answer', 'user'),
+            )
 
     @staticmethod
     def monthly_activity(user):
@@ -112,6 +127,20 @@ class Notification(models.Model):
     _EDITED_ARTICLE_TEMPLATE = '<a href="/{0}/">{1}</a> edited your article: <a href="/article/{2}/">{3}</a>'  # noqa: E501
     _ALSO_COMMENTED_TEMPLATE = '<a href="/{0}/">{1}</a> also commentend on the post: <a href="/feeds/{2}/">{3}</a>'  # noqa: E501
 
+    # Template, related row, then attributes of the related row giving the
+    # id in the link and the summarized text of every notification type.
+    _TARGETS = {
+        LIKED: (_LIKED_TEMPLATE, 'feed', 'pk', 'post'),
+        COMMENTED: (_COMMENTED_TEMPLATE, 'feed', 'pk', 'post'),
+        FAVORITED: (_FAVORITED_TEMPLATE, 'question', 'pk', 'title'),
+        ANSWERED: (_ANSWERED_TEMPLATE, 'question', 'pk', 'title'),
+        ACCEPTED_ANSWER: (_ACCEPTED_ANSWER_TEMPLATE, 'answer', 'question_id',
+                          'description'),
+        EDITED_ARTICLE: (_EDITED_ARTICLE_TEMPLATE, 'article', 'slug',
+                         'title'),
+        ALSO_COMMENTED: (_ALSO_COMMENTED_TEMPLATE, 'feed', 'pk', 'post'),
+        }
+
     from_user = models.ForeignKey(User, related_name='+')
     to_user = models.ForeignKey(User, related_name='+')
     date = models.DateTimeField(auto_now_add=True)
@@ -122,65 +151,195 @@ class Notification(models.Model):
     notification_type = models.CharField(max_length=1,
                                          choices=NOTIFICATION_TYPES)
     is_read = models.BooleanField(default=False)
+    html = models.TextField(blank=True, editable=False)
 
     class Meta:
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ('-date',)
+        index_together = (('to_user', 'is_read'),)
 
     def __str__(self):
-        if self.notification_type == self.LIKED:
-            return self._LIKED_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.feed.pk,
-                escape(self.get_summary(self.feed.post))
-                )
-        elif self.notification_type == self.COMMENTED:
-            return self._COMMENTED_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.feed.pk,
-                escape(self.get_summary(self.feed.post))
-                )
-        elif self.notification_type == self.FAVORITED:
-            return self._FAVORITED_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.question.pk,
-                escape(self.get_summary(self.question.title))
-                )
-        elif self.notification_type == self.ANSWERED:
-            return self._ANSWERED_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.question.pk,
-                escape(self.get_summary(self.question.title))
-                )
-        elif self.notification_type == self.ACCEPTED_ANSWER:
-            return self._ACCEPTED_ANSWER_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.answer.question.pk,
-                escape(self.get_summary(self.answer.description))
-                )
-        elif self.notification_type == self.EDITED_ARTICLE:
-            return self._EDITED_ARTICLE_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.article.slug,
-                escape(self.get_summary(self.article.title))
-                )
-        elif self.notification_type == self.ALSO_COMMENTED:
-            return self._ALSO_COMMENTED_TEMPLATE.format(
-                escape(self.from_user.username),
-                escape(self.from_user.profile.get_screen_name()),
-                self.feed.pk,
-                escape(self.get_summary(self.feed.post))
-                )
-        else:
+        return self.html or self.render()
+
+    def render(self):
+        """Renders the HTML of the notification from the related rows, found
+        through the ``_TARGETS`` dispatch table.
+        """
+        template, relation, key, text = self._TARGETS.get(
+            self.notification_type, (None, None, None, None))
+        target = getattr(self, relation) if relation else None
+        if target is None:
             return 'Ooops! Something went wrong.'
 
+        return template.format(
+            escape(self.from_user.username),
+            escape(self.from_user.profile.get_screen_name()),
+            getattr(target, key),
+            escape(self.get_summary(getattr(target, text)))
+            )
+
+    @staticmethod
+    def hydrate(notifications):
+        """Loads with one query per relation the rows needed to render the
+        notifications whose HTML is not stored yet.
+        """
+        missing = {}
+        for notification in notifications:
+            target = Notification._TARGETS.get(notification.notification_type)
+            if not notification.html and target:
+                missing.setdefault(target[1], []).append(notification)
+
+        for relation, rows in missing.items():
+            field = Notification._meta.get_field(relation)
+            objects = field.related_model.objects.in_bulk(
+                set(getattr(row, field.attname) for row in rows))
+            for row in rows:
+                if getattr(row, field.attname) in objects:
+                    setattr(row, relation, objects[getattr(row,
+                                                           field.attname)])
+
+        return notifications
+
+    @staticmethod
+    def get_unread_cache_key(user_id):
+        return 'notifications:unread:{0}'.format(user_id)
+
+    @staticmethod
+    def get_unread_count(user):
+        """Returns the number of unread notifications of ``user``, counted
+        only when it is not in the cache already.
+        """
+        key = Notification.get_unread_cache_key(user.pk)
+        timeout = getattr(settings, 'NOTIFICATIONS_UNREAD_CACHE_TIMEOUT',
+                          3600)
+        cached = cache.get(key)
+        if cached is not None and cached >= 0:
+            return cached
+
+        count = Notification.objects.filter(to_user=user,
+                                            is_read=False).count()
+        if cached is None:
+            # Leaves alone a counter stored by another worker meanwhile.
+            cache.add(key, count, timeout)
+        else:
+            cache.set(key, count, timeout)
+        return count
+
+    @staticmethod
+    def add_unread(user_id, delta):
+        """Adjusts the cached unread counter of the user, if there is one.
+        A missing counter is counted again on the next read.
+        """
+        try:
+            cache.incr(Notification.get_unread_cache_key(user_id), delta)
+
+        except ValueError:
+            pass
+
+    @staticmethod
+    def get_notifications(user, before=None, limit=20, unread=False):
+        """Returns the ``limit`` latest notifications of ``user``, older
+        than the notification id ``before`` when given, ready to be
+        rendered.
+        """
+        notifications = Notification.objects.filter(
+            to_user=user).select_related('from_user__profile').order_by('-pk')
+        if unread:
+            notifications = notifications.filter(is_read=False)
+
+        if before is not None:
+            notifications = notifications.filter(pk__lt=int(before))
+
+        return Notification.hydrate(list(notifications[:limit]))
+
+    @staticmethod
+    def mark_as_read(user, notifications=None):
+        """Marks as read every unread notification of ``user``, or only
+        the given ones, with a single ``UPDATE``, and returns the number of
+        notifications marked.
+        """
+        unread = Notification.objects.filter(to_user=user, is_read=False)
+        if notifications is not None:
+            unread = unread.filter(pk__in=[n.pk for n in notifications])
+
+        read = unread.update(is_read=True)
+        if notifications is None:
+            cache.set(Notification.get_unread_cache_key(user.pk), 0, getattr(
+                settings, 'NOTIFICATIONS_UNREAD_CACHE_TIMEOUT', 3600))
+        elif read:
+            Notification.add_unread(user.pk, -read)
+        return read
+
+    @staticmethod
+    def delete_notifications(notifications):
+        """Deletes the notifications of the ``notifications`` queryset with
+        a single ``DELETE``, without loading them, adjusts the unread
+        counters of their users and returns the number deleted.
+        """
+        unread = list(notifications.filter(is_read=False).order_by(
+            ).values_list('to_user').annotate(Count('id')))
+        # The post_delete signals are not sent, the counters are adjusted
+        # once per user below instead of once per notification.
+        deleted = delete_rows(notifications)
+        for user_id, count in unread:
+            Notification.add_unread(user_id, -count)
+        return deleted
+
+    @staticmethod
+    def notify_users(notification_type, from_user, users, **target):
+        """Notifies at once every user id of ``users``, with as many
+        ``INSERT`` as batches of users. With at least
+        ``NOTIFICATIONS_ASYNC_THRESHOLD`` users, the notifications are
+        created by a worker thread instead.
+        """
+        users = list(users)
+        threshold = getattr(settings, 'NOTIFICATIONS_ASYNC_THRESHOLD', None)
+        if threshold is not None and len(users) >= threshold:
+            (relation, instance), = target.items()
+            pool = jobs.get_pool('notifications', getattr(
+                settings, 'NOTIFICATIONS_WORKERS', 1))
+            pool.submit(notify_users_job, notification_type, from_user.pk,
+                        users, relation, instance.pk)
+        else:
+            Notification.fan_out(notification_type, from_user, users,
+                                 **target)
+
+    @staticmethod
+    def fan_out(notification_type, from_user, users, **target):
+        """Creates the notifications of ``notify_users``. The users who have
+        an unread notification of the same type and target younger than
+        ``NOTIFICATIONS_COALESCE_WINDOW`` seconds get that notification
+        updated instead of a new one.
+        """
+        notification = Notification(notification_type=notification_type,
+                                    from_user=from_user, **target)
+        render_notification(Notification, notification, raw=False)
+        now = timezone.now()
+        window = getattr(settings, 'NOTIFICATIONS_COALESCE_WINDOW', 0)
+        coalesced = set()
+        if window:
+            recent = Notification.objects.filter(
+                notification_type=notification_type, is_read=False,
+                date__gte=now - timedelta(seconds=window),
+                to_user__in=users, **target).exclude(to_user=from_user)
+            coalesced = set(recent.order_by().values_list('to_user',
+                                                          flat=True))
+            recent.update(from_user=from_user, date=now,
+                          html=notification.html)
+
+        created = [user for user in users if user not in coalesced]
+        Notification.objects.bulk_create([
+            Notification(notification_type=notification_type,
+                         from_user=from_user, to_user_id=user,
+                         html=notification.html, **target)
+            for user in created], batch_size=500)
+        for user in created:
+            Notification.add_unread(user, 1)
+        for user in users:
+            events.publish(events.user_channel(user),
+                           {'type': 'notification'})
+
     def get_summary(self, value):
         summary_size = 50
         if len(value) > summary_size:
@@ -188,3 +347,41 @@ class Notification(models.Model):
 
         else:
             return value
+
+
+def notify_users_job(notification_type, from_user_id, users, relation,
+                     target_id):
+    from_user = User.objects.select_related('profile').get(pk=from_user_id)
+    model = Notification._meta.get_field(relation).related_model
+    target = model.objects.filter(pk=target_id).first()
+    if target is not None:
+        Notification.fan_out(notification_type, from_user, users,
+                             **{relation: target})
+
+
+def render_notification(sender, instance, raw, **kwargs):
+    if (not raw and instance._state.adding and not instance.html and
+            getattr(settings, 'NOTIFICATIONS_STORE_HTML', True)):
+        instance.html = instance.render()
+
+
+def count_unread_notification(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        Notification.add_unread(instance.to_user_id, 1)
+
+
+def uncount_unread_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        Notification.add_unread(instance.to_user_id, -1)
+
+
+def publish_notification(sender, instance, created, **kwargs):
+    if created:
+        events.publish(events.user_channel(instance.to_user_id),
+                       {'type': 'notification'})
+
+
+pre_save.connect(render_notification, sender=Notification)
+post_save.connect(count_unread_notification, sender=Notification)
+post_save.connect(publish_notification, sender=Notification)
+post_delete.connect(uncount_unread_notification, sender=Notification)
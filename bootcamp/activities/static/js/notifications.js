@@ -21,22 +21,37 @@ $(function () {
     return false;
   });
 
+  function show_notifications(count) {
+    if (count != "0") {
+      $("#notifications").addClass("new-notifications");
+    }
+    else {
+      $("#notifications").removeClass("new-notifications");
+    }
+  };
+
   function check_notifications() {
     $.ajax({
       url: '/notifications/check/',
       cache: false,
       success: function (data) {
-        if (data != "0") {
-          $("#notifications").addClass("new-notifications");
-        }
-        else {
-          $("#notifications").removeClass("new-notifications");
-        }
+        show_notifications(data);
       },
       complete: function () {
         window.setTimeout(check_notifications, 30000);
       }
     });
   };
-  check_notifications();
+
+  if (window.bootcamp_events) {
+    $(document).on("bootcamp:hello", function (evt, data) {
+      show_notifications(String(data.notifications));
+    });
+    $(document).on("bootcamp:notification", function () {
+      show_notifications("1");
+    });
+  }
+  else {
+    check_notifications();
+  }
 });
\ No newline at end of file
@@ -0,0 +1,110 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils.six import StringIO
+
+from bootcamp.activities import counters
+from bootcamp.activities.models import Activity
+from bootcamp.core.tests.concurrency import (allows_concurrent_connections,
+                                             post_concurrently)
+from bootcamp.feeds.models import Feed
+from bootcamp.questions.models import Answer, Question
+
+
+class TestCounters(TestCase):
+    """TestCase class to test the denormalized counters
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        self.feed = Feed.objects.create(user=self.user, post='A post')
+        self.question = Question.objects.create(
+            user=self.user, title='A Short Title',
+            description='A reaaaaally loooong content')
+        self.answer = Answer.objects.create(
+            user=self.user, question=self.question,
+            description='A reaaaaally loooong content')
+
+    def test_increment_and_decrement(self):
+        self.assertEqual(counters.increment(self.feed, 'likes', 3), 3)
+        self.assertEqual(counters.decrement(self.feed, 'likes'), 2)
+        self.assertEqual(Feed.objects.get(pk=self.feed.pk).likes, 2)
+
+    def test_increment_keeps_concurrent_updates(self):
+        stale_feed = Feed.objects.get(pk=self.feed.pk)
+        counters.increment(self.feed, 'likes')
+        self.assertEqual(counters.increment(stale_feed, 'likes'), 2)
+
+    def test_reconcile(self):
+        Activity.objects.create(activity_type=Activity.LIKE,
+                                feed=self.feed.pk, user=self.user)
+        Activity.objects.create(activity_type=Activity.DOWN_VOTE,
+                                answer=self.answer.pk, user=self.user)
+        Activity.objects.create(activity_type=Activity.FAVORITE,
+                                question=self.question.pk, user=self.user)
+        Feed.objects.create(user=self.user, post='comment', parent=self.feed)
+        Feed.objects.filter(pk=self.feed.pk).update(likes=10, comments=5)
+        call_command('reconcile_counters', stdout=StringIO())
+        feed = Feed.objects.get(pk=self.feed.pk)
+        self.assertEqual((feed.likes, feed.comments), (1, 1))
+        question = Question.objects.get(pk=self.question.pk)
+        self.assertEqual((question.votes, question.favorites), (0, 1))
+        self.assertEqual(Answer.objects.get(pk=self.answer.pk).votes, -1)
+        self.assertEqual(counters.reconcile(), 0)
+
+    def test_increment_stamps_version(self):
+        before = counters.new_version()
+        counters.increment(self.feed, 'likes')
+        version = Feed.objects.get(pk=self.feed.pk).counters_version
+        self.assertTrue(before <= version <= counters.new_version())
+        # Questions have no version, they are only pushed as events.
+        counters.increment(self.question, 'votes')
+
+    @override_settings(COUNTERS_VERSION_MARGIN=1000)
+    def test_changed_since(self):
+        other_feed = Feed.objects.create(user=self.user, post='Other post')
+        Feed.objects.filter(pk=self.feed.pk).update(counters_version=10)
+        Feed.objects.filter(pk=other_feed.pk).update(
+            likes=2, counters_version=20)
+        feeds = Feed.objects.all()
+        before = counters.new_version()
+        version, rows = counters.changed_since(feeds, ['likes', 'comments'])
+        self.assertEqual(sorted(rows), [(self.feed.pk, 0, 0),
+                                        (other_feed.pk, 2, 0)])
+        self.assertTrue(before - 1000 <= version)
+        self.assertTrue(version <= counters.new_version() - 1000)
+        version, rows = counters.changed_since(feeds, ['likes'], 10)
+        self.assertEqual(rows, [(other_feed.pk, 2)])
+        self.assertEqual(counters.changed_since(feeds, ['likes'], 20)[1], [])
+
+
+@skipUnless(allows_concurrent_connections(),
+            'Needs a test database shared by several connections')
+class TestConcurrentLikes(TransactionTestCase):
+    """Many users liking the same feed at the same time
+    """
+    users_count = 10
+
+    def setUp(self):
+        self.users = [get_user_model().objects.create_user(
+            username='user_{0}'.format(i), password='top_secret')
+                      for i in range(self.users_count)]
+        self.feed = Feed.objects.create(user=self.users[0], post='A post')
+
+    def test_concurrent_likes_are_exact(self):
+        failures = post_concurrently([
+            (user.username, '/feeds/like/', {'feed': str(self.feed.pk)})
+            for user in self.users])
+
+        self.assertEqual(failures, [])
+        self.assertEqual(Feed.objects.get(pk=self.feed.pk).likes,
+                         self.users_count)
+        self.assertEqual(Activity.objects.filter(
+            activity_type=Activity.LIKE, feed=self.feed.pk).count(),
+                         self.users_count)
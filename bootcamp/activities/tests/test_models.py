@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.six import StringIO
 
 from bootcamp.activities.models import Activity, Notification
 from bootcamp.articles.models import Article
@@ -57,6 +60,7 @@ class TestModels(TestCase):
             everybody always wants the real deal.''',
             create_user=self.user,
         )
+        cache.clear()
 
     def test_register_fav_activity(self):
         activity = Activity.objects.create(
@@ -259,3 +263,102 @@ class TestModels(TestCase):
         self.assertTrue(isinstance(notification, Notification))
         self.assertEqual(str(notification), test_string)
         self.assertNotEqual(str(notification), 'e')
+
+    def test_unread_count_is_cached(self):
+        profile = self.user.profile
+        profile.notify_liked(self.feed)
+        self.other_user.profile.notify_liked(self.feed)
+        with self.assertNumQueries(1):
+            self.assertEqual(Notification.get_unread_count(self.user), 1)
+        self.other_user.profile.notify_commented(self.feed)
+        self.other_user.profile.notify_favorited(self.question)
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.get_unread_count(self.user), 3)
+        self.other_user.profile.unotify_favorited(self.question)
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.get_unread_count(self.user), 2)
+
+    def test_mark_all_as_read(self):
+        for i in range(3):
+            Notification.objects.create(from_user=self.other_user,
+                                        to_user=self.user, feed=self.feed,
+                                        notification_type='L')
+        self.assertEqual(Notification.get_unread_count(self.user), 3)
+        with self.assertNumQueries(1):
+            self.assertEqual(Notification.mark_as_read(self.user), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(Notification.get_unread_count(self.user), 0)
+        self.assertFalse(Notification.objects.filter(
+            to_user=self.user, is_read=False).exists())
+
+    def test_mark_given_as_read(self):
+        notifications = [Notification.objects.create(
+            from_user=self.other_user, to_user=self.user, feed=self.feed,
+            notification_type='L') for i in range(3)]
+        self.assertEqual(Notification.get_unread_count(self.user), 3)
+        self.assertEqual(
+            Notification.mark_as_read(self.user, notifications[1:]), 2)
+        self.assertEqual(Notification.get_unread_count(self.user), 1)
+        self.assertEqual(list(Notification.objects.filter(
+            to_user=self.user, is_read=False)), notifications[:1])
+
+    def test_fan_out_coalesces_only_given_users(self):
+        third_user, commenter = [get_user_model().objects.create_user(
+            username=username) for username in ('third_user', 'commenter')]
+        Notification.fan_out('S', self.other_user,
+                             [self.user.pk, third_user.pk], feed=self.feed)
+        Notification.fan_out('S', commenter, [self.user.pk], feed=self.feed)
+        notifications = Notification.objects.filter(notification_type='S')
+        self.assertEqual(notifications.count(), 2)
+        self.assertEqual(notifications.get(to_user=self.user).from_user,
+                         commenter)
+        self.assertEqual(notifications.get(to_user=third_user).from_user,
+                         self.other_user)
+
+    def test_get_notifications_pages(self):
+        notifications = [Notification.objects.create(
+            from_user=self.other_user, to_user=self.user, feed=self.feed,
+            notification_type='L') for i in range(5)]
+        first_page = Notification.get_notifications(self.user, limit=3)
+        self.assertEqual(first_page, notifications[:1:-1])
+        self.assertEqual(Notification.get_notifications(
+            self.user, before=first_page[-1].pk, limit=3),
+            notifications[1::-1])
+
+    def test_html_stored_at_creation(self):
+        notification = Notification.objects.create(
+            from_user=self.user, to_user=self.other_user,
+            answer=self.answer, notification_type='W')
+        stored = Notification.objects.get(pk=notification.pk)
+        self.assertEqual(stored.html, notification.render())
+        with self.assertNumQueries(0):
+            self.assertEqual(str(stored), notification.render())
+
+    @override_settings(NOTIFICATIONS_STORE_HTML=False)
+    def test_hydrate_notifications_without_html(self):
+        targets = [('L', {'feed': self.feed}),
+                   ('F', {'question': self.question}),
+                   ('W', {'answer': self.answer}),
+                   ('E', {'article': self.article})]
+        for notification_type, target in targets * 3:
+            Notification.objects.create(
+                from_user=self.user, to_user=self.other_user,
+                notification_type=notification_type, **target)
+        self.assertFalse(Notification.objects.exclude(html='').exists())
+        with self.assertNumQueries(5):
+            notifications = Notification.get_notifications(self.other_user)
+            rendered = [str(notification) for notification in notifications]
+        self.assertEqual(len(rendered), 12)
+        self.assertEqual(rendered, [notification.render() for notification
+                                    in Notification.objects.order_by('-pk')])
+
+    def test_render_notifications_command(self):
+        notification = Notification.objects.create(
+            from_user=self.user, to_user=self.other_user, feed=self.feed,
+            notification_type='L')
+        Notification.objects.update(html='')
+        self.user.first_name = 'Test'
+        self.user.save()
+        call_command('render_notifications', stdout=StringIO())
+        self.assertIn('>Test<', Notification.objects.get(
+            pk=notification.pk).html)
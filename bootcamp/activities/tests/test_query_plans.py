@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from bootcamp.activities.models import Activity
+
+
+class TestQueryPlans(TestCase):
+    """Makes sure the hot Activity lookups are served by an index instead of
+    scanning the whole table.
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        if connection.vendor == 'postgresql':  # pragma: no cover
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def get_plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        if connection.vendor == 'sqlite':
+            explain = 'EXPLAIN QUERY PLAN '
+        else:  # pragma: no cover
+            explain = 'EXPLAIN '
+        with connection.cursor() as cursor:
+            cursor.execute(explain + sql, params)
+            return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+
+    def assertUsesIndex(self, queryset):
+        plan = self.get_plan(queryset)
+        table = Activity._meta.db_table
+        for line in plan.splitlines():
+            self.assertFalse(table in line and 'Seq Scan' in line, plan)
+            self.assertFalse(
+                table in line and 'SCAN' in line and 'INDEX' not in line,
+                plan)
+
+    def test_feed_likes_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.LIKE, feed=1))
+
+    def test_user_feed_like_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.LIKE, feed=1, user=self.user))
+
+    def test_page_likes_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.LIKE, user=self.user,
+            feed__in=[1, 2, 3]).values_list('feed', flat=True))
+
+    def test_question_favorite_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.FAVORITE, question=1, user=self.user))
+
+    def test_question_votes_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.UP_VOTE, question=1))
+
+    def test_answer_votes_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            activity_type=Activity.DOWN_VOTE, answer=1))
+
+    def test_user_vote_lookup(self):
+        self.assertUsesIndex(Activity.objects.filter(
+            Q(activity_type=Activity.UP_VOTE) | Q(activity_type=Activity.DOWN_VOTE),  # noqa: E501
+            user=self.user, answer=1))
@@ -1,6 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from bootcamp.activities.models import Notification
 from bootcamp.feeds.models import Feed
 
@@ -36,6 +39,7 @@ class TestViews(TestCase):
             is_read=False
         )
         self.client.login(username='test_user', password='top_secret')
+        cache.clear()
 
     def test_notification(self):
         response = self.client.get(reverse('notifications'))
@@ -45,9 +49,68 @@ class TestViews(TestCase):
         response = self.client.get(reverse('last_notifications'),
                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.context['notifications'].count(), 0)
+        self.assertEqual(len(response.context['notifications']), 0)
 
     def test_check_notification(self):
         response = self.client.get(reverse('check_notifications'),
                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEqual(response.status_code, 200)
+
+    def _notify(self, count):
+        for i in range(count):
+            Notification.objects.create(from_user=self.other_user,
+                                        to_user=self.user, feed=self.feed,
+                                        notification_type='L')
+
+    def _count_queries(self, url):
+        Notification.objects.filter(to_user=self.user).update(is_read=False)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url,
+                                       HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_notifications_pages(self):
+        self._notify(25)
+        response = self.client.get(reverse('notifications'))
+        self.assertEqual(len(response.context['notifications']), 20)
+        from_notification = response.context['from_notification']
+        self.assertFalse(Notification.objects.filter(
+            to_user=self.user, is_read=False).exists())
+        response = self.client.get(reverse('notifications'),
+                                   {'before': from_notification})
+        self.assertEqual(len(response.context['notifications']), 5)
+        self.assertEqual(response.context['from_notification'], -1)
+        response = self.client.get(reverse('notifications'),
+                                   {'before': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_notifications_constantNumberOfQueries(self):
+        self._notify(1)
+        queries = self._count_queries(reverse('notifications'))
+        self._notify(15)
+        self.assertEqual(self._count_queries(reverse('notifications')),
+                         queries)
+
+    def test_last_notifications_constantNumberOfQueries(self):
+        self._notify(1)
+        queries = self._count_queries(reverse('last_notifications'))
+        self._notify(15)
+        self.assertEqual(self._count_queries(reverse('last_notifications')),
+                         queries)
+        self.assertEqual(Notification.get_unread_count(self.user), 11)
+
+    def test_check_notifications_counter(self):
+        self._notify(3)
+        response = self.client.get(reverse('check_notifications'),
+                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.content, b'3')
+        self._notify(12)
+        response = self.client.get(reverse('check_notifications'),
+                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.content, b'15')
+        self.client.get(reverse('notifications'))
+        response = self.client.get(reverse('check_notifications'),
+                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.content, b'0')
@@ -1,34 +1,48 @@
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseBadRequest
 from django.shortcuts import render
 
 from bootcamp.activities.models import Notification
 from bootcamp.decorators import ajax_required
 
+NOTIFICATIONS_NUM_PAGES = 20
+
+
+def _from_notification(notifications):
+    """Returns the id to load the older notifications from, or -1 when the
+    oldest notification is already displayed.
+    """
+    if len(notifications) < NOTIFICATIONS_NUM_PAGES:
+        return -1
+
+    return notifications[-1].pk
+
 
 @login_required
 def notifications(request):
     user = request.user
-    notifications = Notification.objects.filter(to_user=user)
-    unread = Notification.objects.filter(to_user=user, is_read=False)
-    for notification in unread:
-        notification.is_read = True  # pragma: no cover
-        notification.save()  # pragma: no cover
+    before = request.GET.get('before')
+    try:
+        notifications = Notification.get_notifications(
+            user, before=before, limit=NOTIFICATIONS_NUM_PAGES)
 
-    return render(request, 'activities/notifications.html',
-                  {'notifications': notifications})
+    except ValueError:
+        return HttpResponseBadRequest()
+
+    Notification.mark_as_read(user)
+    return render(request, 'activities/notifications.html', {
+        'notifications': notifications,
+        'from_notification': _from_notification(notifications)
+        })
 
 
 @login_required
 @ajax_required
 def last_notifications(request):
     user = request.user
-    notifications = Notification.objects.filter(to_user=user,
-                                                is_read=False)[:5]
-    for notification in notifications:
-        notification.is_read = True  # pragma: no cover
-        notification.save()  # pragma: no cover
-
+    notifications = Notification.get_notifications(user, limit=5,
+                                                   unread=True)
+    Notification.mark_as_read(user, notifications)
     return render(request,
                   'activities/last_notifications.html',
                   {'notifications': notifications})
@@ -37,7 +51,4 @@ def last_notifications(request):
 @login_required
 @ajax_required
 def check_notifications(request):
-    user = request.user
-    notifications = Notification.objects.filter(to_user=user,
-                                                is_read=False)[:5]
-    return HttpResponse(len(notifications))
+    return HttpResponse(Notification.get_unread_count(request.user))
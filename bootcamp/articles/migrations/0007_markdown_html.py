@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:46
+from __future__ import unicode_literals
+
+import markdown
+from django.db import migrations, models
+
+
+def _render(text):
+    # The rendering of this migration, without Markdown extensions and with
+    # any raw HTML escaped. The render_markdown command renders the rows
+    # again with the extensions configured later.
+    if not text:
+        return ''
+    return markdown.markdown(text, safe_mode='escape')
+
+
+def _summary(content):
+    if len(content) > 255:
+        return '{0}...'.format(content[:255])
+    return content
+
+
+def render_markdown(apps, schema_editor):
+    Article = apps.get_model('articles', 'Article')
+    ArticleComment = apps.get_model('articles', 'ArticleComment')
+    for article in Article.objects.only('content').iterator():
+        Article.objects.filter(pk=article.pk).update(
+            content_html=_render(article.content),
+            summary_html=_render(_summary(article.content)))
+    for comment in ArticleComment.objects.only('comment').iterator():
+        ArticleComment.objects.filter(pk=comment.pk).update(
+            comment_html=_render(comment.comment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_auto_20171017_1720'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='summary_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='articlecomment',
+            name='comment_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_markdown, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,24 @@
 from __future__ import unicode_literals
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import models
 from autoslug import AutoSlugField
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 from django.db.models import Count
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
 
-import markdown
 from taggit.managers import TaggableManager
+from taggit.models import TaggedItem
+
+from bootcamp.core import markup
+
+
+TAG_CLOUD_CACHE_KEY = 'articles:tag_cloud'
 
 
 @python_2_unicode_compatible
@@ -24,6 +34,8 @@ class Article(models.Model):
     slug = AutoSlugField(populate_from='title')
     tags = TaggableManager()
     content = models.TextField(max_length=4000)
+    content_html = models.TextField(blank=True, editable=False)
+    summary_html = models.TextField(blank=True, editable=False)
     status = models.CharField(max_length=1, choices=STATUS, default=DRAFT)
     create_user = models.ForeignKey(User)
     create_date = models.DateTimeField(auto_now_add=True)
@@ -31,16 +43,24 @@ class Article(models.Model):
     update_user = models.ForeignKey(User, null=True, blank=True,
                                     related_name="+")
 
+    markdown_fields = ('content_html', 'summary_html')
+
     class Meta:
         verbose_name = _("Article")
         verbose_name_plural = _("Articles")
         ordering = ("-create_date",)
+        # Serves the keyset pagination of the published articles.
+        index_together = (("status", "create_date", "id"),)
 
     def __str__(self):
         return self.title
 
+    def render_markdown(self):
+        self.content_html = markup.render(self.content)
+        self.summary_html = markup.render(self.get_summary())
+
     def get_content_as_markdown(self):
-        return markdown.markdown(self.content, safe_mode='escape')
+        return self.content_html or markup.render(self.content)
 
     @staticmethod
     def get_published():
@@ -49,18 +69,21 @@ class Article(models.Model):
 
     @staticmethod
     def get_counted_tags():
-        tag_dict = {}
-        query = Article.objects.filter(status='P').annotate(tagged=Count(
-            'tags')).filter(tags__gt=0)
-        for obj in query:
-            for tag in obj.tags.names():
-                if tag not in tag_dict:
-                    tag_dict[tag] = 1
-
-                else:  # pragma: no cover
-                    tag_dict[tag] += 1
-
-        return tag_dict.items()
+        """Returns the ``(tag, count)`` pairs of the published articles,
+        most used first, counted with a single ``GROUP BY`` on the tagged
+        items and cached until an article or its tags change.
+        """
+        tags = cache.get(TAG_CLOUD_CACHE_KEY)
+        if tags is None:
+            tags = list(TaggedItem.objects.filter(
+                content_type=ContentType.objects.get_for_model(Article),
+                object_id__in=Article.objects.filter(
+                    status=Article.PUBLISHED).values('pk')).values_list(
+                        'tag__name').annotate(Count('id')).order_by(
+                            '-id__count', 'tag__name'))
+            cache.set(TAG_CLOUD_CACHE_KEY, tags,
+                      getattr(settings, 'TAG_CLOUD_CACHE_TIMEOUT', 300))
+        return tags
 
     def get_summary(self):
         if len(self.content) > 255:
@@ -69,7 +92,7 @@ class Article(models.Model):
             return self.content
 
     def get_summary_as_markdown(self):
-        return markdown.markdown(self.get_summary(), safe_mode='escape')
+        return self.summary_html or markup.render(self.get_summary())
 
     def get_comments(self):
         return ArticleComment.objects.filter(article=self)
@@ -79,6 +102,7 @@ class Article(models.Model):
 class ArticleComment(models.Model):
     article = models.ForeignKey(Article)
     comment = models.CharField(max_length=500)
+    comment_html = models.TextField(blank=True, editable=False)
     date = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(User)
 
@@ -87,8 +111,29 @@ class ArticleComment(models.Model):
         verbose_name_plural = _("Article Comments")
         ordering = ("date",)
 
+    markdown_fields = ('comment_html',)
+
     def __str__(self):
         return '{0} - {1}'.format(self.user.username, self.article.title)
 
+    def render_markdown(self):
+        self.comment_html = markup.render(self.comment)
+
     def get_comment_as_markdown(self):
-        return markdown.markdown(self.comment, safe_mode='escape')
+        return self.comment_html or markup.render(self.comment)
+
+
+def render_markdown(sender, instance, **kwargs):
+    instance.render_markdown()
+
+
+def invalidate_tag_cloud(sender, instance, **kwargs):
+    if isinstance(instance, Article):
+        cache.delete(TAG_CLOUD_CACHE_KEY)
+
+
+pre_save.connect(render_markdown, sender=Article)
+pre_save.connect(render_markdown, sender=ArticleComment)
+post_save.connect(invalidate_tag_cloud, sender=Article)
+post_delete.connect(invalidate_tag_cloud, sender=Article)
+m2m_changed.connect(invalidate_tag_cloud, sender=TaggedItem)
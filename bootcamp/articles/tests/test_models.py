@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from bootcamp.articles.models import Article, ArticleComment
+from bootcamp.questions.models import Question
 
 
 class TestModels(TestCase):
@@ -38,6 +40,7 @@ class TestModels(TestCase):
             everybody always wants the real deal.''',
             create_user=self.user,
         )
+        cache.clear()
 
     def test_object_instance(self):
         self.assertTrue(isinstance(self.article, Article))
@@ -64,3 +67,32 @@ class TestModels(TestCase):
                          'test_user - A really nice title')
         self.assertEqual(self.article_comment.get_comment_as_markdown(),
                          '<p>A really nice comment</p>')
+
+    def test_counted_tags(self):
+        self.article.tags.add('python', 'django')
+        self.not_p_article.tags.add('python', 'draft')
+        other_article = Article.objects.create(
+            title='Another title', content='Content', status='P',
+            create_user=self.other_user)
+        other_article.tags.add('python')
+        self.assertEqual(Article.get_counted_tags(),
+                         [('python', 2), ('django', 1)])
+        with self.assertNumQueries(0):
+            Article.get_counted_tags()
+
+    def test_counted_tags_invalidation(self):
+        self.article.tags.add('python')
+        self.assertEqual(Article.get_counted_tags(), [('python', 1)])
+        self.not_p_article.tags.add('python')
+        self.not_p_article.status = 'P'
+        self.not_p_article.save()
+        self.assertEqual(Article.get_counted_tags(), [('python', 2)])
+        self.article.tags.set('django')
+        self.assertEqual(Article.get_counted_tags(),
+                         [('django', 1), ('python', 1)])
+        Question.objects.create(user=self.user, title='A question',
+                                description='A question').tags.add('django')
+        with self.assertNumQueries(0):
+            Article.get_counted_tags()
+        self.article.delete()
+        self.assertEqual(Article.get_counted_tags(), [('python', 1)])
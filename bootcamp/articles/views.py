@@ -1,30 +1,21 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import CreateView, UpdateView
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.http import HttpResponse, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404, render
 from django.template.loader import render_to_string
 from django.core.urlresolvers import reverse_lazy
 
-import markdown
 from bootcamp.articles.forms import ArticleForm
 from bootcamp.articles.models import Article, ArticleComment
+from bootcamp.core import markup
+from bootcamp.core.pagination import CursorPaginator
 from bootcamp.decorators import ajax_required
 
 
 def _articles(request, articles):
-    paginator = Paginator(articles, 10)
-    page = request.GET.get('page')
-    try:
-        articles = paginator.page(page)
-
-    except PageNotAnInteger:
-        articles = paginator.page(1)
-
-    except EmptyPage:   # pragma: no cover
-        articles = paginator.page(paginator.num_pages)
-
+    articles = CursorPaginator.from_request(
+        request, articles, ('-create_date', '-id'), 10)
     popular_tags = Article.get_counted_tags()
 
     return render(request, 'articles/articles.html', {
@@ -85,7 +76,7 @@ def preview(request):
             content = request.POST.get('content')
             html = 'Nothing to display :('
             if len(content.strip()) > 0:
-                html = markdown.markdown(content, safe_mode='escape')
+                html = markup.render(content)
 
             return HttpResponse(html)
 
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from bootcamp.authentication.models import Profile, backfill_picture_urls
+
+
+class Command(BaseCommand):
+    help = ('Fills the stored picture URL of the profiles which do not have '
+            'one yet. With --all, resolves again every profile without an '
+            'uploaded picture.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', default=False)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            Profile.objects.exclude(
+                picture_url__startswith=settings.MEDIA_URL).update(
+                    picture_url='')
+
+        count = backfill_picture_urls(Profile)
+        self.stdout.write('Updated the picture of {0} profiles.'.format(
+            count))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:48
+from __future__ import unicode_literals
+
+import hashlib
+import os.path
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.six.moves.urllib.parse import urlencode
+
+NO_PICTURE = 'http://trybootcamp.vitorfs.com/static/img/user.png'
+
+
+def _gravatar_url(email):
+    return 'http://www.gravatar.com/avatar/{0}?{1}'.format(
+        hashlib.md5(email.lower().encode('utf-8')).hexdigest(),
+        urlencode([('d', NO_PICTURE), ('s', 256)]))
+
+
+def _legacy_picture_url(username):
+    filename = os.path.join(settings.MEDIA_ROOT, 'profile_pictures',
+                            '{0}.jpg'.format(username))
+    if os.path.isfile(filename):
+        return '{0}profile_pictures/{1}.jpg'.format(
+            settings.MEDIA_URL, username)
+
+
+def backfill(apps, schema_editor):
+    # The backfill as of this migration, the backfill_pictures command
+    # runs the current one.
+    Profile = apps.get_model('authentication', 'Profile')
+    profiles = Profile.objects.filter(picture_url='').values_list(
+        'pk', 'user__username', 'user__email')
+    for pk, username, email in profiles.iterator():
+        picture_url = _legacy_picture_url(username) or \
+            _gravatar_url(email)
+        Profile.objects.filter(pk=pk).update(picture_url=picture_url)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='picture_url',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
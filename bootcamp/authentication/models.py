@@ -2,15 +2,55 @@ from __future__ import unicode_literals
 
 import hashlib
 import os.path
-import urllib
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
 from django.db.models.signals import post_save
 from django.utils.encoding import python_2_unicode_compatible
+from django.utils.six.moves.urllib.parse import urlencode
 
 from bootcamp.activities.models import Notification
+from bootcamp.core import images
+
+NO_PICTURE = 'http://trybootcamp.vitorfs.com/static/img/user.png'
+
+
+def get_gravatar_url(email, size=256):
+    try:
+        return 'http://www.gravatar.com/avatar/{0}?{1}'.format(
+            hashlib.md5(email.lower().encode('utf-8')).hexdigest(),
+            urlencode([('d', NO_PICTURE), ('s', size)]))
+
+    except Exception:  # pragma: no cover
+        return NO_PICTURE
+
+
+def get_legacy_picture_url(username):
+    """Returns the URL of the picture uploaded under the unversioned
+    ``<username>.jpg`` name, if any. Only used to backfill
+    ``Profile.picture_url``.
+    """
+    filename = os.path.join(settings.MEDIA_ROOT, 'profile_pictures',
+                            '{0}.jpg'.format(username))
+    if os.path.isfile(filename):  # pragma: no cover
+        return '{0}profile_pictures/{1}.jpg'.format(
+            settings.MEDIA_URL, username)
+
+
+def backfill_picture_urls(profile_model):
+    """Fills the ``picture_url`` of every profile without one, checking
+    the disk once per profile. Returns the number of profiles updated.
+    """
+    count = 0
+    profiles = profile_model.objects.filter(picture_url='').values_list(
+        'pk', 'user__username', 'user__email')
+    for pk, username, email in profiles.iterator():
+        picture_url = get_legacy_picture_url(username) or \
+            get_gravatar_url(email)
+        profile_model.objects.filter(pk=pk).update(picture_url=picture_url)
+        count += 1
+    return count
 
 
 @python_2_unicode_compatible
@@ -19,6 +59,7 @@ class Profile(models.Model):
     location = models.CharField(max_length=50, null=True, blank=True)
     url = models.CharField(max_length=50, null=True, blank=True)
     job_title = models.CharField(max_length=50, null=True, blank=True)
+    picture_url = models.CharField(max_length=255, blank=True)
 
     class Meta:
         db_table = 'auth_profile'
@@ -34,23 +75,39 @@ class Profile(models.Model):
         return url
 
     def get_picture(self):
-        no_picture = 'http://trybootcamp.vitorfs.com/static/img/user.png'
-        try:
-            filename = settings.MEDIA_ROOT + '/profile_pictures/' +\
-                self.user.username + '.jpg'
-            picture_url = settings.MEDIA_URL + 'profile_pictures/' +\
-                self.user.username + '.jpg'
-            if os.path.isfile(filename):  # pragma: no cover
-                return picture_url
-            else:  # pragma: no cover
-                gravatar_url = 'http://www.gravatar.com/avatar/{0}?{1}'.format(
-                    hashlib.md5(self.user.email.lower()).hexdigest(),
-                    urllib.urlencode({'d': no_picture, 's': '256'})
-                    )
-                return gravatar_url
-
-        except Exception:
-            return no_picture
+        return self.picture_url or get_gravatar_url(self.user.email)
+
+    def get_picture_url(self, size, extension='jpg'):
+        """Returns the URL of the picture resized to ``size`` pixels, or
+        ``None`` when no such variant exists. Only the pictures uploaded
+        with every size, named ``<username>_<version>_<size>.jpg``, have
+        WebP variants.
+        """
+        picture_url = self.get_picture()
+        if not self.has_uploaded_picture():
+            if extension != 'jpg':
+                return None
+
+            return picture_url.replace('s=256', 's={0}'.format(size))
+
+        suffix = '_{0}.jpg'.format(max(images.get_sizes()))
+        if picture_url.endswith(suffix) and images.has_format(extension):
+            return '{0}_{1}.{2}'.format(picture_url[:-len(suffix)], size,
+                                        extension)
+
+        return picture_url if extension == 'jpg' else None
+
+    def has_uploaded_picture(self):
+        return self.picture_url.startswith(settings.MEDIA_URL)
+
+    def set_uploaded_picture(self, picture_url):
+        """Stores the URL of the newly uploaded picture and returns the URL
+        of the one it replaces, if any.
+        """
+        previous = self.picture_url if self.has_uploaded_picture() else None
+        self.picture_url = picture_url
+        Profile.objects.filter(pk=self.pk).update(picture_url=picture_url)
+        return previous
 
     def get_screen_name(self):
         try:
@@ -80,17 +137,11 @@ class Profile(models.Model):
                          feed=feed).save()
 
     def notify_also_commented(self, feed):
-        comments = feed.get_comments()
-        users = []
-        for comment in comments:
-            if comment.user != self.user and comment.user != feed.user:
-                users.append(comment.user.pk)
-
-        users = list(set(users))
-        for user in users:
-            Notification(notification_type=Notification.ALSO_COMMENTED,
-                         from_user=self.user,
-                         to_user=User(id=user), feed=feed).save()
+        users = feed.get_comments().exclude(
+            user__in=[self.user_id, feed.user_id]).order_by().values_list(
+                'user', flat=True).distinct()
+        Notification.notify_users(Notification.ALSO_COMMENTED, self.user,
+                                  users, feed=feed)
 
     def notify_favorited(self, question):
         if self.user != question.user:
@@ -135,7 +186,10 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 
 def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+    profile = instance.profile
+    if not profile.has_uploaded_picture():
+        profile.picture_url = get_gravatar_url(instance.email)
+    profile.save()
 
 
 post_save.connect(create_user_profile, sender=User)
@@ -1,9 +1,12 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from bootcamp.feeds.models import Feed
-from bootcamp.authentication.models import Profile
+from bootcamp.authentication.models import (Profile, backfill_picture_urls,
+                                            get_gravatar_url)
 from bootcamp.activities.models import Notification
 from bootcamp.questions.models import Question, Answer
 
@@ -74,6 +77,26 @@ class TestModels(TestCase):
     def test_return_screen_name(self):
         self.assertEqual(self.profile.get_screen_name(), self.user.username)
 
+    def test_picture_url(self):
+        self.assertEqual(self.profile.get_picture(),
+                         get_gravatar_url('test@gmail.com'))
+        self.user.email = 'new@gmail.com'
+        self.user.save()
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).picture_url,
+                         get_gravatar_url('new@gmail.com'))
+        self.user.profile.set_uploaded_picture(
+            '/media/profile_pictures/test_user_1.jpg')
+        self.user.email = 'test@gmail.com'
+        self.user.save()
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).picture_url,
+                         '/media/profile_pictures/test_user_1.jpg')
+
+    def test_backfill_picture_urls(self):
+        Profile.objects.update(picture_url='')
+        self.assertEqual(backfill_picture_urls(Profile), 3)
+        self.assertEqual(Profile.objects.get(pk=self.profile.pk).picture_url,
+                         get_gravatar_url('test@gmail.com'))
+
     def test_return_str_(self):
         self.assertEqual(str(self.profile), 'test_user')
 
@@ -110,6 +133,58 @@ class TestModels(TestCase):
         new_also_commented_count = Feed.get_comments(self.feed).count()
         assert also_commented_count < new_also_commented_count
 
+    def _comment_feed(self, commenters):
+        feed = Feed.objects.create(user=self.other_user, post='A post')
+        for i in range(commenters):
+            user = get_user_model().objects.create_user(
+                username='commenter_{0}_{1}'.format(feed.pk, i))
+            feed.comment(user=user, post='A comment')
+            feed.comment(user=user, post='Another comment')
+        feed.comment(user=self.user, post='My comment')
+        return feed
+
+    def test_also_commented_constantNumberOfQueries(self):
+        self.profile.notify_also_commented(self._comment_feed(1))
+        feed = self._comment_feed(2)
+        with CaptureQueriesContext(connection) as queries:
+            self.profile.notify_also_commented(feed)
+        many_feed = self._comment_feed(10)
+        with self.assertNumQueries(len(queries)):
+            self.profile.notify_also_commented(many_feed)
+        notifications = Notification.objects.filter(
+            notification_type='S', feed=many_feed)
+        self.assertEqual(notifications.count(), 10)
+        self.assertEqual(notifications.values('to_user').distinct().count(),
+                         10)
+        self.assertFalse(notifications.filter(
+            to_user__in=[self.user, self.other_user]).exists())
+        self.assertEqual(Notification.get_unread_count(
+            notifications[0].to_user), 1)
+
+    def test_also_commented_coalesced(self):
+        feed = self._comment_feed(1)
+        self.profile.notify_also_commented(feed)
+        feed.comment(user=self.another_user, post='A late comment')
+        self.another_user.profile.notify_also_commented(feed)
+        notifications = Notification.objects.filter(
+            notification_type='S', feed=feed).exclude(to_user=self.user)
+        self.assertEqual(notifications.count(), 1)
+        self.assertEqual(notifications[0].from_user, self.another_user)
+        self.assertIn(self.another_user.username, notifications[0].html)
+        self.assertEqual(Notification.objects.filter(
+            notification_type='S', feed=feed, to_user=self.user).count(), 1)
+        commenter = notifications[0].to_user
+        Notification.mark_as_read(commenter)
+        self.profile.notify_also_commented(feed)
+        self.assertEqual(notifications.filter(to_user=commenter).count(), 2)
+
+    @override_settings(NOTIFICATIONS_ASYNC_THRESHOLD=2, JOBS_ASYNC=False)
+    def test_also_commented_async(self):
+        feed = self._comment_feed(2)
+        self.profile.notify_also_commented(feed)
+        self.assertEqual(Notification.objects.filter(
+            notification_type='S', feed=feed).count(), 2)
+
     def test_favorited_notification(self):
         favorited_count = Notification.objects.filter(
             notification_type='F').count()
@@ -0,0 +1,22 @@
+"""Bulk deletion of rows without loading them.
+
+``QuerySet.delete()`` only issues a single ``DELETE`` when the model has no
+``pre_delete``/``post_delete`` receiver and no relation to cascade to.
+Otherwise it fetches every row, follows the relations and sends the signals
+of every instance, which is what a whole thread of comments or thousands of
+notifications should not cost.
+
+``delete_rows`` always issues the single ``DELETE``, through the private
+``QuerySet._raw_delete`` of Django. It is the only place calling it, to be
+checked when Django is upgraded.
+"""
+from __future__ import unicode_literals
+
+
+def delete_rows(queryset):
+    """Deletes the rows of ``queryset`` with a single ``DELETE`` and returns
+    their number. No signal is sent and the ``on_delete`` of the relations
+    are not applied, so the caller has to do what the receivers would and
+    to delete the related rows first.
+    """
+    return queryset._raw_delete(queryset.db)
@@ -0,0 +1,153 @@
+"""Publish/subscribe of the live updates pushed to the browsers.
+
+Events are plain dicts with a ``type`` key, published on a channel: ``all``
+for the events every connected user is interested in (new feeds, counters
+changes) and ``user.<id>`` for the ones of a single user (notifications,
+messages). The ``events`` view streams them to the browser.
+
+The storage is pluggable through the ``EVENTS_BACKEND`` setting. The
+``MemoryEventsBackend`` only delivers the events published by the same
+process, so it requires a single (asynchronous) worker process. The
+``RedisEventsBackend`` goes through Redis pub/sub, at ``REDIS_URL``, to
+reach the streams of every worker process; the settings use it whenever
+``REDIS_URL`` is defined.
+"""
+from __future__ import unicode_literals
+
+import json
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+GLOBAL_CHANNEL = 'all'
+DEFAULT_BACKEND = 'bootcamp.core.events.MemoryEventsBackend'
+
+
+def user_channel(user_id):
+    return 'user.{0}'.format(user_id)
+
+
+class BaseEventsBackend(object):
+
+    def publish(self, channel, event):
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        """Returns an object with a ``get(timeout)`` method returning the
+        list of ``(channel, event)`` received since the last call, waiting up
+        to ``timeout`` seconds for one, and a ``close()`` method.
+        """
+        raise NotImplementedError
+
+
+class MemorySubscription(object):
+
+    def __init__(self, backend, channels):
+        self.backend = backend
+        self.channels = set(channels)
+        self.events = []
+        self.condition = threading.Condition()
+
+    def put(self, channel, event):
+        with self.condition:
+            self.events.append((channel, event))
+            self.condition.notify()
+
+    def get(self, timeout=None):
+        with self.condition:
+            if not self.events:
+                self.condition.wait(timeout)
+            events, self.events = self.events, []
+        return events
+
+    def close(self):
+        self.backend.unsubscribe(self)
+
+
+class MemoryEventsBackend(BaseEventsBackend):
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, channel, event):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            if channel in subscription.channels:
+                subscription.put(channel, event)
+
+    def subscribe(self, channels):
+        subscription = MemorySubscription(self, channels)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+class RedisSubscription(object):
+
+    def __init__(self, client, channels):
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+        self.pubsub.subscribe(*channels)
+
+    def _event(self, message):
+        channel = message['channel']
+        if isinstance(channel, bytes):
+            channel = channel.decode('utf-8')
+        data = message['data']
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return channel, json.loads(data)
+
+    def get(self, timeout=None):
+        events = []
+        message = self.pubsub.get_message(timeout=timeout)
+        while message is not None:
+            events.append(self._event(message))
+            message = self.pubsub.get_message()
+        return events
+
+    def close(self):
+        self.pubsub.close()
+
+
+class RedisEventsBackend(BaseEventsBackend):
+    """Publishes the events as JSON on Redis channels of the same names,
+    shared by every worker process.
+    """
+
+    def __init__(self, url=None):
+        import redis
+
+        self.client = redis.StrictRedis.from_url(url or settings.REDIS_URL)
+
+    def publish(self, channel, event):
+        self.client.publish(channel, json.dumps(event))
+
+    def subscribe(self, channels):
+        return RedisSubscription(self.client, channels)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        backend_class = import_string(getattr(
+            settings, 'EVENTS_BACKEND', DEFAULT_BACKEND))
+        _backend = backend_class()
+    return _backend
+
+
+def publish(channel, event):
+    get_backend().publish(channel, event)
+
+
+def subscribe(channels):
+    return get_backend().subscribe(channels)
@@ -0,0 +1,143 @@
+"""Processing of the uploaded profile pictures.
+
+The upload is only streamed to disk by the request. Cropping and resizing
+are queued to a small pool of worker threads of the process, so a large
+picture never blocks a web worker. The picture is decoded once, at the
+smallest JPEG scale still large enough for the biggest size thanks to
+``Image.draft``, and saved in every size of ``PROFILE_PICTURE_SIZES`` as
+JPEG and, when Pillow supports it, WebP. Templates pick the size they
+display with the ``avatar`` template tag.
+
+Set ``IMAGE_PROCESSING_ASYNC = False`` to process the pictures within the
+request, e.g. in tests or management commands.
+"""
+from __future__ import division, unicode_literals
+
+import os
+
+from django.conf import settings
+
+from PIL import Image
+
+from bootcamp.core import jobs
+
+DEFAULT_SIZES = (40, 80, 200)
+FORMATS = (('jpg', 'JPEG', {'quality': 90}),
+           ('webp', 'WEBP', {'quality': 80}))
+
+
+def get_formats():
+    """Returns the formats the pictures are saved in, without WebP when
+    Pillow was built without it.
+    """
+    Image.init()
+    return [picture_format for picture_format in FORMATS
+            if picture_format[1] in Image.SAVE]
+
+
+def has_format(extension):
+    return any(picture_format[0] == extension
+               for picture_format in get_formats())
+
+
+def get_sizes():
+    return tuple(sorted(getattr(settings, 'PROFILE_PICTURE_SIZES',
+                                DEFAULT_SIZES)))
+
+
+def get_pictures_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'profile_pictures')
+
+
+def get_picture_name(username, version, size, extension='jpg'):
+    return '{0}_{1}_{2}.{3}'.format(username, version, size, extension)
+
+
+def save_upload(uploaded_file, filename):
+    """Streams an uploaded file to ``filename`` chunk by chunk."""
+    directory = os.path.dirname(filename)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filename, 'wb+') as destination:
+        for chunk in uploaded_file.chunks():
+            destination.write(chunk)
+
+
+def crop_and_resize(source, box, sizes):
+    """Crops the ``(x, y, width, height)`` box of the picture ``source``,
+    given in pixels of the original picture, and returns a dict of square
+    RGB images of every requested size.
+    """
+    image = Image.open(source)
+    width, height = image.size
+    x, y, w, h = box
+    largest = max(sizes)
+    # Lets the JPEG decoder downscale by up to 8 while decoding, as long as
+    # the cropped area stays larger than the largest requested size.
+    image.draft('RGB', (width * largest // max(w, 1),
+                        height * largest // max(h, 1)))
+    scale = image.size[0] / width
+    cropped = image.crop((int(x * scale), int(y * scale),
+                          int((x + w) * scale), int((y + h) * scale)))
+    cropped = cropped.convert('RGB')
+    images = {}
+    for size in sorted(sizes, reverse=True):
+        cropped.thumbnail((size, size), Image.ANTIALIAS)
+        images[size] = cropped.copy()
+    return images
+
+
+def remove_picture(picture_url):
+    """Removes every file of an uploaded picture given the URL of one of its
+    sizes, or of a picture uploaded before the sizes existed.
+    """
+    name = os.path.basename(picture_url)
+    directory = get_pictures_dir()
+    names = [name]
+    prefix = os.path.splitext(name)[0].rpartition('_')[0]
+    if prefix:
+        for size in get_sizes():
+            for extension, _, _ in FORMATS:
+                names.append('{0}_{1}.{2}'.format(prefix, size, extension))
+    for name in names:
+        filename = os.path.join(directory, name)
+        if os.path.isfile(filename):
+            os.remove(filename)
+
+
+def process_profile_picture(user_id, source, box, version):
+    """Generates every size of the cropped picture and makes it the picture
+    of the user.
+    """
+    from bootcamp.authentication.models import Profile
+
+    profile = Profile.objects.select_related('user').get(user_id=user_id)
+    username = profile.user.username
+    directory = get_pictures_dir()
+    sizes = get_sizes()
+    try:
+        for size, image in crop_and_resize(source, box, sizes).items():
+            for extension, image_format, options in get_formats():
+                image.save(os.path.join(directory, get_picture_name(
+                    username, version, size, extension)),
+                    image_format, **options)
+
+    finally:
+        os.remove(source)
+
+    previous = profile.set_uploaded_picture('{0}profile_pictures/{1}'.format(
+        settings.MEDIA_URL,
+        get_picture_name(username, version, max(sizes))))
+    if previous:
+        remove_picture(previous)
+
+
+def get_pool():
+    return jobs.get_pool('images', getattr(settings, 'IMAGE_WORKERS', 2))
+
+
+def enqueue(function, *args):
+    if getattr(settings, 'IMAGE_PROCESSING_ASYNC', True):
+        get_pool().submit(function, *args)
+    else:
+        function(*args)
@@ -0,0 +1,108 @@
+"""Pools of worker threads running jobs out of the request/response cycle.
+
+Every pool is a few daemon threads of the process consuming a local queue,
+for work which does not have to be done before answering, like resizing the
+uploaded pictures or notifying every participant of a long thread. The
+queued jobs are lost if the process exits, so they must only be used for
+work which can be done again or missed.
+
+When gevent has monkey patched the threads, as under the gevent workers of
+gunicorn, ``threading.Thread`` only starts greenlets, which would run the
+CPU bound jobs on the hub and block every other request of the process.
+The jobs are then run by a gevent ``ThreadPool`` of real threads instead.
+
+Set ``JOBS_ASYNC = False`` to run the jobs within the caller, e.g. in tests.
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils.six.moves import queue
+
+logger = logging.getLogger(__name__)
+
+
+def is_gevent_patched():
+    try:
+        from gevent import monkey
+
+    except ImportError:
+        return False
+
+    return monkey.is_module_patched('threading')
+
+
+def run_job(function, args):
+    try:
+        function(*args)
+
+    except Exception:
+        logger.exception('Job %r failed', function)
+
+    finally:
+        close_old_connections()
+
+
+class WorkerPool(object):
+    """Daemon threads running the queued jobs of the process."""
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.jobs = queue.Queue()
+        self.threads = []
+        self.threadpool = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.threads or self.threadpool is not None:
+                return
+
+            if is_gevent_patched():
+                from gevent.threadpool import ThreadPool
+
+                self.threadpool = ThreadPool(self.workers)
+                return
+
+            for _ in range(self.workers):
+                thread = threading.Thread(target=self.run)
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+
+    def run(self):
+        while True:
+            function, args = self.jobs.get()
+            try:
+                run_job(function, args)
+
+            finally:
+                self.jobs.task_done()
+
+    def submit(self, function, *args):
+        if not getattr(settings, 'JOBS_ASYNC', True):
+            function(*args)
+            return
+
+        self.start()
+        if self.threadpool is not None:
+            self.threadpool.spawn(run_job, function, args)
+        else:
+            self.jobs.put((function, args))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name, workers):
+    """Returns the ``name`` pool of the process, started with ``workers``
+    threads on its first job.
+    """
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = WorkerPool(workers)
+        return _pools[name]
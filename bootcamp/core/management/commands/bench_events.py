@@ -0,0 +1,85 @@
+from __future__ import division, unicode_literals
+
+import json
+import timeit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+
+from bootcamp.core.events import MemoryEventsBackend
+from bootcamp.feeds.models import Feed
+
+# Endpoints polled by every open tab, with their polling interval in seconds.
+POLLS = (
+    ('/feeds/check/?last_feed={feed}&feed_source=all', 30),
+    ('/feeds/update/?first_feed={feed}&last_feed={feed}&feed_source=all', 30),
+    ('/feeds/track_comments/?feed={feed}', 30),
+    ('/notifications/check/', 30),
+    ('/messages/check/', 60),
+)
+
+
+class Command(BaseCommand):
+    help = ('Compares the load of N clients polling the feeds, notifications '
+            'and messages endpoints with the load of the same clients '
+            'connected to the /events/ stream. Runs inside a transaction '
+            'which is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', default='10,100,1000')
+        parser.add_argument('--events-per-second', type=float, default=1)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def measure_polls(self, repeat):
+        user = User.objects.create_user(username='bench_events',
+                                        password='bench')
+        feed = Feed.objects.create(user=user, post='Benchmark post')
+        client = Client(HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        client.force_login(user)
+        requests_per_second = 0
+        seconds_per_second = 0
+        for url, interval in POLLS:
+            url = url.format(feed=feed.pk)
+            seconds = min(timeit.repeat(lambda: client.get(url), number=1,
+                                        repeat=repeat))
+            requests_per_second += 1 / interval
+            seconds_per_second += seconds / interval
+        return requests_per_second, seconds_per_second
+
+    def measure_event(self, clients, repeat):
+        backend = MemoryEventsBackend()
+        subscriptions = [backend.subscribe(['all']) for _ in range(clients)]
+        event = {'type': 'counter', 'model': 'feed', 'id': 1,
+                 'field': 'likes', 'value': 1}
+
+        def deliver():
+            backend.publish('all', event)
+            for subscription in subscriptions:
+                for _, received in subscription.get(timeout=0):
+                    json.dumps(received)
+
+        return min(timeit.repeat(deliver, number=1, repeat=repeat))
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        events_per_second = options['events_per_second']
+        reconnects = 1 / getattr(settings, 'EVENTS_STREAM_TIMEOUT', 300)
+        with transaction.atomic():
+            poll_requests, poll_seconds = self.measure_polls(repeat)
+            transaction.set_rollback(True)
+
+        self.stdout.write('{0:>8} {1:>14} {2:>14} {3:>14} {4:>14}'.format(
+            'clients', 'polling req/s', 'stream req/s', 'polling cpu %',
+            'stream cpu %'))
+        for clients in [int(c) for c in options['clients'].split(',')]:
+            stream_seconds = self.measure_event(clients, repeat)
+            self.stdout.write(
+                '{0:>8} {1:>14.1f} {2:>14.1f} {3:>14.1f} {4:>14.1f}'.format(
+                    clients,
+                    clients * poll_requests,
+                    clients * reconnects,
+                    clients * poll_seconds * 100,
+                    stream_seconds * events_per_second * 100))
@@ -0,0 +1,69 @@
+from __future__ import unicode_literals
+
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from bootcamp.core.pagination import NEXT, CursorPaginator
+from bootcamp.questions.models import Question
+
+ORDERING = ('-update_date', '-id')
+
+
+class Command(BaseCommand):
+    help = ('Compares the latency of the first and of a deep page of the '
+            'questions list with the OFFSET based Paginator and with the '
+            'keyset CursorPaginator. Runs inside a transaction which is '
+            'rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--pages', default='1,50,500,5000')
+        parser.add_argument('--per-page', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        per_page = options['per_page']
+        pages = [int(page) for page in options['pages'].split(',')]
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_pagination',
+                                            password='bench')
+            questions = []
+            for i in range(rows):
+                questions.append(Question(
+                    user=user, title='Benchmark question {0}'.format(i),
+                    description='A question'))
+                if len(questions) == 10000:
+                    Question.objects.bulk_create(questions)
+                    questions = []
+            Question.objects.bulk_create(questions)
+
+            queryset = Question.objects.all()
+            offset_paginator = Paginator(queryset.order_by(*ORDERING),
+                                         per_page)
+            cursor_paginator = CursorPaginator(queryset, ORDERING, per_page)
+            self.stdout.write('{0:>6} {1:>12} {2:>12}'.format(
+                'page', 'offset (ms)', 'keyset (ms)'))
+            for page in pages:
+                if (page - 1) * per_page >= rows:
+                    continue
+
+                cursor = None
+                if page > 1:
+                    cursor = cursor_paginator.encode_cursor(
+                        queryset.order_by(*ORDERING)[
+                            (page - 1) * per_page - 1], NEXT)
+                offset = min(timeit.repeat(
+                    lambda: list(offset_paginator.page(page)),
+                    number=1, repeat=options['repeat']))
+                keyset = min(timeit.repeat(
+                    lambda: list(cursor_paginator.page(cursor)),
+                    number=1, repeat=options['repeat']))
+                self.stdout.write('{0:>6} {1:>12.2f} {2:>12.2f}'.format(
+                    page, offset * 1000, keyset * 1000))
+
+            transaction.set_rollback(True)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.articles.models import Article, ArticleComment
+from bootcamp.core import markup
+from bootcamp.questions.models import Answer, Question
+
+MODELS = (Article, ArticleComment, Question, Answer)
+
+
+class Command(BaseCommand):
+    help = ('Renders again the stored HTML of the articles, comments, '
+            'questions and answers. To be run after changing the '
+            'MARKDOWN_EXTENSIONS setting.')
+
+    def handle(self, *args, **options):
+        markup.clear_cache()
+        count = 0
+        for model in MODELS:
+            fields = model.markdown_fields
+            for instance in model.objects.iterator():
+                stored = [getattr(instance, field) for field in fields]
+                instance.render_markdown()
+                rendered = [getattr(instance, field) for field in fields]
+                if stored != rendered:
+                    model.objects.filter(pk=instance.pk).update(
+                        **dict(zip(fields, rendered)))
+                    count += 1
+
+        self.stdout.write('Rendered {0} rows again.'.format(count))
@@ -0,0 +1,95 @@
+"""Markdown rendering of the articles, comments, questions and answers.
+
+The rendered HTML is stored next to the source text, in the ``*_html``
+columns filled when the rows are saved, so pages never parse Markdown
+while rendering. The remaining calls, for rows written before those
+columns existed or for previews, go through a reusable ``Markdown``
+instance per thread and a small in-process LRU cache keyed by the hash of
+the text.
+
+The ``MARKDOWN_EXTENSIONS`` setting lists the extensions used. After
+changing it, the stored HTML has to be refreshed with the
+``render_markdown`` management command.
+
+The feeds are plain text, escaped and with their links made clickable by
+``linkify``. Their HTML is stored the same way, in ``Feed.post_html``, and
+refreshed with the ``render_feeds`` management command after changing the
+``LINKIFY_OPTIONS`` passed to ``bleach.linkify``.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import bleach
+import markdown
+from django.conf import settings
+from django.utils.html import escape
+
+_local = threading.local()
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_extensions():
+    return list(getattr(settings, 'MARKDOWN_EXTENSIONS', []))
+
+
+def get_renderer():
+    """Returns the ``Markdown`` instance of the current thread, built again
+    when the extensions change.
+    """
+    extensions = get_extensions()
+    renderer = getattr(_local, 'renderer', None)
+    if renderer is None or _local.extensions != extensions:
+        renderer = markdown.Markdown(extensions=extensions,
+                                     safe_mode='escape')
+        _local.renderer = renderer
+        _local.extensions = extensions
+    return renderer
+
+
+def _render(text):
+    renderer = get_renderer()
+    try:
+        return renderer.convert(text)
+
+    finally:
+        renderer.reset()
+
+
+def render(text):
+    """Returns the HTML of the Markdown ``text``, with any raw HTML
+    escaped.
+    """
+    if not text:
+        return ''
+
+    key = hashlib.sha1('{0}\n{1}'.format(
+        ','.join(get_extensions()), text).encode('utf-8')).hexdigest()
+    with _cache_lock:
+        html = _cache.pop(key, None)
+        if html is not None:
+            _cache[key] = html
+            return html
+
+    html = _render(text)
+    with _cache_lock:
+        _cache[key] = html
+        while len(_cache) > getattr(settings, 'MARKDOWN_CACHE_SIZE', 1000):
+            _cache.popitem(last=False)
+    return html
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def linkify(text):
+    """Returns the HTML of the plain ``text``, escaped and with its links
+    made clickable.
+    """
+    return bleach.linkify(escape(text),
+                          **getattr(settings, 'LINKIFY_OPTIONS', {}))
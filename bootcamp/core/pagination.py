@@ -0,0 +1,212 @@
+"""Keyset pagination of the list pages.
+
+Django's ``Paginator`` counts every row and skips ``(page - 1) * per_page``
+of them with ``OFFSET``, so the deeper the page the slower the query. The
+``CursorPaginator`` instead continues from the ordering key of the last row
+displayed, e.g. ``WHERE (update_date, id) < (?, ?)``, which an index on the
+ordering columns serves in the same time on every page.
+
+The position is passed around as an opaque cursor, the url-safe base64 of
+the ordering key of the row to continue from and of the direction. The
+ordering has to be unique, so it usually ends with the primary key.
+
+No ``COUNT(*)`` is run unless asked for: ``count='exact'`` counts the rows
+and caches the result for ``PAGINATION_COUNT_CACHE_TIMEOUT`` seconds, and
+``count='approximate'`` uses the planner estimate on PostgreSQL, the cached
+exact count elsewhere.
+"""
+from __future__ import unicode_literals
+
+import base64
+import binascii
+import hashlib
+import json
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils import six
+
+NEXT = 'n'
+PREVIOUS = 'p'
+ESTIMATE_RE = re.compile(r' rows=(\d+) ')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage(object):
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(object):
+    """Pages of ``per_page`` rows of ``queryset`` in the given ``ordering``,
+    a list of field names prefixed by ``-`` when descending.
+    """
+
+    def __init__(self, queryset, ordering, per_page, count=None):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count_mode = count
+        self.fields = [queryset.model._meta.get_field(name.lstrip('-'))
+                       for name in self.ordering]
+
+    def encode_cursor(self, instance, direction):
+        values = [field.value_to_string(instance) for field in self.fields]
+        data = json.dumps([direction] + values, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode('utf-8')).decode(
+            'ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            data = base64.urlsafe_b64decode(
+                (cursor + '=' * (-len(cursor) % 4)).encode('ascii'))
+            values = json.loads(data.decode('utf-8'))
+            if not isinstance(values, list):
+                raise InvalidCursor(cursor)
+
+            direction, values = values[0], values[1:]
+            if (direction not in (NEXT, PREVIOUS) or
+                    len(values) != len(self.fields)):
+                raise InvalidCursor(cursor)
+
+            return direction, [field.to_python(value) for field, value in
+                               zip(self.fields, values)]
+
+        except (TypeError, ValueError, IndexError, binascii.Error,
+                ValidationError) as e:
+            raise InvalidCursor(six.text_type(e))
+
+    def _after(self, values, reverse=False):
+        """Returns the condition matching the rows after the ordering key
+        ``values``, or before it when ``reverse``.
+        """
+        condition = None
+        for name, value in reversed(list(zip(self.ordering, values))):
+            field = name.lstrip('-')
+            descending = name.startswith('-') != reverse
+            after = Q(**{'{0}__{1}'.format(
+                field, 'lt' if descending else 'gt'): value})
+            if condition is not None:
+                after |= Q(**{field: value}) & condition
+            condition = after
+
+        # The redundant range on the first column lets the database walk the
+        # index from the cursor instead of evaluating the OR on every row.
+        first = self.ordering[0]
+        descending = first.startswith('-') != reverse
+        return Q(**{'{0}__{1}'.format(first.lstrip('-'),
+                                      'lte' if descending else 'gte'):
+                    values[0]}) & condition
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith('-') else '-' + name
+                for name in self.ordering]
+
+    def page(self, cursor=None):
+        """Returns the page at ``cursor``, the first page when empty.
+        Raises ``InvalidCursor`` when the cursor cannot be decoded.
+        """
+        direction = NEXT
+        queryset = self.queryset.order_by(*self.ordering)
+        if cursor:
+            direction, values = self.decode_cursor(cursor)
+            if direction == NEXT:
+                queryset = queryset.filter(self._after(values))
+            else:
+                queryset = self.queryset.filter(
+                    self._after(values, reverse=True)).order_by(
+                        *self._reversed_ordering())
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        if direction == PREVIOUS and not has_more:
+            # Back to the beginning, shows a full first page.
+            return self.page()
+
+        rows = rows[:self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or direction == PREVIOUS:
+                next_cursor = self.encode_cursor(rows[-1], NEXT)
+            if cursor and (has_more or direction == NEXT):
+                previous_cursor = self.encode_cursor(rows[0], PREVIOUS)
+
+        return CursorPage(rows, next_cursor, previous_cursor,
+                          self.get_count())
+
+    def get_count(self):
+        if self.count_mode == 'approximate':
+            estimate = estimate_count(self.queryset)
+            if estimate is not None:
+                return estimate
+
+        if self.count_mode in ('exact', 'approximate'):
+            return cached_count(self.queryset)
+
+    @staticmethod
+    def from_request(request, queryset, ordering, per_page, count=None):
+        """Returns the page of ``queryset`` at the ``cursor`` GET parameter
+        of ``request``, the first page when it is missing or invalid.
+        """
+        paginator = CursorPaginator(queryset, ordering, per_page, count)
+        try:
+            return paginator.page(request.GET.get('cursor'))
+
+        except InvalidCursor:
+            return paginator.page()
+
+
+def cached_count(queryset):
+    sql, params = queryset.query.sql_with_params()
+    key = 'pagination:count:{0}'.format(hashlib.md5(
+        '{0}{1}'.format(sql, params).encode('utf-8')).hexdigest())
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(
+            settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60))
+    return count
+
+
+def estimate_count(queryset):
+    """Returns the number of rows of ``queryset`` estimated by the
+    PostgreSQL planner, or ``None`` on the other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN ' + sql, params)
+        match = ESTIMATE_RE.search(cursor.fetchone()[0])
+    return int(match.group(1)) if match else None
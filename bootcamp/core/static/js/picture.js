@@ -6,10 +6,18 @@ $(function () {
       xsize = 200,
       ysize = 200;
   
-  $("#crop-picture").Jcrop({
+  // The picture is displayed at most 350px wide, the coordinates are
+  // converted to pixels of the uploaded picture through trueSize.
+  var picture = $("#crop-picture");
+  var width = parseInt(picture.attr("data-width"), 10) || 350;
+  var height = parseInt(picture.attr("data-height"), 10) || 350;
+
+  picture.Jcrop({
     aspectRatio: xsize / ysize,
     onSelect: updateCoords,
-    setSelect: [0, 0, 200, 200]
+    setSelect: [0, 0, Math.min(width, height), Math.min(width, height)],
+    trueSize: [width, height],
+    boxWidth: 350
   },function(){
     var bounds = this.getBounds();
     boundx = bounds[0];
@@ -0,0 +1,23 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+
+@register.simple_tag
+def avatar(profile, size, css_class='', style=''):
+    """Renders the picture of ``profile`` resized to ``size`` pixels, served
+    as WebP to the browsers supporting it.
+    """
+    attributes = format_html(' class="{0}"', css_class) if css_class else ''
+    if style:
+        attributes = format_html('{0} style="{1}"', attributes, style)
+    image = format_html('<img src="{0}"{1}>',
+                        profile.get_picture_url(size), attributes)
+    webp = profile.get_picture_url(size, 'webp')
+    if not webp:
+        return image
+
+    return format_html(
+        '<picture><source srcset="{0}" type="image/webp">{1}</picture>',
+        webp, image)
@@ -0,0 +1,13 @@
+from django import template
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cursor_url(context, cursor):
+    """Returns the query string of the current page with its ``cursor``
+    parameter replaced, keeping the other parameters like a search query.
+    """
+    query = context['request'].GET.copy()
+    query['cursor'] = cursor
+    return '?{0}'.format(query.urlencode())
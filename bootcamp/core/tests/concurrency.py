@@ -0,0 +1,52 @@
+"""Helpers of the tests sending concurrent requests."""
+import threading
+
+from django.db import OperationalError, connection
+from django.test import Client
+
+
+def allows_concurrent_connections():
+    """Whether several connections can share the test database, which an
+    in-memory SQLite database does not allow.
+    """
+    if connection.vendor != 'sqlite':
+        return connection.features.test_db_allows_multiple_connections
+
+    name = connection.settings_dict['TEST']['NAME']
+    return bool(name) and not connection.is_in_memory_db(name)
+
+
+def _post(username, password, path, data, failures, attempts):
+    client = Client()
+    client.login(username=username, password=password)
+    try:
+        for _ in range(attempts):
+            try:
+                response = client.post(path, data,
+                                       HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+                if response.status_code == 200:
+                    return
+            # SQLite only lets one connection write at a time, a failed
+            # transaction is fully rolled back and retried.
+            except OperationalError:  # pragma: no cover
+                pass
+
+        failures.append((username, path, data))  # pragma: no cover
+    finally:
+        connection.close()
+
+
+def post_concurrently(requests, password='top_secret', attempts=10):
+    """Sends every ``(username, path, data)`` AJAX post of ``requests`` at
+    the same time, each from its own thread and database connection, and
+    returns the ones which never succeeded.
+    """
+    failures = []
+    threads = [threading.Thread(target=_post, args=(
+        username, password, path, data, failures, attempts))
+               for username, path, data in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return failures
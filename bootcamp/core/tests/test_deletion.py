@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete
+from django.test import TestCase
+
+from bootcamp.core.deletion import delete_rows
+from bootcamp.feeds.models import Feed
+
+
+class TestDeletion(TestCase):
+
+    def test_delete_rows(self):
+        user = get_user_model().objects.create_user(username='test_user')
+        feeds = [Feed.objects.create(user=user, post='post {0}'.format(i))
+                 for i in range(3)]
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance)
+
+        post_delete.connect(receiver, sender=Feed)
+        try:
+            with self.assertNumQueries(1):
+                self.assertEqual(delete_rows(Feed.objects.filter(
+                    pk__in=[feed.pk for feed in feeds[1:]])), 2)
+        finally:
+            post_delete.disconnect(receiver, sender=Feed)
+        self.assertEqual(deleted, [])
+        self.assertEqual(list(Feed.objects.all()), feeds[:1])
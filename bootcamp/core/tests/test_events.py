@@ -0,0 +1,112 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from bootcamp.activities.models import Notification
+from bootcamp.core import events
+from bootcamp.core.events import MemoryEventsBackend, RedisSubscription
+from bootcamp.feeds.models import Feed
+
+
+class FakePubSub(object):
+    """The part of the redis-py ``PubSub`` the subscriptions use."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.channels = []
+
+    def subscribe(self, *channels):
+        self.channels.extend(channels)
+
+    def get_message(self, timeout=0):
+        return self.messages.pop(0) if self.messages else None
+
+
+class FakeRedis(object):
+
+    def __init__(self, messages):
+        self.messages = messages
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self.messages)
+
+
+def parse(chunk):
+    lines = dict(line.split(': ', 1) for line in
+                 chunk.decode('utf-8').strip().split('\n'))
+    return lines['event'], json.loads(lines['data'])
+
+
+class TestEvents(TestCase):
+    """TestCase class to test the live updates stream
+    """
+
+    def setUp(self):
+        self.client = Client()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username='other_test_user',
+            email='other_test@gmail.com',
+            password='top_secret'
+        )
+        self.client.login(username='test_user', password='top_secret')
+        cache.clear()
+
+    def test_memory_backend(self):
+        backend = MemoryEventsBackend()
+        subscription = backend.subscribe(['all', 'user.1'])
+        backend.publish('all', {'type': 'feed'})
+        backend.publish('user.2', {'type': 'message'})
+        backend.publish('user.1', {'type': 'notification'})
+        self.assertEqual(subscription.get(timeout=0), [
+            ('all', {'type': 'feed'}),
+            ('user.1', {'type': 'notification'})])
+        self.assertEqual(subscription.get(timeout=0), [])
+        subscription.close()
+        backend.publish('all', {'type': 'feed'})
+        self.assertEqual(subscription.get(timeout=0), [])
+
+    def test_redis_subscription(self):
+        subscription = RedisSubscription(FakeRedis([
+            {'type': 'message', 'channel': b'all',
+             'data': b'{"type": "feed"}'},
+            {'type': 'message', 'channel': b'user.1',
+             'data': b'{"type": "notification"}'},
+            ]), ['all', 'user.1'])
+        self.assertEqual(subscription.pubsub.channels, ['all', 'user.1'])
+        self.assertEqual(subscription.get(timeout=0), [
+            ('all', {'type': 'feed'}),
+            ('user.1', {'type': 'notification'})])
+        self.assertEqual(subscription.get(timeout=0), [])
+
+    @override_settings(EVENTS_STREAM_TIMEOUT=1, EVENTS_KEEPALIVE=0.1)
+    def test_events_stream(self):
+        Notification.objects.create(
+            notification_type=Notification.LIKED, from_user=self.other_user,
+            to_user=self.user)
+        response = self.client.get('/events/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = iter(response.streaming_content)
+        self.assertEqual(next(stream), b'retry: 5000\n\n')
+        self.assertEqual(parse(next(stream)), ('hello', {
+            'type': 'hello', 'user': self.user.pk,
+            'notifications': 1, 'messages': 0}))
+        feed = Feed.objects.create(user=self.other_user, post='A post')
+        self.assertEqual(parse(next(stream)), ('feed', {
+            'type': 'feed', 'id': feed.pk, 'user': self.other_user.pk}))
+        events.publish(events.user_channel(self.other_user.pk),
+                       {'type': 'notification'})
+        self.assertEqual(next(stream), b': keepalive\n\n')
+        # Runs to the timeout, the test client then closes the response
+        # without closing the database connection of the test.
+        self.assertEqual(set(stream), {b': keepalive\n\n'})
+
+    def test_events_stream_no_logged(self):
+        response = Client().get('/events/')
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+
+from bootcamp.core import images
+
+
+class TestImages(TestCase):
+    """TestCase class to test the profile pictures processing
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+
+    def test_crop_and_resize_uses_draft(self):
+        source = os.path.join(self.media_root, 'source.jpg')
+        Image.new('RGB', (4000, 3000), 'red').save(source)
+        resized = images.crop_and_resize(source, (1000, 0, 2000, 2000),
+                                         (40, 200))
+        self.assertEqual(resized[200].size, (200, 200))
+        self.assertEqual(resized[40].size, (40, 40))
+        self.assertEqual(resized[40].getpixel((20, 20)), (254, 0, 0))
+
+    def test_avatar_tag(self):
+        template = Template('{% load avatars %}'
+                            '{% avatar user.profile 40 "user" %}')
+        html = template.render(Context({'user': self.user}))
+        self.assertIn('s=40', html)
+        self.assertNotIn('webp', html)
+        self.user.profile.set_uploaded_picture(
+            '/media/profile_pictures/test_user_1_200.jpg')
+        html = template.render(Context({'user': self.user}))
+        if not images.has_format('webp'):  # pragma: no cover
+            self.skipTest('Pillow was built without WebP support.')
+        self.assertEqual(html, (
+            '<picture><source srcset="/media/profile_pictures/'
+            'test_user_1_40.webp" type="image/webp"><img src="/media/'
+            'profile_pictures/test_user_1_40.jpg" class="user"></picture>'))
+
+    def test_remove_picture(self):
+        directory = os.path.join(self.media_root, 'profile_pictures')
+        os.makedirs(directory)
+        names = ['test_user_1_40.jpg', 'test_user_1_200.webp',
+                 'test_user_2_40.jpg', 'test_user.jpg']
+        for name in names:
+            open(os.path.join(directory, name), 'w').close()
+        with override_settings(MEDIA_ROOT=self.media_root):
+            images.remove_picture('/media/profile_pictures/test_user_1_200.jpg')
+            images.remove_picture('/media/profile_pictures/test_user.jpg')
+        self.assertEqual(os.listdir(directory), ['test_user_2_40.jpg'])
@@ -0,0 +1,35 @@
+from django.test import TestCase, override_settings
+
+from bootcamp.core import jobs
+
+
+class TestJobs(TestCase):
+
+    def test_worker_pool(self):
+        pool = jobs.WorkerPool(2)
+        results = []
+        for i in range(5):
+            pool.submit(results.append, i)
+        pool.jobs.join()
+        self.assertEqual(sorted(results), list(range(5)))
+
+    def test_failed_job(self):
+        pool = jobs.WorkerPool(1)
+        results = []
+        pool.submit(lambda: 1 / 0)
+        pool.submit(results.append, 1)
+        pool.jobs.join()
+        self.assertEqual(results, [1])
+
+    @override_settings(JOBS_ASYNC=False)
+    def test_sync_jobs(self):
+        pool = jobs.WorkerPool(1)
+        results = []
+        pool.submit(results.append, 1)
+        self.assertEqual(results, [1])
+        self.assertEqual(pool.threads, [])
+
+    def test_get_pool(self):
+        pool = jobs.get_pool('test', 1)
+        self.assertIs(jobs.get_pool('test', 2), pool)
+        self.assertEqual(pool.workers, 1)
@@ -0,0 +1,51 @@
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils.six import StringIO
+
+from bootcamp.articles.models import Article
+from bootcamp.core import markup
+
+
+class TestMarkup(TestCase):
+    """TestCase class to test the Markdown rendering
+    """
+
+    def setUp(self):
+        markup.clear_cache()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+
+    def test_render(self):
+        self.assertEqual(markup.render('Some *text*'),
+                         '<p>Some <em>text</em></p>')
+        self.assertEqual(markup.render('<script>'),
+                         '<p>&lt;script&gt;</p>')
+        self.assertEqual(markup.render(''), '')
+        self.assertIs(markup.get_renderer(), markup.get_renderer())
+
+    def test_stored_html(self):
+        article = Article.objects.create(
+            title='A title', content='Some **content**', status='P',
+            create_user=self.user)
+        article = Article.objects.get(pk=article.pk)
+        self.assertEqual(article.content_html,
+                         '<p>Some <strong>content</strong></p>')
+        self.assertEqual(article.summary_html, article.content_html)
+        article.content = 'Other content'
+        article.save()
+        self.assertEqual(article.get_content_as_markdown(),
+                         '<p>Other content</p>')
+
+    def test_render_markdown_command(self):
+        article = Article.objects.create(
+            title='A title', content='A title\n=======', status='P',
+            create_user=self.user)
+        with override_settings(
+                MARKDOWN_EXTENSIONS=['markdown.extensions.toc']):
+            call_command('render_markdown', stdout=StringIO())
+        self.assertEqual(Article.objects.get(pk=article.pk).content_html,
+                         '<h1 id="a-title">A title</h1>')
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.template import Context, Template
+from django.utils import timezone
+
+from bootcamp.core.pagination import CursorPaginator, InvalidCursor
+from bootcamp.questions.models import Question
+
+
+class TestPagination(TestCase):
+    """TestCase class to test the keyset pagination
+    """
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        for i in range(25):
+            Question.objects.create(user=self.user,
+                                    title='Question {0}'.format(i),
+                                    description='A question')
+        # Rows sharing the same date are ordered by id.
+        Question.objects.filter(pk__lte=Question.objects.order_by(
+            'pk')[9].pk).update(update_date=timezone.now())
+        self.ordered = list(Question.objects.order_by('-update_date', '-id'))
+        self.paginator = CursorPaginator(Question.objects.all(),
+                                         ('-update_date', '-id'), 10)
+        cache.clear()
+
+    def test_next_pages(self):
+        first = self.paginator.page()
+        self.assertEqual(list(first), self.ordered[:10])
+        self.assertFalse(first.has_previous())
+        second = self.paginator.page(first.next_cursor)
+        self.assertEqual(list(second), self.ordered[10:20])
+        third = self.paginator.page(second.next_cursor)
+        self.assertEqual(list(third), self.ordered[20:])
+        self.assertFalse(third.has_next())
+        self.assertTrue(third.has_previous())
+
+    def test_previous_pages(self):
+        second = self.paginator.page(self.paginator.page().next_cursor)
+        third = self.paginator.page(second.next_cursor)
+        back = self.paginator.page(third.previous_cursor)
+        self.assertEqual(list(back), self.ordered[10:20])
+        self.assertEqual(back.next_cursor, second.next_cursor)
+        first = self.paginator.page(back.previous_cursor)
+        self.assertEqual(list(first), self.ordered[:10])
+        self.assertFalse(first.has_previous())
+
+    def test_ascending_ordering(self):
+        for i in range(3):
+            get_user_model().objects.create_user(username='user_{0}'.format(i))
+        paginator = CursorPaginator(get_user_model().objects.all(),
+                                    ('username',), 2)
+        first = paginator.page()
+        self.assertEqual([user.username for user in first],
+                         ['test_user', 'user_0'])
+        second = paginator.page(first.next_cursor)
+        self.assertEqual([user.username for user in second],
+                         ['user_1', 'user_2'])
+
+    def test_invalid_cursor(self):
+        for cursor in ['x', 'WyJuIl0', 'eyJhIjoxfQ', 'WyJuIiwiYSIsIjEiXQ']:
+            with self.assertRaises(InvalidCursor):
+                self.paginator.page(cursor)
+        request = RequestFactory().get('/questions/', {'cursor': 'x'})
+        page = CursorPaginator.from_request(
+            request, Question.objects.all(), ('-update_date', '-id'), 10)
+        self.assertEqual(list(page), self.ordered[:10])
+
+    def test_count(self):
+        self.assertIsNone(self.paginator.page().count)
+        paginator = CursorPaginator(Question.objects.all(),
+                                    ('-update_date', '-id'), 10,
+                                    count='exact')
+        self.assertEqual(paginator.page().count, 25)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.page().count, 25)
+        paginator.count_mode = 'approximate'
+        self.assertEqual(paginator.page().count, 25)
+
+    def test_constantNumberOfQueries(self):
+        cursor = None
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                cursor = self.paginator.page(cursor).next_cursor
+
+    def test_cursor_url_tag(self):
+        request = RequestFactory().get('/search/', {'q': 'a b',
+                                                    'cursor': 'old'})
+        html = Template('{% load pagination %}{% cursor_url "abc" %}').render(
+            Context({'request': request}))
+        self.assertIn('q=a+b', html)
+        self.assertIn('cursor=abc', html)
+        self.assertNotIn('old', html)
@@ -1,6 +1,15 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+
 from django.contrib.auth import get_user_model
 from django.core.urlresolvers import reverse
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
+
+from bootcamp.core import images
 
 
 class TestViews(TestCase):
@@ -26,7 +35,7 @@ class TestViews(TestCase):
     def test_get_home_response(self):
         response = self.client.get(reverse('feeds'))
         self.assertEqual(response.status_code, 200)
-        self.assertIn('<Page 1 of 1>', str(response.context['feeds']))
+        self.assertEqual(response.context['feeds'], [])
 
     def test_get_home_response_no_logged(self):
         response = self.other_client.get(reverse('feeds'))
@@ -69,3 +78,36 @@ class TestViews(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTrue('uploaded_picture' in response.context)
         self.assertEqual(response.context['uploaded_picture'], True)
+
+    def test_upload_and_save_picture(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        pictures = os.path.join(media_root, 'profile_pictures')
+        with override_settings(MEDIA_ROOT=media_root,
+                               IMAGE_PROCESSING_ASYNC=False):
+            for i in range(2):
+                upload = BytesIO()
+                Image.new('RGB', (1600, 1200)).save(upload, 'JPEG')
+                upload.name = 'picture.jpg'
+                upload.seek(0)
+                self.client.post(reverse('upload_picture'),
+                                 {'picture': upload})
+                response = self.client.get(reverse('picture'),
+                                           {'upload_picture': 'uploaded'})
+                self.assertEqual(response.context['picture_size'],
+                                 (1600, 1200))
+                self.client.post(reverse('save_uploaded_picture'),
+                                 {'x': 400, 'y': 0, 'w': 800, 'h': 800})
+
+        profile = get_user_model().objects.get(pk=self.user.pk).profile
+        picture_url = profile.get_picture()
+        self.assertTrue(picture_url.startswith(
+            '/media/profile_pictures/test_user_'))
+        self.assertTrue(picture_url.endswith('_200.jpg'))
+        names = sorted(os.path.basename(profile.get_picture_url(size, ext))
+                       for size in (40, 80, 200) for ext in ('jpg', 'webp')
+                       if images.has_format(ext))
+        self.assertEqual(sorted(os.listdir(pictures)), names)
+        self.assertEqual(Image.open(os.path.join(
+            pictures, os.path.basename(profile.get_picture_url(40)))).size,
+                         (40, 40))
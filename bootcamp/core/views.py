@@ -1,24 +1,30 @@
 import os
 import json
+import time
 
 from PIL import Image
 
 from django.conf import settings as django_settings
 from django.contrib import messages
+from django.db import connection
 from django.db.models import Q
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from bootcamp.core import images
+from bootcamp.core.events import GLOBAL_CHANNEL, subscribe, user_channel
 from bootcamp.core.forms import ChangePasswordForm, ProfileForm
+from bootcamp.core.pagination import CursorPaginator
 from bootcamp.feeds.views import FEEDS_NUM_PAGES, feeds
+from bootcamp.feeds.hydration import hydrate_feeds
 from bootcamp.feeds.models import Feed
 from bootcamp.articles.models import Article, ArticleComment
 from bootcamp.questions.models import Question, Answer
-from bootcamp.activities.models import Activity
-from bootcamp.messenger.models import Message
+from bootcamp.activities.models import Activity, Notification
+from bootcamp.messenger.models import Conversation, Message
 
 
 def home(request):
@@ -30,30 +36,21 @@ def home(request):
 
 @login_required
 def network(request):
-    users_list = User.objects.filter(is_active=True).order_by('username')
-    paginator = Paginator(users_list, 100)
-    page = request.GET.get('page')
-    try:
-        users = paginator.page(page)
-
-    except PageNotAnInteger:
-        users = paginator.page(1)
-
-    except EmptyPage:  # pragma: no cover
-        users = paginator.page(paginator.num_pages)
-
+    users = CursorPaginator.from_request(
+        request, User.objects.filter(is_active=True).select_related(
+            'profile'), ('username',), 100)
     return render(request, 'core/network.html', {'users': users})
 
 
 @login_required
 def profile(request, username):
     page_user = get_object_or_404(User, username=username)
-    all_feeds = Feed.get_feeds().filter(user=page_user)
-    paginator = Paginator(all_feeds, FEEDS_NUM_PAGES)
-    feeds = paginator.page(1)
+    feeds = hydrate_feeds(
+        Feed.get_timeline(str(page_user.pk), limit=FEEDS_NUM_PAGES),
+        request.user)
     from_feed = -1
     if feeds:  # pragma: no cover
-        from_feed = feeds[0].id
+        from_feed = feeds[-1].id
 
     feeds_count = Feed.objects.filter(user=page_user).count()
     article_count = Article.objects.filter(create_user=page_user).count()
@@ -81,7 +78,6 @@ def profile(request, username):
         'line_data': data,
         'feeds': feeds,
         'from_feed': from_feed,
-        'page': 1
         }
     return render(request, 'core/profile.html', data)
 
@@ -116,15 +112,18 @@ def settings(request):
 @login_required
 def picture(request):
     uploaded_picture = False
+    picture_size = None
     try:
         if request.GET.get('upload_picture') == 'uploaded':
             uploaded_picture = True
+            picture_size = Image.open(_tmp_picture(request.user)).size
 
     except Exception:  # pragma: no cover
         pass
 
     return render(request, 'core/picture.html',
-                  {'uploaded_picture': uploaded_picture})
+                  {'uploaded_picture': uploaded_picture,
+                   'picture_size': picture_size})
 
 
 @login_required
@@ -147,50 +146,104 @@ def password(request):
     return render(request, 'core/password.html', {'form': form})
 
 
+def _tmp_picture(user):
+    return os.path.join(images.get_pictures_dir(),
+                        '{0}_tmp.jpg'.format(user.username))
+
+
 @login_required
 def upload_picture(request):
+    filename = _tmp_picture(request.user)
     try:
-        profile_pictures = django_settings.MEDIA_ROOT + '/profile_pictures/'
-        if not os.path.exists(profile_pictures):
-            os.makedirs(profile_pictures)
-        f = request.FILES['picture']
-        filename = profile_pictures + request.user.username + '_tmp.jpg'
-        with open(filename, 'wb+') as destination:
-            for chunk in f.chunks():
-                destination.write(chunk)
-        im = Image.open(filename)
-        width, height = im.size
-        if width > 350:
-            new_width = 350
-            new_height = (height * 350) / width
-            new_size = new_width, new_height
-            im.thumbnail(new_size, Image.ANTIALIAS)
-            im.save(filename)
-
+        images.save_upload(request.FILES['picture'], filename)
+        Image.open(filename).verify()
         return redirect('/settings/picture/?upload_picture=uploaded')
 
-    except Exception as e:
+    except Exception:
+        if os.path.isfile(filename):
+            os.remove(filename)
         return redirect('/settings/picture/')
 
 
 @login_required
 def save_uploaded_picture(request):
+    """Queues the crop and resize of the uploaded picture, which becomes the
+    picture of the user once processed.
+    """
     try:
-        x = int(request.POST.get('x'))
-        y = int(request.POST.get('y'))
-        w = int(request.POST.get('w'))
-        h = int(request.POST.get('h'))
-        tmp_filename = django_settings.MEDIA_ROOT + '/profile_pictures/' +\
-            request.user.username + '_tmp.jpg'
-        filename = django_settings.MEDIA_ROOT + '/profile_pictures/' +\
-            request.user.username + '.jpg'
-        im = Image.open(tmp_filename)
-        cropped_im = im.crop((x, y, w+x, h+y))
-        cropped_im.thumbnail((200, 200), Image.ANTIALIAS)
-        cropped_im.save(filename)
-        os.remove(tmp_filename)
+        box = tuple(int(request.POST.get(key)) for key in 'xywh')
+        # The picture is renamed so a new upload can not replace it before
+        # it is processed.
+        version = int(time.time() * 1000)
+        source = '{0}.{1}'.format(_tmp_picture(request.user), version)
+        os.rename(_tmp_picture(request.user), source)
+        images.enqueue(images.process_profile_picture, request.user.pk,
+                       source, box, version)
 
     except Exception:
         pass
 
     return redirect('/settings/picture/')
+
+
+def _server_sent_event(event):
+    return 'event: {0}\ndata: {1}\n\n'.format(
+        event['type'], json.dumps(event))
+
+
+def _unread_messages(user):
+    return Conversation.get_unread_count(user)
+
+
+def _release_connection():
+    """Closes the database connection of the stream while it waits for
+    events, so the open streams do not hold one each. The next query opens
+    it again.
+    """
+    if not connection.in_atomic_block:
+        connection.close()
+
+
+def _event_stream(user, timeout, keepalive):
+    subscription = subscribe([GLOBAL_CHANNEL, user_channel(user.pk)])
+    try:
+        yield 'retry: 5000\n\n'
+        yield _server_sent_event({
+            'type': 'hello',
+            'user': user.pk,
+            'notifications': Notification.get_unread_count(user),
+            'messages': _unread_messages(user),
+            })
+        _release_connection()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            received = subscription.get(timeout=keepalive)
+            if not received:
+                yield ': keepalive\n\n'
+
+            for _, event in received:
+                if event['type'] == 'message':
+                    event = dict(event, messages=_unread_messages(user))
+                    _release_connection()
+                yield _server_sent_event(event)
+
+    finally:
+        subscription.close()
+
+
+@login_required
+def events(request):
+    """Streams the live updates of the logged in user as server-sent events,
+    replacing the periodic polling of the feeds, notifications and messages.
+    Each response stays open for EVENTS_STREAM_TIMEOUT seconds, after which
+    the browser reconnects, so it has to be served by an asynchronous
+    worker.
+    """
+    response = StreamingHttpResponse(_event_stream(
+        request.user,
+        getattr(django_settings, 'EVENTS_STREAM_TIMEOUT', 300),
+        getattr(django_settings, 'EVENTS_KEEPALIVE', 15)),
+        content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+import json
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bootcamp.activities import counters
+from bootcamp.feeds.models import Feed
+
+
+def _full_update(feeds):
+    dump = {}
+    for feed in feeds:
+        dump[feed.pk] = {'likes': feed.likes, 'comments': feed.comments}
+    return json.dumps(dump)
+
+
+def _delta_update(feeds, version):
+    version, rows = counters.changed_since(feeds, ['likes', 'comments'],
+                                           version)
+    dump = {}
+    for pk, likes, comments in rows:
+        dump[pk] = {'likes': likes, 'comments': comments}
+    return json.dumps(dump)
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the polling of the feeds counters, every feed of '
+            'the displayed window versus the ones changed since the last '
+            'version. Runs inside a transaction which is rolled back at the '
+            'end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--feeds', type=int, default=1000)
+        parser.add_argument('--changed', default='0,10,100')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        changed_sizes = [int(size) for size in options['changed'].split(',')]
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_counters',
+                                            password='bench')
+            Feed.objects.bulk_create([
+                Feed(user=user, post='Benchmark post {0}'.format(i))
+                for i in range(options['feeds'])])
+            ids = list(Feed.objects.filter(user=user).order_by(
+                'pk').values_list('pk', flat=True))
+            feeds = Feed.get_feeds().filter(id__range=(ids[0], ids[-1]))
+            self.stdout.write('{0:>8} {1:>12} {2:>12} {3:>12} {4:>12}'.format(
+                'changed', 'before (B)', 'after (B)', 'before (ms)',
+                'after (ms)'))
+            for size in changed_sizes:
+                version = counters.new_version()
+                Feed.objects.filter(pk__in=ids[:size]).update(
+                    likes=1, counters_version=version + 1)
+                before = min(timeit.repeat(
+                    lambda: _full_update(feeds.all()),
+                    number=1, repeat=options['repeat']))
+                after = min(timeit.repeat(
+                    lambda: _delta_update(feeds.all(), version),
+                    number=1, repeat=options['repeat']))
+                self.stdout.write(
+                    '{0:>8} {1:>12} {2:>12} {3:>12.2f} {4:>12.2f}'.format(
+                        size, len(_full_update(feeds.all())),
+                        len(_delta_update(feeds.all(), version)),
+                        before * 1000, after * 1000))
+
+            transaction.set_rollback(True)
@@ -0,0 +1,51 @@
+from __future__ import unicode_literals
+
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bootcamp.feeds.models import Feed
+from bootcamp.feeds.views import _render_feeds
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the rendering of a page of feeds with links, '
+            'linkified on every render versus stored when saved. Runs '
+            'inside a transaction which is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,50')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_feed_links',
+                                            password='bench')
+            # bulk_create skips the pre_save signal, nothing is stored.
+            Feed.objects.bulk_create([
+                Feed(user=user, post='Post {0} about http://example.com/{0} '
+                                     'and www.example.org & <b>'.format(i))
+                for i in range(max(sizes))])
+            feeds = list(Feed.objects.filter(user=user).select_related(
+                'user__profile'))
+            self.stdout.write('{0:>6} {1:>12} {2:>12}'.format(
+                'feeds', 'before (ms)', 'after (ms)'))
+            for size in sizes:
+                page = feeds[:size]
+                before = min(timeit.repeat(
+                    lambda: _render_feeds(page, user, 'token'),
+                    number=1, repeat=options['repeat']))
+                for feed in page:
+                    feed.render_post()
+                after = min(timeit.repeat(
+                    lambda: _render_feeds(page, user, 'token'),
+                    number=1, repeat=options['repeat']))
+                for feed in page:
+                    feed.post_html = ''
+                self.stdout.write('{0:>6} {1:>12.2f} {2:>12.2f}'.format(
+                    size, before * 1000, after * 1000))
+
+            transaction.set_rollback(True)
@@ -0,0 +1,59 @@
+from __future__ import unicode_literals
+
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from bootcamp.feeds.models import Feed
+from bootcamp.feeds.views import _render_feeds
+
+
+def _render_feeds_one_by_one(feeds, user, csrf_token):
+    html = ''
+    for feed in feeds:
+        html = '{0}{1}'.format(html,
+                               render_to_string('feeds/partial_feed.html',
+                                                {
+                                                    'feed': feed,
+                                                    'user': user,
+                                                    'csrf_token': csrf_token
+                                                    }))
+
+    return html
+
+
+class Command(BaseCommand):
+    help = ('Benchmarks the per page rendering of feeds, one template per '
+            'feed versus a single batched render. Runs inside a transaction '
+            'which is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,50,200')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_feed_render',
+                                            password='bench')
+            Feed.objects.bulk_create([
+                Feed(user=user, post='Benchmark post {0}'.format(i))
+                for i in range(max(sizes))])
+            feeds = list(Feed.objects.filter(user=user))
+            self.stdout.write('{0:>6} {1:>12} {2:>12}'.format(
+                'feeds', 'before (ms)', 'after (ms)'))
+            for size in sizes:
+                page = feeds[:size]
+                before = min(timeit.repeat(
+                    lambda: _render_feeds_one_by_one(page, user, 'token'),
+                    number=1, repeat=options['repeat']))
+                after = min(timeit.repeat(
+                    lambda: _render_feeds(page, user, 'token'),
+                    number=1, repeat=options['repeat']))
+                self.stdout.write('{0:>6} {1:>12.2f} {2:>12.2f}'.format(
+                    size, before * 1000, after * 1000))
+
+            transaction.set_rollback(True)
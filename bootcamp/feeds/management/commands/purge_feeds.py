@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.feeds.models import Feed
+
+
+class Command(BaseCommand):
+    help = ('Purges the removed feeds which are still hidden, when their '
+            'worker thread did not get to them.')
+
+    def handle(self, *args, **options):
+        count = 0
+        for feed in Feed.objects.filter(is_removed=True).iterator():
+            feed.purge()
+            count += 1
+
+        self.stdout.write('Purged {0} feeds.'.format(count))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.feeds import timeline
+from bootcamp.feeds.models import Feed
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the materialized feed timelines from the Feed table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        backend = timeline.get_backend()
+        backend.clear()
+        feeds = Feed.objects.filter(
+            parent=None, is_removed=False).order_by('id').values_list(
+                'id', 'user_id')
+        count = 0
+        entries = []
+        for feed_id, user_id in feeds.iterator():
+            entries.append((timeline.GLOBAL_TIMELINE, feed_id))
+            entries.append((str(user_id), feed_id))
+            count += 1
+            if len(entries) >= batch_size:
+                backend.push_many(entries)
+                entries = []
+
+        backend.push_many(entries)
+        self.stdout.write('Rebuilt the timelines of {0} feeds.'.format(count))
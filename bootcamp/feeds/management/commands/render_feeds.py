@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from bootcamp.core import markup
+from bootcamp.feeds.models import Feed
+
+
+class Command(BaseCommand):
+    help = ('Renders again the stored HTML of the feeds and comments. To be '
+            'run after changing the LINKIFY_OPTIONS setting.')
+
+    def handle(self, *args, **options):
+        count = 0
+        rows = Feed.objects.order_by().values_list('pk', 'post', 'post_html')
+        for pk, post, stored in rows.iterator():
+            rendered = markup.linkify(post)
+            if stored != rendered:
+                Feed.objects.filter(pk=pk).update(post_html=rendered)
+                count += 1
+
+        self.stdout.write('Rendered {0} rows again.'.format(count))
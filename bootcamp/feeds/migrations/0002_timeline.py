@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:15
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_timelines(apps, schema_editor):
+    Feed = apps.get_model('feeds', 'Feed')
+    Timeline = apps.get_model('feeds', 'Timeline')
+    entries = []
+    for feed_id, user_id in Feed.objects.filter(
+            parent=None).values_list('id', 'user_id').iterator():
+        entries.append(Timeline(source='all', feed_id=feed_id))
+        entries.append(Timeline(source=str(user_id), feed_id=feed_id))
+    Timeline.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Timeline',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20)),
+                ('feed', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='feeds.Feed')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='timeline',
+            unique_together=set([('source', 'feed')]),
+        ),
+        migrations.RunPython(backfill_timelines, migrations.RunPython.noop),
+    ]
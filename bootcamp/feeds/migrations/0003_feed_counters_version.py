@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 19:28
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0002_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='counters_version',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 19:33
+from __future__ import unicode_literals
+
+import bleach
+from django.db import migrations, models
+from django.utils.html import escape
+
+
+def render_posts(apps, schema_editor):
+    # Rendered with the default options of bleach.linkify, the render_feeds
+    # command renders the posts again with the LINKIFY_OPTIONS set later.
+    Feed = apps.get_model('feeds', 'Feed')
+    for feed in Feed.objects.only('post').iterator():
+        Feed.objects.filter(pk=feed.pk).update(
+            post_html=bleach.linkify(escape(feed.post)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0003_feed_counters_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='post_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 19:36
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0004_feed_post_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feed',
+            name='is_removed',
+            field=models.BooleanField(default=False),
+        ),
+    ]
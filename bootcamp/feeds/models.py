@@ -1,13 +1,17 @@
 from __future__ import unicode_literals
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.utils.encoding import python_2_unicode_compatible
-from django.utils.html import escape
 from django.utils.translation import ugettext_lazy as _
 
-import bleach
-from bootcamp.activities.models import Activity
+from bootcamp.activities import counters
+from bootcamp.activities.models import Activity, Notification
+from bootcamp.core import events, jobs, markup
+from bootcamp.core.deletion import delete_rows
+from bootcamp.feeds import timeline
 
 
 @python_2_unicode_compatible
@@ -15,9 +19,13 @@ class Feed(models.Model):
     user = models.ForeignKey(User)
     date = models.DateTimeField(auto_now_add=True)
     post = models.TextField(max_length=255)
+    post_html = models.TextField(blank=True, editable=False)
     parent = models.ForeignKey('Feed', null=True, blank=True)
     likes = models.IntegerField(default=0)
     comments = models.IntegerField(default=0)
+    counters_version = models.BigIntegerField(default=0, db_index=True,
+                                              editable=False)
+    is_removed = models.BooleanField(default=False)
 
     class Meta:
         verbose_name = _('Feed')
@@ -30,24 +38,70 @@ class Feed(models.Model):
     @staticmethod
     def get_feeds(from_feed=None):
         if from_feed is not None:
-            feeds = Feed.objects.filter(parent=None, id__lte=from_feed)
+            feeds = Feed.objects.filter(parent=None, is_removed=False,
+                                        id__lte=from_feed)
         else:
-            feeds = Feed.objects.filter(parent=None)
+            feeds = Feed.objects.filter(parent=None, is_removed=False)
         return feeds
 
     @staticmethod
     def get_feeds_after(feed):
-        feeds = Feed.objects.filter(parent=None, id__gt=feed)
+        feeds = Feed.objects.filter(parent=None, is_removed=False,
+                                    id__gt=feed)
         return feeds
 
+    @staticmethod
+    def _from_ids(ids):
+        feeds = Feed.objects.select_related(
+            'user__profile').in_bulk(ids)
+        return [feeds[pk] for pk in ids if pk in feeds]
+
+    @staticmethod
+    def get_timeline(feed_source, from_feed=None, limit=10):
+        """Returns a page of the materialized timeline of ``feed_source``,
+        made of the feeds older than ``from_feed``, newest first.
+        """
+        if from_feed is not None:
+            from_feed = int(from_feed)
+        ids = timeline.get_backend().page(feed_source, before=from_feed,
+                                          limit=limit)
+        return Feed._from_ids(ids)
+
+    @staticmethod
+    def get_timeline_after(feed_source, feed):
+        ids = timeline.get_backend().since(feed_source, int(feed))
+        return Feed._from_ids(ids)
+
     def get_comments(self):
         return Feed.objects.filter(parent=self).order_by('date')
 
+    def get_comments_page(self, before=None, after=None, limit=None):
+        """Returns comments of the feed in chronological order: the ones
+        newer than the comment id ``after`` when given, else the ``limit``
+        latest ones, older than the comment id ``before`` when given.
+        """
+        comments = Feed.objects.filter(parent=self).select_related(
+            'user__profile')
+        if after is not None:
+            return list(comments.filter(pk__gt=int(after)).order_by('pk'))
+
+        if before is not None:
+            comments = comments.filter(pk__lt=int(before))
+        return list(comments.order_by('-pk')[:limit])[::-1]
+
+    def count_comments_between(self, first, last):
+        """Returns the number of comments of the feed with an id between the
+        comment ids ``first`` and ``last``, both included.
+        """
+        return Feed.objects.filter(
+            parent=self, pk__range=(int(first), int(last))).count()
+
     def calculate_likes(self):
         likes = Activity.objects.filter(activity_type=Activity.LIKE,
                                         feed=self.pk).count()
         self.likes = likes
-        self.save()
+        Feed.objects.filter(pk=self.pk).update(
+            likes=likes, counters_version=counters.new_version())
         return self.likes
 
     def get_likes(self):
@@ -64,15 +118,111 @@ class Feed(models.Model):
 
     def calculate_comments(self):
         self.comments = Feed.objects.filter(parent=self).count()
-        self.save()
+        Feed.objects.filter(pk=self.pk).update(
+            comments=self.comments, counters_version=counters.new_version())
         return self.comments
 
     def comment(self, user, post):
-        feed_comment = Feed(user=user, post=post, parent=self)
-        feed_comment.save()
-        self.comments = Feed.objects.filter(parent=self).count()
-        self.save()
+        with transaction.atomic():
+            feed_comment = Feed(user=user, post=post, parent=self)
+            feed_comment.save()
+            counters.increment(self, 'comments')
         return feed_comment
 
+    def remove(self):
+        """Removes the feed, or comment, with its comments, their likes and
+        the notifications about them. A feed with at least
+        ``FEEDS_SOFT_DELETE_THRESHOLD`` likes and comments is only hidden
+        at once and purged by a worker thread, or by the ``purge_feeds``
+        management command if the process exits first.
+        """
+        threshold = getattr(settings, 'FEEDS_SOFT_DELETE_THRESHOLD', None)
+        if (threshold is not None and self.parent_id is None and
+                self.likes + self.comments >= threshold):
+            self.hide()
+            pool = jobs.get_pool('feeds', getattr(
+                settings, 'FEEDS_WORKERS', 1))
+            pool.submit(purge_feed_job, self.pk)
+        else:
+            self.purge()
+
+    def hide(self):
+        """Takes the feed out of the timelines and of the search results
+        until it is purged.
+        """
+        self.is_removed = True
+        self.save(update_fields=['is_removed'])
+        timeline.remove_feed(self)
+
+    def purge(self):
+        """Deletes the feed and its whole thread in one transaction, with
+        one ``DELETE`` per table and level of comments whatever their
+        number, then decrements the comments of the parent.
+        """
+        parent = self.parent
+        with transaction.atomic():
+            levels = [Feed.objects.filter(pk=self.pk)]
+            level = Feed.objects.filter(parent=self)
+            while level.exists():
+                levels.append(level)
+                level = Feed.objects.filter(parent__in=level.values('pk'))
+
+            for level in levels:
+                ids = level.values('pk')
+                Activity.objects.filter(feed__in=ids).delete()
+                Notification.delete_notifications(
+                    Notification.objects.filter(feed__in=ids))
+
+            # Comments are neither in the timelines nor in the search index,
+            # the post_delete signals have nothing to do for them.
+            for level in reversed(levels[1:]):
+                delete_rows(level)
+            self.delete()
+            if parent is not None:
+                counters.decrement(parent, 'comments')
+
+    def render_post(self):
+        self.post_html = markup.linkify(self.post)
+
     def linkfy_post(self):
-        return bleach.linkify(escape(self.post))
+        return self.post_html or markup.linkify(self.post)
+
+
+def purge_feed_job(feed_id):
+    feed = Feed.objects.filter(pk=feed_id).first()
+    if feed is not None:
+        feed.purge()
+
+
+class Timeline(models.Model):
+    """Precomputed entry of a feed timeline. See ``bootcamp.feeds.timeline``.
+    """
+    source = models.CharField(max_length=20)
+    feed = models.ForeignKey(Feed, related_name='+')
+
+    class Meta:
+        unique_together = (('source', 'feed'),)
+
+
+def render_post(sender, instance, **kwargs):
+    instance.render_post()
+
+
+def push_feed_to_timelines(sender, instance, created, **kwargs):
+    if created and instance.parent_id is None:
+        timeline.push_feed(instance)
+        events.publish(events.GLOBAL_CHANNEL, {
+            'type': 'feed',
+            'id': instance.pk,
+            'user': instance.user_id,
+            })
+
+
+def remove_feed_from_timelines(sender, instance, **kwargs):
+    if instance.parent_id is None:
+        timeline.remove_feed(instance)
+
+
+pre_save.connect(render_post, sender=Feed)
+post_save.connect(push_feed_to_timelines, sender=Feed)
+post_delete.connect(remove_feed_from_timelines, sender=Feed)
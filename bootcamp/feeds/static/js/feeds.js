@@ -7,6 +7,12 @@ $(function () {
     $(document).attr("title", page_title);
   }
 
+  function show_stream_update(count) {
+    $(".stream-update .new-posts").text(count);
+    $(".stream-update").show();
+    $(document).attr("title", "(" + count + ") " + page_title);
+  }
+
   $("body").keydown(function (evt) {
     var keyCode = evt.which?evt.which:evt.keyCode;
     if (evt.ctrlKey && keyCode == 80) {
@@ -97,41 +103,66 @@ $(function () {
       $(".comments", post).show();
       $(".comments", post).addClass("tracking");
       $(".comments input[name='post']", post).focus();
-      var feed = $(post).closest("li").attr("feed-id");
-      $.ajax({
-        url: '/feeds/comment/',
-        data: { 'feed': feed },
-        cache: false,
-        beforeSend: function () {
-          $("ol", post).html("<li class='loadcomment'><img src='/static/img/loading.gif'></li>");
-        },
-        success: function (data) {
-          $("ol", post).html(data);
-          $(".comment-count", post).text($("ol li", post).not(".empty").length);
-        }
-      });
+      load_comments(post);
     }
     return false;
   });
 
+  function load_comments (post) {
+    var feed = $(post).closest("li").attr("feed-id");
+    $.ajax({
+      url: '/feeds/comment/',
+      data: { 'feed': feed },
+      cache: false,
+      beforeSend: function () {
+        $("ol", post).html("<li class='loadcomment'><img src='/static/img/loading.gif'></li>");
+      },
+      success: function (data, status, xhr) {
+        $("ol", post).html(data);
+        $(".comment-count", post).text(xhr.getResponseHeader("X-Comments"));
+      }
+    });
+  };
+
+  $("ul.stream").on("click", ".load-comments a", function () {
+    var more = $(this).closest("li");
+    var feed = $(more).closest(".post").closest("li").attr("feed-id");
+    $.ajax({
+      url: '/feeds/comment/',
+      data: {
+        'feed': feed,
+        'before': $(more).attr("data-from-comment")
+      },
+      cache: false,
+      success: function (data) {
+        $(more).replaceWith(data);
+      }
+    });
+    return false;
+  });
+
   $("ul.stream").on("keydown", ".comments input[name='post']", function (evt) {
     var keyCode = evt.which?evt.which:evt.keyCode;
     if (keyCode == 13) {
       var form = $(this).closest("form");
       var container = $(this).closest(".comments");
       var input = $(this);
+      var data = $(form).serializeArray();
+      var last = last_comment(container);
+      if (last !== undefined) {
+        data.push({'name': 'last_comment', 'value': last});
+        data.push({'name': 'first_comment', 'value': first_comment(container)});
+      }
       $.ajax({
         url: '/feeds/comment/',
-        data: $(form).serialize(),
+        data: $.param(data),
         type: 'post',
         cache: false,
         beforeSend: function () {
           $(input).val("");
         },
-        success: function (data) {
-          $("ol", container).html(data);
-          var post_container = $(container).closest(".post");
-          $(".comment-count", post_container).text($("ol li", container).length);
+        success: function (data, status, xhr) {
+          show_comments(container, data, xhr, last);
         }
       });
       return false;
@@ -140,9 +171,6 @@ $(function () {
 
   var load_feeds = function () {
     if (!$("#load_feed").hasClass("no-more-feeds")) {
-      var page = $("#load_feed input[name='page']").val();
-      var next_page = parseInt($("#load_feed input[name='page']").val()) + 1;
-      $("#load_feed input[name='page']").val(next_page);
       $.ajax({
         url: '/feeds/load/',
         data: $("#load_feed").serialize(),
@@ -152,7 +180,9 @@ $(function () {
         },
         success: function (data) {
           if (data.length > 0) {
-            $("ul.stream").append(data)
+            $("ul.stream").append(data);
+            var from_feed = $("ul.stream > li:last-child").attr("feed-id");
+            $("#load_feed input[name='from_feed']").val(from_feed);
           }
           else {
             $("#load_feed").addClass("no-more-feeds");
@@ -180,9 +210,7 @@ $(function () {
         cache: false,
         success: function (data) {
           if (parseInt(data) > 0) {
-            $(".stream-update .new-posts").text(data);
-            $(".stream-update").show();
-            $(document).attr("title", "(" + data + ") " + page_title);
+            show_stream_update(data);
           }
         },
         complete: function() {
@@ -194,7 +222,6 @@ $(function () {
       window.setTimeout(check_new_feeds, 30000);
     }
   };
-  check_new_feeds();
 
   $(".stream-update a").click(function () {
     var last_feed = $(".stream li:first-child").attr("feed-id");
@@ -218,21 +245,29 @@ $(function () {
 
   $("input,textarea").attr("autocomplete", "off");
 
+  var counters_version;
+
   function update_feeds () {
     var first_feed = $(".stream li:first-child").attr("feed-id");
     var last_feed = $(".stream li:last-child").attr("feed-id");
     var feed_source = $("#feed_source").val();
 
     if (first_feed != undefined && last_feed != undefined) {
+      var data = {
+        'first_feed': first_feed,
+        'last_feed': last_feed,
+        'feed_source': feed_source
+      };
+      if (counters_version !== undefined) {
+        // Only the counters changed since the last call are sent back
+        data['version'] = counters_version;
+      }
       $.ajax({
         url: '/feeds/update/',
-        data: {
-          'first_feed': first_feed,
-          'last_feed': last_feed,
-          'feed_source': feed_source
-        },
+        data: data,
         cache: false,
-        success: function (data) {
+        success: function (data, status, xhr) {
+          counters_version = xhr.getResponseHeader("X-Counters-Version");
           $.each(data, function(id, feed) {
               var li = $("li[feed-id='" + id + "']");
               $(".like-count", li).text(feed.likes);
@@ -248,28 +283,120 @@ $(function () {
       window.setTimeout(update_feeds, 30000);
     }
   };
-  update_feeds();
 
-  function track_comments () {
-    $(".tracking").each(function () {
-      var container = $(this);
-      var feed = $(this).closest("li").attr("feed-id");
-      $.ajax({
-        url: '/feeds/track_comments/',
-        data: {'feed': feed},
-        cache: false,
-        success: function (data) {
-          if (data != 0) {
-            $("ol", container).html(data);
-            var post_container = $(container).closest(".post");
-            $(".comment-count", post_container).text($("ol li", container).length);
-          }
+  function last_comment (container) {
+    return $("ol > li[feed-id]", container).last().attr("feed-id");
+  };
+
+  function first_comment (container) {
+    return $("ol > li[feed-id]", container).first().attr("feed-id");
+  };
+
+  function comments_removed (container, xhr, last) {
+    // The server counts the comments still there among the displayed ones,
+    // see feeds.views._new_comments
+    var displayed = xhr.getResponseHeader("X-Displayed-Comments");
+    if (displayed === null) {
+      return false;
+    }
+    var count = $("ol > li[feed-id]", container).filter(function () {
+      return parseInt($(this).attr("feed-id"), 10) <= parseInt(last, 10);
+    }).length;
+    return count != parseInt(displayed, 10);
+  };
+
+  function show_comments (container, data, xhr, last) {
+    // Only the comments newer than the last displayed one are sent back
+    // when there is one, see feeds.views.track_comments
+    if (last !== undefined && comments_removed(container, xhr, last)) {
+      load_comments($(container).closest(".post"));
+      return;
+    }
+    if (!data) {
+      return;
+    }
+    if (last !== undefined) {
+      // A poll and a post may return the same new comments
+      $($.parseHTML(data)).filter("li").each(function () {
+        var id = $(this).attr("feed-id");
+        if ($("ol > li[feed-id='" + id + "']", container).length == 0) {
+          $("ol", container).append(this);
         }
       });
+    }
+    else {
+      $("ol", container).html(data);
+    }
+    var post_container = $(container).closest(".post");
+    $(".comment-count", post_container).text(xhr.getResponseHeader("X-Comments"));
+  };
+
+  function refresh_comments (container) {
+    var feed = $(container).closest("li").attr("feed-id");
+    var last = last_comment(container);
+    var data = {'feed': feed};
+    if (last !== undefined) {
+      data['last_comment'] = last;
+      data['first_comment'] = first_comment(container);
+    }
+    $.ajax({
+      url: '/feeds/track_comments/',
+      data: data,
+      cache: false,
+      success: function (data, status, xhr) {
+        show_comments(container, data, xhr, last);
+      }
+    });
+  };
+
+  function track_comments () {
+    $(".tracking").each(function () {
+      refresh_comments(this);
     });
     window.setTimeout(track_comments, 30000);
   };
-  track_comments();
+
+  if (window.bootcamp_events) {
+    // The server pushes the new feeds and the counters changes, see events.js
+    var current_user;
+    $(document).on("bootcamp:hello", function (evt, data) {
+      current_user = data.user;
+    });
+
+    $(document).on("bootcamp:feed", function (evt, data) {
+      var feed_source = $("#feed_source").val();
+      if (data.user == current_user) {
+        return;
+      }
+      if (feed_source != undefined && feed_source != "all" && feed_source != data.user) {
+        return;
+      }
+      if ($("ul.stream > li[feed-id='" + data.id + "']").length == 0) {
+        show_stream_update((parseInt($(".stream-update .new-posts").text()) || 0) + 1);
+      }
+    });
+
+    $(document).on("bootcamp:counter", function (evt, data) {
+      var li = $("ul.stream > li[feed-id='" + data.id + "']");
+      if (data.model != "feed" || li.length == 0) {
+        return;
+      }
+      if (data.field == "likes") {
+        $(".like-count", li).text(data.value);
+      }
+      else if (data.field == "comments") {
+        $(".comment-count", li).text(data.value);
+        $(".comments.tracking", li).each(function () {
+          refresh_comments(this);
+        });
+      }
+    });
+  }
+  else {
+    check_new_feeds();
+    update_feeds();
+    track_comments();
+  }
 
   $("ul.stream").on("click", ".remove-feed", function () {
     var li = $(this).closest("li");
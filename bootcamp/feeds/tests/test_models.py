@@ -1,7 +1,12 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
 
-from bootcamp.activities.models import Activity
+from bootcamp.activities.models import Activity, Notification
 from bootcamp.feeds.models import Feed
 
 
@@ -60,3 +65,100 @@ class TestModels(TestCase):
         self.assertTrue(self.feed in feeds)
         self.assertTrue(self.feed2 in feeds)
 
+    def test_post_html_is_stored(self):
+        feed = Feed.objects.create(user=self.user,
+                                   post='<b>see</b> www.example.com')
+        html = ('&lt;b&gt;see&lt;/b&gt; <a href="http://www.example.com" '
+                'rel="nofollow">www.example.com</a>')
+        self.assertEqual(Feed.objects.get(pk=feed.pk).post_html, html)
+        self.assertEqual(feed.linkfy_post(), html)
+        comment = self.feed.comment(self.other_user, 'www.example.com')
+        self.assertIn('href="http://www.example.com"',
+                      Feed.objects.get(pk=comment.pk).post_html)
+
+    def test_render_feeds_command(self):
+        feed = Feed.objects.create(user=self.user, post='mail a@example.com')
+        self.assertNotIn('mailto:', Feed.objects.get(pk=feed.pk).post_html)
+        with override_settings(LINKIFY_OPTIONS={'parse_email': True}):
+            out = StringIO()
+            call_command('render_feeds', stdout=out)
+        self.assertIn('Rendered 1 rows again.', out.getvalue())
+        self.assertIn('href="mailto:a@example.com"',
+                      Feed.objects.get(pk=feed.pk).post_html)
+
+
+class TestRemoval(TestCase):
+    """TestCase class to test the removal of the feeds
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username='other_test_user',
+            email='other_test@gmail.com',
+            password='top_secret'
+        )
+        self.feed = Feed.objects.create(user=self.user, post='A post')
+
+    def _create_thread(self, feed, count):
+        for i in range(count):
+            comment = feed.comment(self.other_user, 'comment {0}'.format(i))
+            self.other_user.profile.notify_commented(feed)
+            Activity.objects.create(activity_type=Activity.LIKE,
+                                    feed=comment.pk, user=self.user)
+        Activity.objects.create(activity_type=Activity.LIKE, feed=feed.pk,
+                                user=self.other_user)
+        self.other_user.profile.notify_liked(feed)
+
+    def test_remove_deletes_the_thread(self):
+        self._create_thread(self.feed, 2)
+        other_feed = Feed.objects.create(user=self.user, post='Other post')
+        self._create_thread(other_feed, 1)
+        self.assertEqual(Notification.get_unread_count(self.user), 5)
+        self.feed.remove()
+        self.assertEqual(list(Feed.objects.exclude(
+            pk=other_feed.pk).exclude(parent=other_feed)), [])
+        self.assertEqual(Activity.objects.count(), 2)
+        self.assertEqual(Notification.objects.count(), 2)
+        self.assertEqual(cache.get(Notification.get_unread_cache_key(
+            self.user.pk)), 2)
+        self.assertEqual(Feed.get_timeline('all'), [other_feed])
+
+    def test_remove_comment_decrements_parent(self):
+        self._create_thread(self.feed, 2)
+        comment = Feed.objects.filter(parent=self.feed).first()
+        comment.remove()
+        self.assertEqual(Feed.objects.get(pk=self.feed.pk).comments, 1)
+        self.assertFalse(Activity.objects.filter(feed=comment.pk).exists())
+
+    def test_purge_constant_number_of_queries(self):
+        self._create_thread(self.feed, 2)
+        with CaptureQueriesContext(connection) as small_thread:
+            self.feed.purge()
+        feed = Feed.objects.create(user=self.user, post='Popular post')
+        self._create_thread(feed, 10)
+        with CaptureQueriesContext(connection) as large_thread:
+            feed.purge()
+        self.assertEqual(len(small_thread), len(large_thread))
+
+    @override_settings(FEEDS_SOFT_DELETE_THRESHOLD=2, JOBS_ASYNC=False)
+    def test_popular_feed_is_hidden_then_purged(self):
+        self._create_thread(self.feed, 2)
+        self.feed = Feed.objects.get(pk=self.feed.pk)
+        self.feed.hide()
+        self.assertTrue(Feed.objects.get(pk=self.feed.pk).is_removed)
+        self.assertEqual(Feed.get_timeline('all'), [])
+        self.assertEqual(list(Feed.get_feeds()), [])
+        self.feed.remove()
+        self.assertFalse(Feed.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+
+    def test_purge_feeds_command(self):
+        self.feed.hide()
+        call_command('purge_feeds', stdout=StringIO())
+        self.assertFalse(Feed.objects.exists())
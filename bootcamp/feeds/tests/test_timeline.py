@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.six import StringIO
+
+from bootcamp.feeds.models import Feed, Timeline
+from bootcamp.feeds.timeline import (MemoryTimelineBackend, _raise_latest,
+                                     get_latest, get_latest_cache_key)
+
+
+class TestTimeline(TestCase):
+    """TestCase class to test the materialized feed timelines
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        self.other_user = get_user_model().objects.create_user(
+            username='other_test_user',
+            email='other_test@gmail.com',
+            password='top_secret'
+        )
+        self.feeds = [Feed.objects.create(user=self.user,
+                                          post='post {0}'.format(i))
+                      for i in range(5)]
+        self.other_feed = Feed.objects.create(user=self.other_user,
+                                              post='other post')
+
+    def test_feeds_are_pushed_on_save(self):
+        timeline = Feed.get_timeline('all', limit=10)
+        self.assertEqual(timeline, [self.other_feed] + self.feeds[::-1])
+        timeline = Feed.get_timeline(str(self.user.id), limit=10)
+        self.assertEqual(timeline, self.feeds[::-1])
+
+    def test_comments_are_not_pushed(self):
+        self.feeds[0].comment(self.other_user, 'a comment')
+        self.assertEqual(len(Feed.get_timeline('all', limit=10)), 6)
+
+    def test_keyset_pagination(self):
+        first_page = Feed.get_timeline('all', limit=4)
+        second_page = Feed.get_timeline('all', first_page[-1].id, limit=4)
+        self.assertEqual(first_page + second_page,
+                         [self.other_feed] + self.feeds[::-1])
+
+    def test_timeline_after(self):
+        timeline = Feed.get_timeline_after(str(self.user.id),
+                                           self.feeds[2].id)
+        self.assertEqual(timeline, [self.feeds[4], self.feeds[3]])
+
+    def test_feeds_are_removed_on_delete(self):
+        self.other_feed.delete()
+        self.assertEqual(Feed.get_timeline(str(self.other_user.id)), [])
+        self.assertEqual(len(Feed.get_timeline('all')), 5)
+
+    def test_latest_feed_mark(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(get_latest('all'), self.other_feed.id)
+            self.assertEqual(get_latest(str(self.user.id)), self.feeds[4].id)
+        self.other_feed.delete()
+        self.assertEqual(get_latest('all'), self.feeds[4].id)
+        self.assertEqual(get_latest(str(self.other_user.id)), 0)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_latest(str(self.user.id)), self.feeds[4].id)
+
+    def test_raise_latest_feed_mark(self):
+        cache_key = get_latest_cache_key('all')
+        cache.delete(cache_key)
+        _raise_latest('all', 5)
+        self.assertEqual(cache.get(cache_key), 5)
+        _raise_latest('all', 3)
+        self.assertEqual(cache.get(cache_key), 5)
+        _raise_latest('all', 8)
+        self.assertEqual(cache.get(cache_key), 8)
+
+    def test_rebuild_timelines_command(self):
+        Timeline.objects.all().delete()
+        call_command('rebuild_timelines', stdout=StringIO())
+        self.assertEqual(Timeline.objects.count(), 12)
+        self.assertEqual(Feed.get_timeline('all', limit=10),
+                         [self.other_feed] + self.feeds[::-1])
+
+    def test_memory_backend(self):
+        backend = MemoryTimelineBackend()
+        for feed_id in [5, 1, 3, 2, 4, 3]:
+            backend.push('all', feed_id)
+        self.assertEqual(backend.page('all', limit=2), [5, 4])
+        self.assertEqual(backend.page('all', before=4, limit=2), [3, 2])
+        self.assertEqual(backend.since('all', 3), [5, 4])
+        backend.remove('all', 4)
+        self.assertEqual(backend.page('all', limit=10), [5, 3, 2, 1])
+        self.assertEqual(backend.page('other'), [])
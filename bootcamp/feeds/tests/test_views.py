@@ -1,9 +1,11 @@
 import json
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import Client, TestCase
 
+from bootcamp.activities.models import Activity
 from bootcamp.feeds.models import Feed
 
 
@@ -13,6 +15,7 @@ class TestViews(TestCase):
     associated with Views
     """
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.other_client = Client()
         self.user = get_user_model().objects.create_user(
@@ -46,22 +49,28 @@ class TestViews(TestCase):
         self.assertEqual(request.status_code, 200)
 
     def test_load_page1_viewAllFeeds(self):
-        response = self.client.get('/feeds/load/?page=1&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        response = self.client.get('/feeds/load/?feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
         self.assertTrue(self.feed.post in response.content)
         self.assertTrue(self.feed_2.post in response.content)
 
     def test_load_page1_viewTestUserFeeds(self):
-        response = self.client.get('/feeds/load/?page=1&feed_source=' + str(self.user.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        response = self.client.get('/feeds/load/?feed_source=' + str(self.user.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
         self.assertTrue(self.feed.post in response.content)
 
-    def test_load_withoutPageNumber_BadRequest(self):
-        response = self.client.get('/feeds/load/?feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    def test_load_invalidFromFeed_BadRequest(self):
+        response = self.client.get('/feeds/load/?from_feed=abc&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 400)
 
+    def test_load_fromFeed_olderFeedsOnly(self):
+        response = self.client.get('/feeds/load/?from_feed=' + str(self.feed_2.id) + '&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue('feed-id="{0}"'.format(self.feed.id) in response.content)
+        self.assertFalse('feed-id="{0}"'.format(self.feed_2.id) in response.content)
+
     def test_load_emptyPage_NoFeed(self):
-        response = self.client.get('/feeds/load/?page=10&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        response = self.client.get('/feeds/load/?from_feed=' + str(self.feed.id) + '&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
         self.assertFalse(self.feed.post in response.content)
 
@@ -76,6 +85,22 @@ class TestViews(TestCase):
         self.assertEquals(response.status_code, 200)
         self.assertEquals(response.content, '1')
 
+    def test_check_noNewFeed_noQuery(self):
+        # Only the session and the user are read
+        with self.assertNumQueries(2):
+            response = self.client.get('/feeds/check/?last_feed=' + str(self.feed_2.id) + '&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content, '0')
+        Feed.objects.create(user=self.other_user, post='A new post')
+        response = self.client.get('/feeds/check/?last_feed=' + str(self.feed_2.id) + '&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content, '1')
+        with self.assertNumQueries(2):
+            response = self.client.get('/feeds/check/?last_feed=' + str(self.feed_2.id) + '&feed_source=' + str(self.user.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content, '0')
+
+    def test_check_invalidLastFeed_BadRequest(self):
+        response = self.client.get('/feeds/check/?last_feed=abc&feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 400)
+
     def test_post(self):
         response = self.client.post('/feeds/post/', { 'post': 'another_post', 'last_feed': str(self.feed.id) }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
@@ -95,6 +120,14 @@ class TestViews(TestCase):
         self.assertEquals(response.status_code, 200)
         self.assertEquals(response.content, '0')
 
+    def test_like_removedFeed_NotFound(self):
+        self.feed.hide()
+        response = self.client.post('/feeds/like/', {'feed': str(self.feed.id)}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 404)
+        response = self.client.post('/feeds/comment/', {'feed': str(self.feed.id), 'post': 'my_feed1_comment'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 404)
+        self.assertFalse(Feed.objects.filter(parent=self.feed).exists())
+
     def test_getComment(self):
         response = self.client.get('/feeds/comment/?feed=' + str(self.feed_2.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
@@ -117,6 +150,24 @@ class TestViews(TestCase):
         self.assertEquals(response.status_code, 200)
         self.assertEquals(json.loads(response.content), {str(self.feed.id): {"likes": 0, "comments": 0}, str(self.feed_2.id): {"likes": 0, "comments": 1}})
 
+    def test_update_version_changedCountersOnly(self):
+        url = ('/feeds/update/?first_feed={0}&last_feed={1}'
+               '&feed_source=all'.format(self.feed_2.id, self.feed.id))
+        response = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(len(json.loads(response.content)), 2)
+        version = int(response['X-Counters-Version'])
+        Feed.objects.filter(pk=self.feed_2.pk).update(
+            counters_version=version)
+        Feed.objects.filter(pk=self.feed.pk).update(
+            counters_version=version + 1)
+        with self.assertNumQueries(3):
+            response = self.client.get(url + '&version={0}'.format(version), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(json.loads(response.content), {str(self.feed.id): {"likes": 0, "comments": 0}})
+
+    def test_update_invalidVersion_BadRequest(self):
+        response = self.client.get('/feeds/update/?first_feed={0}&last_feed={0}&feed_source=all&version=abc'.format(self.feed.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 400)
+
     def test_trackComments_getFeed1Comments(self):
         response = self.client.get('/feeds/track_comments/?feed=' + str(self.feed_2.id), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
@@ -141,3 +192,92 @@ class TestViews(TestCase):
         response = self.client.post('/feeds/remove/', {'feed': str(self.feed.id)}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertEquals(response.status_code, 200)
         self.assertEquals(response.content, '')
+
+    def _create_liked_feeds(self, count):
+        for i in range(count):
+            feed = Feed.objects.create(user=self.other_user,
+                                       post='liked post {0}'.format(i))
+            Activity.objects.create(activity_type=Activity.LIKE,
+                                    feed=feed.pk, user=self.user)
+
+    def test_load_constantNumberOfQueries(self):
+        self._create_liked_feeds(2)
+        with self.assertNumQueries(5):
+            response = self.client.get('/feeds/load/?feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('Unlike'), 2)
+        self._create_liked_feeds(8)
+        with self.assertNumQueries(5):
+            response = self.client.get('/feeds/load/?feed_source=all', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('Unlike'), 10)
+
+    def _comment(self, count, user=None):
+        return [self.feed_2.comment(user=user or self.other_user,
+                                    post='comment {0}'.format(i))
+                for i in range(count)]
+
+    def test_trackComments_lastComment_newerCommentsOnly(self):
+        last = Feed.objects.get(parent=self.feed_2)
+        self._comment(2)
+        response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': last.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 200)
+        self.assertFalse(self.comment_text in response.content)
+        self.assertTrue('comment 0' in response.content)
+        self.assertTrue('comment 1' in response.content)
+        self.assertEquals(response['X-Comments'], '3')
+
+    def test_trackComments_lastComment_nothingNew(self):
+        last = Feed.objects.get(parent=self.feed_2)
+        response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': last.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 200)
+        self.assertEquals(response.content, '')
+
+    def test_trackComments_invalidLastComment_BadRequest(self):
+        response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': 'abc'}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 400)
+
+    def test_trackComments_constantNumberOfQueries(self):
+        last = Feed.objects.get(parent=self.feed_2)
+        self._comment(2)
+        with self.assertNumQueries(4):
+            self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': last.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self._comment(8)
+        with self.assertNumQueries(4):
+            response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': last.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('feed-id='), 10)
+
+    def test_trackComments_firstComment_displayedCount(self):
+        first = Feed.objects.get(parent=self.feed_2)
+        comments = self._comment(3)
+        comments[1].remove()
+        response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'first_comment': first.id, 'last_comment': comments[2].id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content, '')
+        self.assertEquals(response['X-Displayed-Comments'], '3')
+        response = self.client.get('/feeds/track_comments/', {'feed': self.feed_2.id, 'last_comment': comments[2].id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertFalse(response.has_header('X-Displayed-Comments'))
+
+    def test_postComment_lastComment_newerCommentsOnly(self):
+        last = Feed.objects.get(parent=self.feed_2)
+        response = self.client.post('/feeds/comment/', {'feed': self.feed_2.id, 'post': 'my_new_comment', 'last_comment': last.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.status_code, 200)
+        self.assertFalse(self.comment_text in response.content)
+        self.assertTrue('my_new_comment' in response.content)
+        self.assertEquals(response['X-Comments'], '2')
+
+    def test_getComment_latestPage_loadOlder(self):
+        comments = self._comment(25)
+        response = self.client.get('/feeds/comment/', {'feed': self.feed_2.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('feed-id='), 20)
+        self.assertTrue('data-from-comment="{0}"'.format(comments[5].id) in response.content)
+        self.assertTrue('comment 24' in response.content)
+        response = self.client.get('/feeds/comment/', {'feed': self.feed_2.id, 'before': comments[5].id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('feed-id='), 6)
+        self.assertTrue(self.comment_text in response.content)
+        self.assertFalse('data-from-comment' in response.content)
+        self.assertFalse('Be the first' in response.content)
+
+    def test_getComment_latestPage_wholeThread(self):
+        self._comment(19)
+        response = self.client.get('/feeds/comment/', {'feed': self.feed_2.id}, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEquals(response.content.count('feed-id='), 20)
+        self.assertTrue(self.comment_text in response.content)
+        self.assertFalse('data-from-comment' in response.content)
@@ -0,0 +1,215 @@
+"""Materialized feed timelines.
+
+Every top-level ``Feed`` is pushed, when it is written, into the timeline of
+its author and into the global ``all`` timeline. The read views then page
+over those precomputed id lists with a keyset (``id < cursor``) instead of
+filtering and counting the whole ``Feed`` table on every request.
+
+Timelines are keyed by the same values the front end already sends as
+``feed_source``: ``'all'`` for the global stream or a user id.
+
+The storage is pluggable through the ``FEEDS_TIMELINE_BACKEND`` setting,
+which holds the dotted path of a ``BaseTimelineBackend`` subclass.
+
+The id of the newest feed of every timeline, its high-water mark, is kept
+in the cache, so the polls for new feeds are answered without a query while
+nobody posts. The cache has to be shared by the worker processes, see
+``CACHES`` in the settings. A mark is raised when a feed is pushed and
+dropped when its feed is removed, then read again from the backend.
+
+The cache has no compare-and-set: a mark read again from the backend is
+only added when missing and a raised mark is read back and written again
+while lower. Two posts raising the same mark at the very same time can
+still leave it on the older feed, which only delays the notice of the new
+feeds until another post or ``FEEDS_LATEST_CACHE_TIMEOUT`` seconds. That
+race is accepted.
+"""
+from __future__ import unicode_literals
+
+import bisect
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+GLOBAL_TIMELINE = 'all'
+DEFAULT_BACKEND = 'bootcamp.feeds.timeline.DatabaseTimelineBackend'
+
+
+def get_timeline_keys(feed):
+    """Returns the keys of every timeline the given feed belongs to."""
+    return [GLOBAL_TIMELINE, str(feed.user_id)]
+
+
+class BaseTimelineBackend(object):
+    """Interface every timeline storage has to implement. All the reading
+    methods return feed ids, newest first.
+    """
+
+    def push(self, key, feed_id):
+        raise NotImplementedError
+
+    def push_many(self, entries):
+        """Pushes an iterable of ``(key, feed_id)`` pairs."""
+        for key, feed_id in entries:
+            self.push(key, feed_id)
+
+    def remove(self, key, feed_id):
+        raise NotImplementedError
+
+    def page(self, key, before=None, limit=10):
+        """Returns up to ``limit`` ids older than ``before``, or the newest
+        ones when no cursor is given.
+        """
+        raise NotImplementedError
+
+    def since(self, key, after):
+        """Returns every id newer than ``after``."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class DatabaseTimelineBackend(BaseTimelineBackend):
+    """Stores the timelines in the ``feeds_timeline`` table. The unique
+    ``(source, feed)`` index serves both the lookups and the ordering.
+    """
+
+    @property
+    def model(self):
+        return apps.get_model('feeds', 'Timeline')
+
+    def push(self, key, feed_id):
+        self.model.objects.get_or_create(source=key, feed_id=feed_id)
+
+    def push_many(self, entries, batch_size=1000):
+        model = self.model
+        model.objects.bulk_create(
+            [model(source=key, feed_id=feed_id) for key, feed_id in entries],
+            batch_size=batch_size)
+
+    def remove(self, key, feed_id):
+        self.model.objects.filter(source=key, feed_id=feed_id).delete()
+
+    def page(self, key, before=None, limit=10):
+        entries = self.model.objects.filter(source=key)
+        if before is not None:
+            entries = entries.filter(feed_id__lt=before)
+        return list(entries.order_by('-feed_id').values_list(
+            'feed_id', flat=True)[:limit])
+
+    def since(self, key, after):
+        return list(self.model.objects.filter(
+            source=key, feed_id__gt=after).order_by('-feed_id').values_list(
+                'feed_id', flat=True))
+
+    def clear(self):
+        self.model.objects.all().delete()
+
+
+class MemoryTimelineBackend(BaseTimelineBackend):
+    """Keeps every timeline as a sorted list in the process memory, the same
+    way a Redis sorted set would. The lists are not shared between worker
+    processes, so this backend is meant for single process deployments and
+    tests, or as a template for a Redis backed implementation.
+    """
+
+    def __init__(self):
+        self._timelines = {}
+        self._lock = threading.Lock()
+
+    def push(self, key, feed_id):
+        with self._lock:
+            timeline = self._timelines.setdefault(key, [])
+            index = bisect.bisect_left(timeline, feed_id)
+            if index == len(timeline) or timeline[index] != feed_id:
+                timeline.insert(index, feed_id)
+
+    def remove(self, key, feed_id):
+        with self._lock:
+            timeline = self._timelines.get(key, [])
+            index = bisect.bisect_left(timeline, feed_id)
+            if index < len(timeline) and timeline[index] == feed_id:
+                del timeline[index]
+
+    def page(self, key, before=None, limit=10):
+        with self._lock:
+            timeline = self._timelines.get(key, [])
+            end = len(timeline)
+            if before is not None:
+                end = bisect.bisect_left(timeline, before)
+            return timeline[max(end - limit, 0):end][::-1]
+
+    def since(self, key, after):
+        with self._lock:
+            timeline = self._timelines.get(key, [])
+            start = bisect.bisect_right(timeline, after)
+            return timeline[start:][::-1]
+
+    def clear(self):
+        with self._lock:
+            self._timelines = {}
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        backend_class = import_string(getattr(
+            settings, 'FEEDS_TIMELINE_BACKEND', DEFAULT_BACKEND))
+        _backend = backend_class()
+    return _backend
+
+
+def get_latest_cache_key(key):
+    return 'feeds:latest:{0}'.format(key)
+
+
+def _get_latest_timeout():
+    return getattr(settings, 'FEEDS_LATEST_CACHE_TIMEOUT', 60)
+
+
+def get_latest(key):
+    """Returns the id of the newest feed of the ``key`` timeline, 0 when it
+    is empty.
+    """
+    cache_key = get_latest_cache_key(key)
+    latest = cache.get(cache_key)
+    if latest is None:
+        ids = get_backend().page(key, limit=1)
+        latest = ids[0] if ids else 0
+        # Leaves alone a mark raised by a push meanwhile.
+        cache.add(cache_key, latest, _get_latest_timeout())
+    return latest
+
+
+def _raise_latest(key, feed_id):
+    cache_key = get_latest_cache_key(key)
+    timeout = _get_latest_timeout()
+    if cache.add(cache_key, feed_id, timeout):
+        return
+
+    for _ in range(3):
+        latest = cache.get(cache_key)
+        if latest is not None and latest >= feed_id:
+            return
+
+        cache.set(cache_key, feed_id, timeout)
+
+
+def push_feed(feed):
+    for key in get_timeline_keys(feed):
+        get_backend().push(key, feed.pk)
+        _raise_latest(key, feed.pk)
+
+
+def remove_feed(feed):
+    for key in get_timeline_keys(feed):
+        get_backend().remove(key, feed.pk)
+        if cache.get(get_latest_cache_key(key)) == feed.pk:
+            cache.delete(get_latest_cache_key(key))
@@ -1,37 +1,43 @@
 import json
 
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.http import (HttpResponse, HttpResponseBadRequest,
                          HttpResponseForbidden)
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404, render
 from django.template.context_processors import csrf
 from django.template.loader import render_to_string
 
+from bootcamp.activities import counters
 from bootcamp.activities.models import Activity
 from bootcamp.decorators import ajax_required
+from bootcamp.feeds import timeline
+from bootcamp.feeds.hydration import hydrate_feeds
 from bootcamp.feeds.models import Feed
+from bootcamp.feeds.timeline import GLOBAL_TIMELINE
 
 FEEDS_NUM_PAGES = 10
+FEEDS_CHECK_LIMIT = 100
+FEED_COMMENTS_NUM_PAGES = 20
 
 
 @login_required
 def feeds(request):
-    all_feeds = Feed.get_feeds()
-    paginator = Paginator(all_feeds, FEEDS_NUM_PAGES)
-    feeds = paginator.page(1)
+    feeds = Feed.get_timeline(GLOBAL_TIMELINE, limit=FEEDS_NUM_PAGES)
+    hydrate_feeds(feeds, request.user)
     from_feed = -1
     if feeds:
-        from_feed = feeds[0].id
+        from_feed = feeds[-1].id
     return render(request, 'feeds/feeds.html', {
         'feeds': feeds,
         'from_feed': from_feed,
-        'page': 1,
         })
 
 
 def feed(request, pk):
-    feed = get_object_or_404(Feed, pk=pk)
+    feed = get_object_or_404(Feed.objects.select_related('user__profile'),
+                             pk=pk, is_removed=False)
+    hydrate_feeds([feed], request.user)
     return render(request, 'feeds/feed.html', {'feed': feed})
 
 
@@ -39,47 +45,35 @@ def feed(request, pk):
 @ajax_required
 def load(request):
     from_feed = request.GET.get('from_feed')
-    page = request.GET.get('page')
-    feed_source = request.GET.get('feed_source')
-    all_feeds = Feed.get_feeds(from_feed)
-    if feed_source != 'all':
-        all_feeds = all_feeds.filter(user__id=feed_source)
-    paginator = Paginator(all_feeds, FEEDS_NUM_PAGES)
+    feed_source = request.GET.get('feed_source', GLOBAL_TIMELINE)
     try:
-        feeds = paginator.page(page)
-    except PageNotAnInteger:
+        feeds = Feed.get_timeline(feed_source, from_feed,
+                                  limit=FEEDS_NUM_PAGES)
+    except (TypeError, ValueError):
         return HttpResponseBadRequest()
-    except EmptyPage:
-        feeds = []
-    html = ''
-    csrf_token = (csrf(request)['csrf_token'])
-    for feed in feeds:
-        html = '{0}{1}'.format(html,
-                               render_to_string('feeds/partial_feed.html',
-                                                {
-                                                    'feed': feed,
-                                                    'user': request.user,
-                                                    'csrf_token': csrf_token
-                                                    }))
 
+    csrf_token = (csrf(request)['csrf_token'])
+    html = _render_feeds(feeds, request.user, csrf_token)
     return HttpResponse(html)
 
 
-def _html_feeds(last_feed, user, csrf_token, feed_source='all'):
-    feeds = Feed.get_feeds_after(last_feed)
-    if feed_source != 'all':
-        feeds = feeds.filter(user__id=feed_source)
-    html = ''
-    for feed in feeds:
-        html = '{0}{1}'.format(html,
-                               render_to_string('feeds/partial_feed.html',
-                                                {
-                                                    'feed': feed,
-                                                    'user': user,
-                                                    'csrf_token': csrf_token
-                                                    }))
+def _render_feeds(feeds, user, csrf_token):
+    """Renders a whole page of feeds in a single template pass, so the
+    partial template is resolved once and the output is joined once.
+    """
+    if not feeds:
+        return ''
+
+    return render_to_string('feeds/partial_feeds.html', {
+        'feeds': hydrate_feeds(feeds, user),
+        'user': user,
+        'csrf_token': csrf_token
+        })
 
-    return html
+
+def _html_feeds(last_feed, user, csrf_token, feed_source=GLOBAL_TIMELINE):
+    feeds = Feed.get_timeline_after(feed_source, last_feed)
+    return _render_feeds(feeds, user, csrf_token)
 
 
 @login_required
@@ -95,13 +89,24 @@ def load_new(request):
 @login_required
 @ajax_required
 def check(request):
-    last_feed = request.GET.get('last_feed')
-    feed_source = request.GET.get('feed_source')
+    """Returns the number of feeds newer than ``last_feed``, up to
+    ``FEEDS_CHECK_LIMIT``. Nothing is queried unless the high-water mark of
+    the timeline shows a newer feed.
+    """
+    feed_source = request.GET.get('feed_source', GLOBAL_TIMELINE)
+    try:
+        last_feed = int(request.GET.get('last_feed'))
+    except (TypeError, ValueError):
+        return HttpResponseBadRequest()
+
+    if timeline.get_latest(feed_source) <= last_feed:
+        return HttpResponse(0)
+
     feeds = Feed.get_feeds_after(last_feed)
-    if feed_source != 'all':
+    if feed_source != GLOBAL_TIMELINE:
         feeds = feeds.filter(user__id=feed_source)
 
-    count = feeds.count()
+    count = feeds.order_by()[:FEEDS_CHECK_LIMIT].count()
     return HttpResponse(count)
 
 
@@ -126,20 +131,84 @@ def post(request):
 @ajax_required
 def like(request):
     feed_id = request.POST['feed']
-    feed = Feed.objects.get(pk=feed_id)
+    feed = get_object_or_404(Feed, pk=feed_id, is_removed=False)
     user = request.user
-    like = Activity.objects.filter(activity_type=Activity.LIKE, feed=feed_id,
-                                   user=user)
-    if like:
-        user.profile.unotify_liked(feed)
-        like.delete()
+    try:
+        with transaction.atomic():
+            unliked, _ = Activity.objects.filter(
+                activity_type=Activity.LIKE, feed=feed.pk, user=user).delete()
+            if unliked:
+                counters.decrement(feed, 'likes', unliked)
+                user.profile.unotify_liked(feed)
+
+            else:
+                Activity.objects.create(activity_type=Activity.LIKE,
+                                        feed=feed.pk, user=user)
+                counters.increment(feed, 'likes')
+                user.profile.notify_liked(feed)
+    except IntegrityError:
+        # A concurrent request of the same user liked the feed first.
+        feed = Feed.objects.get(pk=feed.pk)
+
+    return HttpResponse(feed.likes)
+
+
+def _comments_page(feed, before=None):
+    """Returns the latest page of comments older than the comment id
+    ``before`` and the id to load the older comments from, -1 when the
+    page starts with the first comment of the feed.
+    """
+    comments = feed.get_comments_page(before=before,
+                                      limit=FEED_COMMENTS_NUM_PAGES + 1)
+    if len(comments) <= FEED_COMMENTS_NUM_PAGES:
+        return comments, -1
+
+    comments = comments[1:]
+    return comments, comments[0].pk
+
+
+def _render_comments(request, feed, comments, from_comment=-1, delta=False):
+    """Renders ``comments`` in a single template pass. A ``delta`` is added
+    to the comments already displayed, so it has no placeholder when empty.
+    """
+    response = render(request, 'feeds/partial_feed_comments.html', {
+        'feed': feed,
+        'comments': comments,
+        'from_comment': from_comment,
+        'delta': delta,
+        })
+    response['X-Comments'] = feed.comments
+    return response
+
+
+def _new_comments(request, feed, last_comment, first_comment=None):
+    """Renders the comments newer than the ``last_comment`` id displayed,
+    nothing when there are none, or the latest page of comments when no
+    comment is displayed yet. Given the ``first_comment`` id displayed,
+    the number of comments left from ``first_comment`` to ``last_comment``
+    is returned in the ``X-Displayed-Comments`` header, so the browser can
+    tell that some of them were removed.
+    """
+    try:
+        if last_comment is None:
+            comments, from_comment = _comments_page(feed)
+            return _render_comments(request, feed, comments, from_comment)
+
+        comments = feed.get_comments_page(after=last_comment)
+        displayed = None
+        if first_comment is not None:
+            displayed = feed.count_comments_between(first_comment,
+                                                    last_comment)
+    except ValueError:
+        return HttpResponseBadRequest()
 
+    if comments:
+        response = _render_comments(request, feed, comments, delta=True)
     else:
-        like = Activity(activity_type=Activity.LIKE, feed=feed_id, user=user)
-        like.save()
-        user.profile.notify_liked(feed)
-
-    return HttpResponse(feed.calculate_likes())
+        response = HttpResponse()
+    if displayed is not None:
+        response['X-Displayed-Comments'] = displayed
+    return response
 
 
 @login_required
@@ -147,7 +216,9 @@ def like(request):
 def comment(request):
     if request.method == 'POST':
         feed_id = request.POST['feed']
-        feed = Feed.objects.get(pk=feed_id)
+        feed = get_object_or_404(Feed, pk=feed_id, is_removed=False)
+        last_comment = request.POST.get('last_comment') or None
+        first_comment = request.POST.get('first_comment') or None
         post = request.POST['post']
         post = post.strip()
         if len(post) > 0:
@@ -156,59 +227,77 @@ def comment(request):
             feed.comment(user=user, post=post)
             user.profile.notify_commented(feed)
             user.profile.notify_also_commented(feed)
-        return render(request, 'feeds/partial_feed_comments.html',
-                      {'feed': feed})
+        return _new_comments(request, feed, last_comment, first_comment)
 
     else:
         feed_id = request.GET.get('feed')
-        feed = Feed.objects.get(pk=feed_id)
-        return render(request, 'feeds/partial_feed_comments.html',
-                      {'feed': feed})
+        feed = get_object_or_404(Feed, pk=feed_id, is_removed=False)
+        before = request.GET.get('before') or None
+        try:
+            comments, from_comment = _comments_page(feed, before)
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        return _render_comments(request, feed, comments, from_comment,
+                                delta=before is not None)
 
 
 @login_required
 @ajax_required
 def update(request):
+    """Returns the likes and comments of the feeds displayed, between
+    ``last_feed`` and ``first_feed``, which changed since the ``version``
+    given, all of them without it. The version to send with the next call
+    is returned in the ``X-Counters-Version`` header.
+    """
     first_feed = request.GET.get('first_feed')
     last_feed = request.GET.get('last_feed')
     feed_source = request.GET.get('feed_source')
-    feeds = Feed.get_feeds().filter(id__range=(last_feed, first_feed))
-    if feed_source != 'all':
-        feeds = feeds.filter(user__id=feed_source)
+    version = request.GET.get('version') or None
+    try:
+        feeds = Feed.get_feeds().filter(id__range=(last_feed, first_feed))
+        if feed_source != 'all':
+            feeds = feeds.filter(user__id=feed_source)
+        version, rows = counters.changed_since(
+            feeds, ['likes', 'comments'], version)
+    except (TypeError, ValueError):
+        return HttpResponseBadRequest()
+
     dump = {}
-    for feed in feeds:
-        dump[feed.pk] = {'likes': feed.likes, 'comments': feed.comments}
+    for pk, likes, comments in rows:
+        dump[pk] = {'likes': likes, 'comments': comments}
     data = json.dumps(dump)
-    return HttpResponse(data, content_type='application/json')
+    response = HttpResponse(data, content_type='application/json')
+    response['X-Counters-Version'] = version
+    return response
 
 
 @login_required
 @ajax_required
 def track_comments(request):
+    """Returns the comments newer than the ``last_comment`` id displayed,
+    or the latest page when no comment is displayed yet, and an empty
+    response when there is nothing new. See ``_new_comments`` for the
+    ``first_comment`` id displayed.
+    """
     feed_id = request.GET.get('feed')
-    feed = Feed.objects.get(pk=feed_id)
-    if len(feed.get_comments()) > 0:
-        return render(
-            request, 'feeds/partial_feed_comments.html', {'feed': feed})
-
-    else:
+    feed = get_object_or_404(Feed, pk=feed_id, is_removed=False)
+    last_comment = request.GET.get('last_comment') or None
+    first_comment = request.GET.get('first_comment') or None
+    if last_comment is None and not feed.comments:
         return HttpResponse()
 
+    return _new_comments(request, feed, last_comment, first_comment)
+
 
 @login_required
 @ajax_required
 def remove(request):
     try:
         feed_id = request.POST.get('feed')
-        feed = Feed.objects.get(pk=feed_id)
+        feed = Feed.objects.get(pk=feed_id, is_removed=False)
         if feed.user == request.user:
-            likes = feed.get_likes()
-            parent = feed.parent
-            for like in likes:
-                like.delete()
-            feed.delete()
-            if parent:
-                parent.calculate_comments()
+            feed.remove()
             return HttpResponse()
         else:
             return HttpResponseForbidden()
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:31
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max
+
+
+def backfill_conversations(apps, schema_editor):
+    Message = apps.get_model('messenger', 'Message')
+    Conversation = apps.get_model('messenger', 'Conversation')
+    unread = {}
+    for row in Message.objects.filter(is_read=False).values(
+            'user', 'conversation').annotate(total=Count('id')).order_by():
+        unread[(row['user'], row['conversation'])] = row['total']
+
+    conversations = []
+    for row in Message.objects.values('user', 'conversation').annotate(
+            last_id=Max('id'), last_date=Max('date')).order_by():
+        conversations.append(Conversation(
+            user_id=row['user'], partner_id=row['conversation'],
+            last_message_id=row['last_id'], last_date=row['last_date'],
+            unread=unread.get((row['user'], row['conversation']), 0)))
+    Conversation.objects.bulk_create(conversations, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('messenger', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Conversation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_date', models.DateTimeField(blank=True, null=True)),
+                ('unread', models.IntegerField(default=0)),
+                ('last_message', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='messenger.Message')),
+                ('partner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-last_date',),
+                'verbose_name_plural': 'Conversations',
+                'db_table': 'messages_conversation',
+                'verbose_name': 'Conversation',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='conversation',
+            unique_together=set([('user', 'partner')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='conversation',
+            index_together=set([('user', 'last_date')]),
+        ),
+        migrations.RunPython(backfill_conversations,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:35
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_last_read(apps, schema_editor):
+    Conversation = apps.get_model('messenger', 'Conversation')
+    Conversation.objects.filter(unread=0).exclude(
+        last_message=None).update(last_read=F('last_message'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('messenger', '0002_conversation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='last_read',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterIndexTogether(
+            name='message',
+            index_together=set([('user', 'conversation')]),
+        ),
+        migrations.RunPython(backfill_last_read, migrations.RunPython.noop),
+    ]
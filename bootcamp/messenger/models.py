@@ -1,11 +1,14 @@
 from __future__ import unicode_literals
 
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import Max
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Sum
+from django.db.models.signals import post_save
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
 
+from bootcamp.core import events
+
 
 @python_2_unicode_compatible
 class Message(models.Model):
@@ -21,6 +24,7 @@ class Message(models.Model):
         verbose_name_plural = _('Messages')
         ordering = ('date',)
         db_table = 'messages_message'
+        index_together = (('user', 'conversation'),)
 
     def __str__(self):
         return self.message
@@ -43,18 +47,115 @@ class Message(models.Model):
 
     @staticmethod
     def get_conversations(user):
-        conversations = Message.objects.filter(
-            user=user).values('conversation').annotate(
-                last=Max('date')).order_by('-last')
+        conversations = Conversation.objects.filter(
+            user=user).select_related('partner__profile')
         users = []
         for conversation in conversations:
             users.append({
-                'user': User.objects.get(pk=conversation['conversation']),
-                'last': conversation['last'],
-                'unread': Message.objects.filter(user=user,
-                                                 conversation__pk=conversation[
-                                                    'conversation'],
-                                                 is_read=False).count(),
+                'user': conversation.partner,
+                'last': conversation.last_date,
+                'unread': conversation.unread,
                 })
 
         return users
+
+    @staticmethod
+    def get_history(user, partner, before=None, limit=30):
+        """Returns the ``limit`` latest messages of the conversation of
+        ``user`` with ``partner``, older than the message id ``before`` when
+        given, in chronological order.
+        """
+        messages = Message.objects.filter(
+            user=user, conversation=partner).select_related(
+                'from_user__profile')
+        if before is not None:
+            messages = messages.filter(pk__lt=int(before))
+
+        return list(messages.order_by('-pk')[:limit])[::-1]
+
+    @staticmethod
+    def mark_as_read(user, partner):
+        """Marks as read the messages received since the last read one
+        and moves the read watermark of the conversation up to the last
+        message.
+        """
+        conversation = Conversation.objects.filter(
+            user=user, partner=partner).values_list(
+                'unread', 'last_read', 'last_message').first()
+        if not conversation or not conversation[0]:
+            return
+
+        unread, last_read, last_message = conversation
+        messages = Message.objects.filter(user=user, conversation=partner,
+                                          pk__gt=last_read, is_read=False)
+        if last_message is not None:
+            messages = messages.filter(pk__lte=last_message)
+            last_read = last_message
+
+        read = messages.update(is_read=True)
+        Conversation.objects.filter(user=user, partner=partner).update(
+            unread=F('unread') - read, last_read=last_read)
+
+
+@python_2_unicode_compatible
+class Conversation(models.Model):
+    """Summary of the conversation of ``user`` with ``partner``, kept up
+    to date every time a message is saved, so the inbox can list the
+    conversations without going through all the messages.
+    """
+    user = models.ForeignKey(User, related_name='+')
+    partner = models.ForeignKey(User, related_name='+')
+    last_message = models.ForeignKey(Message, null=True, blank=True,
+                                     related_name='+',
+                                     on_delete=models.SET_NULL)
+    last_date = models.DateTimeField(null=True, blank=True)
+    last_read = models.IntegerField(default=0)
+    unread = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = _('Conversation')
+        verbose_name_plural = _('Conversations')
+        ordering = ('-last_date',)
+        db_table = 'messages_conversation'
+        unique_together = (('user', 'partner'),)
+        index_together = (('user', 'last_date'),)
+
+    def __str__(self):
+        return '{0} - {1}'.format(self.user.username, self.partner.username)
+
+    @staticmethod
+    def get_unread_count(user):
+        return Conversation.objects.filter(user=user).aggregate(
+            unread=Sum('unread'))['unread'] or 0
+
+
+def update_conversation(sender, instance, created, **kwargs):
+    if created:
+        unread = 0 if instance.is_read else 1
+        conversation = Conversation.objects.filter(
+            user=instance.user_id, partner=instance.conversation_id)
+        changes = {'last_message': instance, 'last_date': instance.date,
+                   'unread': F('unread') + unread}
+        if conversation.update(**changes):
+            return
+
+        try:
+            with transaction.atomic():
+                Conversation.objects.create(
+                    user_id=instance.user_id,
+                    partner_id=instance.conversation_id,
+                    last_message=instance, last_date=instance.date,
+                    unread=unread)
+        except IntegrityError:
+            # A concurrent first message of the conversation created it.
+            conversation.update(**changes)
+
+
+def publish_message(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        events.publish(events.user_channel(instance.user_id),
+                       {'type': 'message'})
+
+
+post_save.connect(update_conversation, sender=Message)
+post_save.connect(publish_message, sender=Message)
@@ -11,5 +11,13 @@ $(function () {
       }
     });
   };
-  check_messages();
+
+  if (window.bootcamp_events) {
+    $(document).on("bootcamp:hello bootcamp:message", function (evt, data) {
+      $("#unread-count").text(data.messages);
+    });
+  }
+  else {
+    check_messages();
+  }
 });
\ No newline at end of file
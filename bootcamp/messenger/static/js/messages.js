@@ -14,4 +14,34 @@ $(function () {
     });
     return false;
   });
+
+  var loading = false;
+
+  $(".conversation").scroll(function () {
+    var conversation = $(this);
+    var from_message = conversation.attr("data-from-message");
+    if (loading || from_message === undefined || from_message == "-1" ||
+        conversation.scrollTop() > 50) {
+      return;
+    }
+    loading = true;
+    $.ajax({
+      url: '/messages/load/',
+      data: {
+        'username': conversation.attr("data-username"),
+        'from_message': from_message
+      },
+      cache: false,
+      success: function (data, status, xhr) {
+        var height = conversation[0].scrollHeight;
+        conversation.prepend(data);
+        conversation.scrollTop(conversation[0].scrollHeight - height);
+        conversation.attr("data-from-message",
+                          xhr.getResponseHeader("X-From-Message"));
+      },
+      complete: function () {
+        loading = false;
+      }
+    });
+  });
 });
@@ -1,6 +1,10 @@
+from unittest import skipUnless
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
-from bootcamp.messenger.models import Message
+from django.test import TestCase, TransactionTestCase
+from bootcamp.core.tests.concurrency import (allows_concurrent_connections,
+                                             post_concurrently)
+from bootcamp.messenger.models import Conversation, Message
 
 
 class TestModels(TestCase):
@@ -56,3 +60,66 @@ class TestModels(TestCase):
         self.assertEqual(Message.get_conversations(self.other_user)[0]['last'],
                          new_message.date)
         self.assertEqual(new_message.message, "A short message")
+
+    def test_conversation_summaries(self):
+        Message.send_message(self.other_user, self.user, "A short message")
+        conversations = Message.get_conversations(self.user)
+        self.assertEqual(len(conversations), 2)
+        self.assertEqual(conversations[0]['user'], self.other_user)
+        self.assertEqual(conversations[0]['unread'], 1)
+        self.assertEqual(Conversation.get_unread_count(self.user), 3)
+        Message.mark_as_read(self.user, self.other_user)
+        self.assertEqual(Message.get_conversations(self.user)[0]['unread'], 0)
+        self.assertEqual(Message.objects.filter(
+            user=self.user, conversation=self.other_user,
+            is_read=False).count(), 0)
+
+    def test_get_conversations_single_query(self):
+        with self.assertNumQueries(1):
+            conversations = Message.get_conversations(self.user)
+            self.assertEqual(conversations[0]['user'].username, 'test_user')
+
+    def test_get_history(self):
+        self.assertEqual(Message.get_history(self.user, self.user, limit=1),
+                         [self.message_two])
+        self.assertEqual(Message.get_history(self.user, self.user),
+                         [self.message_one, self.message_two])
+        self.assertEqual(Message.get_history(
+            self.user, self.user, before=self.message_two.pk),
+                         [self.message_one])
+
+    def test_mark_as_read_watermark(self):
+        Message.mark_as_read(self.user, self.user)
+        conversation = Conversation.objects.get(user=self.user,
+                                                partner=self.user)
+        self.assertEqual(conversation.last_read, self.message_two.pk)
+        self.assertEqual(conversation.unread, 0)
+        with self.assertNumQueries(1):
+            Message.mark_as_read(self.user, self.user)
+
+
+@skipUnless(allows_concurrent_connections(),
+            'Needs a test database shared by several connections')
+class TestConcurrentMessages(TransactionTestCase):
+    """Several first messages of a conversation sent at the same time
+    """
+    messages_count = 5
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='top_secret')
+        self.other_user = get_user_model().objects.create_user(
+            username='other_test_user', password='top_secret')
+
+    def test_concurrent_first_messages_are_counted(self):
+        failures = post_concurrently([
+            ('test_user', '/messages/send/',
+             {'to': 'other_test_user', 'message': 'Message {0}'.format(i)})
+            for i in range(self.messages_count)])
+
+        self.assertEqual(failures, [])
+        received = Message.objects.filter(user=self.other_user)
+        conversation = Conversation.objects.get(user=self.other_user,
+                                                partner=self.user)
+        self.assertEqual(conversation.unread, received.count())
+        self.assertEqual(Conversation.objects.count(), 2)
@@ -93,3 +93,21 @@ class TestViews(TestCase):
         self.assertEqual(request.status_code, 200)
         new_msm_count = Message.objects.count()
         self.assertEqual(message_count, new_msm_count)
+
+    def test_load_messages(self):
+        response = self.client.get(
+            reverse('load_messages'),
+            {'username': self.user.username,
+             'from_message': self.message_two.pk},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['messages']),
+                         [self.message_one])
+        self.assertEqual(response['X-From-Message'], '-1')
+
+    def test_load_messages_bad_cursor(self):
+        response = self.client.get(
+            reverse('load_messages'),
+            {'username': self.user.username, 'from_message': 'bad'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 400)
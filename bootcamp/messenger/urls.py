@@ -4,6 +4,7 @@ from bootcamp.messenger import views
 
 urlpatterns = [
     url(r'^$', views.inbox, name='inbox'),
+    url(r'^load/$', views.load, name='load_messages'),
     url(r'^send/$', views.send, name='send_message'),
     url(r'^delete/$', views.delete, name='delete_message'),
     url(r'^check/$', views.check, name='check_message'),
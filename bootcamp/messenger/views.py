@@ -1,10 +1,22 @@
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.http import HttpResponse, HttpResponseBadRequest
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 
 from bootcamp.decorators import ajax_required
-from bootcamp.messenger.models import Message
+from bootcamp.messenger.models import Conversation, Message
+
+MESSAGES_NUM_PAGES = 30
+
+
+def _from_message(messages):
+    """Returns the id to load the older messages from, or -1 when the
+    beginning of the conversation is already displayed.
+    """
+    if len(messages) < MESSAGES_NUM_PAGES:
+        return -1
+
+    return messages[0].pk
 
 
 @login_required
@@ -17,15 +29,16 @@ def inbox(request):
     if conversations:
         conversation = conversations[0]
         active_conversation = conversation['user'].username
-        messages = Message.objects.filter(user=request.user,
-                                          conversation=conversation['user'])
-        messages.update(is_read=True)
+        messages = Message.get_history(request.user, conversation['user'],
+                                       limit=MESSAGES_NUM_PAGES)
+        Message.mark_as_read(request.user, conversation['user'])
         for conversation in conversations:
             if conversation['user'].username == active_conversation:
                 conversation['unread'] = 0
 
     return render(request, 'messenger/inbox.html', {
         'messages': messages,
+        'from_message': _from_message(messages or []),
         'conversations': conversations,
         'users_list': users_list,
         'active': active_conversation
@@ -38,21 +51,42 @@ def messages(request, username):
     users_list = User.objects.filter(
         is_active=True).exclude(username=request.user).order_by('username')
     active_conversation = username
-    messages = Message.objects.filter(user=request.user,
-                                      conversation__username=username)
-    messages.update(is_read=True)
+    messages = []
+    partner = User.objects.filter(username=username).first()
+    if partner:
+        messages = Message.get_history(request.user, partner,
+                                       limit=MESSAGES_NUM_PAGES)
+        Message.mark_as_read(request.user, partner)
     for conversation in conversations:
         if conversation['user'].username == username:
             conversation['unread'] = 0
 
     return render(request, 'messenger/inbox.html', {
         'messages': messages,
+        'from_message': _from_message(messages),
         'conversations': conversations,
         'users_list': users_list,
         'active': active_conversation
         })
 
 
+@login_required
+@ajax_required
+def load(request):
+    partner = get_object_or_404(User, username=request.GET.get('username'))
+    try:
+        messages = Message.get_history(
+            request.user, partner, int(request.GET.get('from_message')),
+            limit=MESSAGES_NUM_PAGES)
+    except (TypeError, ValueError):
+        return HttpResponseBadRequest()
+
+    response = render(request, 'messenger/includes/partial_messages.html',
+                      {'messages': messages})
+    response['X-From-Message'] = _from_message(messages)
+    return response
+
+
 @login_required
 @ajax_required
 def delete(request):
@@ -84,5 +118,5 @@ def send(request):
 @login_required
 @ajax_required
 def check(request):
-    count = Message.objects.filter(user=request.user, is_read=False).count()
+    count = Conversation.get_unread_count(request.user)
     return HttpResponse(count)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:46
+from __future__ import unicode_literals
+
+import markdown
+from django.db import migrations, models
+
+
+def _render(text):
+    # The rendering of this migration, without Markdown extensions and with
+    # any raw HTML escaped. The render_markdown command renders the rows
+    # again with the extensions configured later.
+    if not text:
+        return ''
+    return markdown.markdown(text, safe_mode='escape')
+
+
+def _preview(description):
+    if len(description) > 255:
+        return '{0}...'.format(description[:255])
+    return description
+
+
+def render_markdown(apps, schema_editor):
+    Question = apps.get_model('questions', 'Question')
+    Answer = apps.get_model('questions', 'Answer')
+    for question in Question.objects.only('description').iterator():
+        Question.objects.filter(pk=question.pk).update(
+            description_html=_render(question.description),
+            description_preview_html=_render(
+                _preview(question.description)))
+    for answer in Answer.objects.only('description').iterator():
+        Answer.objects.filter(pk=answer.pk).update(
+            description_html=_render(answer.description))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0003_question_votes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='description_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='description_preview_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_markdown, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 19:13
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0004_markdown_html'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='question',
+            index_together=set([('update_date', 'id'), ('has_accepted_answer', 'update_date', 'id')]),
+        ),
+    ]
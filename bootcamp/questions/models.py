@@ -1,11 +1,13 @@
 from __future__ import unicode_literals
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Q, When
+from django.db.models.signals import pre_save
 from django.utils.encoding import python_2_unicode_compatible
 
-import markdown
 from bootcamp.activities.models import Activity
+from bootcamp.core import markup
 from taggit.managers import TaggableManager
 
 
@@ -14,6 +16,8 @@ class Question(models.Model):
     user = models.ForeignKey(User)
     title = models.CharField(max_length=255)
     description = models.TextField(max_length=2000)
+    description_html = models.TextField(blank=True, editable=False)
+    description_preview_html = models.TextField(blank=True, editable=False)
     create_date = models.DateTimeField(auto_now_add=True)
     update_date = models.DateTimeField(auto_now_add=True)
     votes = models.IntegerField(default=0)
@@ -25,6 +29,11 @@ class Question(models.Model):
         verbose_name = 'Question'
         verbose_name_plural = 'Questions'
         ordering = ('-update_date',)
+        # Serve the keyset pagination of the questions lists.
+        index_together = (('update_date', 'id'),
+                          ('has_accepted_answer', 'update_date', 'id'))
+
+    markdown_fields = ('description_html', 'description_preview_html')
 
     def __str__(self):
         return self.title
@@ -46,8 +55,13 @@ class Question(models.Model):
     def get_accepted_answer(self):
         return Answer.objects.get(question=self, is_accepted=True)
 
+    def render_markdown(self):
+        self.description_html = markup.render(self.description)
+        self.description_preview_html = markup.render(
+            self.get_description_preview())
+
     def get_description_as_markdown(self):
-        return markdown.markdown(self.description, safe_mode='escape')
+        return self.description_html or markup.render(self.description)
 
     def get_description_preview(self):
         if len(self.description) > 255:
@@ -57,14 +71,14 @@ class Question(models.Model):
             return self.description
 
     def get_description_preview_as_markdown(self):
-        return markdown.markdown(self.get_description_preview(),
-                                 safe_mode='escape')
+        return self.description_preview_html or markup.render(
+            self.get_description_preview())
 
     def calculate_favorites(self):
         favorites = Activity.objects.filter(activity_type=Activity.FAVORITE,
                                             question=self.pk).count()
         self.favorites = favorites
-        self.save()
+        Question.objects.filter(pk=self.pk).update(favorites=favorites)
         return self.favorites
 
     def get_favoriters(self):
@@ -78,7 +92,7 @@ class Question(models.Model):
         down_votes = Activity.objects.filter(activity_type=Activity.DOWN_VOTE,
                                              question=self.pk).count()
         self.votes = up_votes - down_votes
-        self.save()
+        Question.objects.filter(pk=self.pk).update(votes=self.votes)
         return self.votes
 
     def get_up_voters(self):
@@ -97,6 +111,7 @@ class Answer(models.Model):
     user = models.ForeignKey(User)
     question = models.ForeignKey(Question)
     description = models.TextField(max_length=2000)
+    description_html = models.TextField(blank=True, editable=False)
     create_date = models.DateTimeField(auto_now_add=True)
     update_date = models.DateTimeField(null=True, blank=True)
     votes = models.IntegerField(default=0)
@@ -107,18 +122,33 @@ class Answer(models.Model):
         verbose_name_plural = 'Answers'
         ordering = ('-is_accepted', '-votes', 'create_date',)
 
+    markdown_fields = ('description_html',)
+
     def __str__(self):
         return self.description
 
     def accept(self):
-        answers = Answer.objects.filter(question=self.question)
-        for answer in answers:
-            answer.is_accepted = False
-            answer.save()
+        """Makes this answer the accepted answer of its question and returns
+        the answer accepted until then, if any, which may be this one. The
+        question row is locked so concurrent accepts are applied one after
+        the other.
+        """
+        with transaction.atomic():
+            list(Question.objects.select_for_update().filter(
+                pk=self.question_id).order_by().values_list('pk'))
+            previous = Answer.objects.filter(
+                question=self.question_id, is_accepted=True).first()
+            Answer.objects.filter(
+                Q(is_accepted=True) | Q(pk=self.pk),
+                question=self.question_id).update(is_accepted=Case(
+                    When(pk=self.pk, then=True), default=False,
+                    output_field=models.BooleanField()))
+            Question.objects.filter(pk=self.question_id).update(
+                has_accepted_answer=True)
+
         self.is_accepted = True
-        self.save()
         self.question.has_accepted_answer = True
-        self.question.save()
+        return previous
 
     def calculate_votes(self):
         up_votes = Activity.objects.filter(activity_type=Activity.UP_VOTE,
@@ -126,7 +156,7 @@ class Answer(models.Model):
         down_votes = Activity.objects.filter(activity_type=Activity.DOWN_VOTE,
                                              answer=self.pk).count()
         self.votes = up_votes - down_votes
-        self.save()
+        Answer.objects.filter(pk=self.pk).update(votes=self.votes)
         return self.votes
 
     def get_up_voters(self):
@@ -139,5 +169,16 @@ class Answer(models.Model):
                                         answer=self.pk)
         return [vote for vote in votes]
 
+    def render_markdown(self):
+        self.description_html = markup.render(self.description)
+
     def get_description_as_markdown(self):
-        return markdown.markdown(self.description, safe_mode='escape')
+        return self.description_html or markup.render(self.description)
+
+
+def render_markdown(sender, instance, **kwargs):
+    instance.render_markdown()
+
+
+pre_save.connect(render_markdown, sender=Question)
+pre_save.connect(render_markdown, sender=Answer)
@@ -1,7 +1,12 @@
+from unittest import skipUnless
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import IntegrityError
+from django.test import TestCase, TransactionTestCase
 
-from bootcamp.activities.models import Activity
+from bootcamp.activities.models import Activity, Notification
+from bootcamp.core.tests.concurrency import (allows_concurrent_connections,
+                                             post_concurrently)
 from bootcamp.questions.models import Question, Answer
 
 
@@ -43,11 +48,19 @@ class QuestionVoteTest(TestCase):
     def test_can_up_vote_question(self):
         activity = Activity.objects.create(user=self.user, activity_type='U',
                                            question=self.question_one.id)
-        activity = Activity.objects.create(user=self.user, activity_type='U',
+        activity = Activity.objects.create(user=self.other_user,
+                                           activity_type='U',
                                            question=self.question_one.id)
         self.assertTrue(isinstance(activity, Activity))
         self.assertEqual(self.question_one.calculate_votes(), 2)
 
+    def test_cannot_up_vote_question_twice(self):
+        Activity.objects.create(user=self.user, activity_type='U',
+                                question=self.question_one.id)
+        with self.assertRaises(IntegrityError):
+            Activity.objects.create(user=self.user, activity_type='U',
+                                    question=self.question_one.id)
+
     def test_can_down_vote_question(self):
         votes = self.question_one.calculate_votes()
         activity = Activity.objects.create(user=self.user, activity_type='D',
@@ -185,3 +198,58 @@ class QuestionVoteTest(TestCase):
     def test_answer_description_markdown(self):
         self.assertEqual(self.answer.get_description_as_markdown(),
                          '<p>A reaaaaally loooong content</p>')
+
+    def test_accept_answer(self):
+        other_answer = Answer.objects.create(
+            user=self.other_user, question=self.question_two,
+            description='Another answer')
+        # The lock, the previous answer and two UPDATE in a savepoint.
+        with self.assertNumQueries(6):
+            previous = other_answer.accept()
+        self.assertEqual(previous, self.answer)
+        self.assertEqual(list(Answer.objects.filter(
+            question=self.question_two, is_accepted=True)), [other_answer])
+        self.assertIsNone(self.question_one.get_answers().first())
+        answer = Answer.objects.create(
+            user=self.other_user, question=self.question_one,
+            description='An answer')
+        self.assertIsNone(answer.accept())
+        self.assertTrue(Question.objects.get(
+            pk=self.question_one.pk).has_accepted_answer)
+        self.assertEqual(answer.accept(), answer)
+
+
+@skipUnless(allows_concurrent_connections(),
+            'Needs a test database shared by several connections')
+class TestConcurrentAccepts(TransactionTestCase):
+    """The author of a question accepting several answers at the same time
+    """
+    answers_count = 5
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='test_user', password='top_secret')
+        self.other_user = get_user_model().objects.create_user(
+            username='other_test_user', password='top_secret')
+        self.question = Question.objects.create(
+            user=self.user, title='A question', description='A question')
+        self.answers = [Answer.objects.create(
+            user=self.other_user, question=self.question,
+            description='Answer {0}'.format(i))
+                        for i in range(self.answers_count)]
+
+    def test_concurrent_accepts_keep_one_answer(self):
+        failures = post_concurrently([
+            ('test_user', '/questions/answer/accept/', {'answer': answer.pk})
+            for answer in self.answers])
+
+        self.assertEqual(failures, [])
+        accepted = Answer.objects.filter(question=self.question,
+                                         is_accepted=True)
+        self.assertEqual(accepted.count(), 1)
+        self.assertTrue(Question.objects.get(
+            pk=self.question.pk).has_accepted_answer)
+        notifications = Notification.objects.filter(
+            notification_type=Notification.ACCEPTED_ANSWER)
+        self.assertEqual(list(notifications.values_list('answer', flat=True)),
+                         [accepted.get().pk])
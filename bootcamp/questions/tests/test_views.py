@@ -1,8 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.http import HttpResponseBadRequest
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
+from bootcamp.activities.models import Activity
 from bootcamp.questions.models import Question, Answer
 
 
@@ -106,3 +109,50 @@ class TestViews(TestCase):
     def test_answer_redirects(self):
         response = self.other_client.get(reverse('answer'))
         self.assertRedirects(response, reverse('questions'), status_code=302)
+
+    def _answer_and_vote(self, count):
+        for i in range(count):
+            answer = Answer.objects.create(
+                user=self.other_user, question=self.question_one,
+                description='Answer {0}'.format(i))
+            Activity.objects.create(activity_type=Activity.UP_VOTE,
+                                    answer=answer.pk, user=self.user)
+            Activity.objects.create(activity_type=Activity.DOWN_VOTE,
+                                    answer=answer.pk, user=self.other_user)
+
+    def test_question_vote_state(self):
+        self._answer_and_vote(2)
+        Activity.objects.create(activity_type=Activity.FAVORITE,
+                                question=self.question_one.pk,
+                                user=self.user)
+        Activity.objects.create(activity_type=Activity.DOWN_VOTE,
+                                question=self.question_one.pk,
+                                user=self.user)
+        response = self.client.get(
+            '/questions/{}/'.format(self.question_one.id))
+        question = response.context['question']
+        self.assertTrue(question.is_favorited)
+        self.assertTrue(question.is_down_voted)
+        self.assertFalse(question.is_up_voted)
+        answers = response.context['answers']
+        self.assertEqual(len(answers), 2)
+        for answer in answers:
+            self.assertTrue(answer.is_up_voted)
+            self.assertFalse(answer.is_down_voted)
+        response = self.other_client.get(
+            '/questions/{}/'.format(self.question_one.id))
+        self.assertFalse(response.context['question'].is_favorited)
+        for answer in response.context['answers']:
+            self.assertFalse(answer.is_up_voted)
+            self.assertTrue(answer.is_down_voted)
+
+    def test_question_constantNumberOfQueries(self):
+        url = '/questions/{}/'.format(self.question_one.id)
+        self._answer_and_vote(1)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self._answer_and_vote(10)
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url)
+        self.assertEqual(response.content.count(b'up-vote answer-vote voted'),
+                         11)
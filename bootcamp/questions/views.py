@@ -1,31 +1,25 @@
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import CreateView
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.http import HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.core.urlresolvers import reverse_lazy
 
+from bootcamp.activities import counters
 from bootcamp.activities.models import Activity
+from bootcamp.core.pagination import CursorPaginator
 from bootcamp.decorators import ajax_required
 from bootcamp.questions.forms import AnswerForm, QuestionForm
+from bootcamp.questions.hydration import hydrate_question
 from bootcamp.questions.models import Answer, Question
 
 
 @login_required
 def _questions(request, questions, active):
-    paginator = Paginator(questions, 10)
-    page = request.GET.get('page')
-    try:
-        questions = paginator.page(page)
-
-    except PageNotAnInteger:
-        questions = paginator.page(1)
-
-    except EmptyPage:  # pragma: no cover
-        questions = paginator.page(paginator.num_pages)
-
+    questions = CursorPaginator.from_request(
+        request, questions, ('-update_date', '-id'), 10)
     return render(request, 'questions/questions.html', {
         'questions': questions,
         'active': active
@@ -67,16 +61,25 @@ def all(request):
     return _questions(request, questions, 'all')
 
 
-@login_required
-def question(request, pk):
-    question = get_object_or_404(Question, pk=pk)
-    form = AnswerForm(initial={'question': question})
+def _question(request, question, form):
+    answers = hydrate_question(
+        question, question.get_answers().select_related('user__profile'),
+        request.user)
     return render(request, 'questions/question.html', {
         'question': question,
+        'answers': answers,
         'form': form
     })
 
 
+@login_required
+def question(request, pk):
+    question = get_object_or_404(
+        Question.objects.select_related('user__profile'), pk=pk)
+    form = AnswerForm(initial={'question': question})
+    return _question(request, question, form)
+
+
 @login_required
 def answer(request):
     if request.method == 'POST':
@@ -93,10 +96,7 @@ def answer(request):
 
         else:
             question = form.cleaned_data.get('question')
-            return render(request, 'questions/question.html', {
-                'question': question,
-                'form': form
-            })
+            return _question(request, question, form)
 
     else:
         return redirect('/questions/')
@@ -106,24 +106,41 @@ def answer(request):
 @ajax_required
 def accept(request):
     answer_id = request.POST['answer']
-    answer = Answer.objects.get(pk=answer_id)
+    answer = Answer.objects.select_related('question').get(pk=answer_id)
     user = request.user
-    try:
-        # answer.accept cleans previous accepted answer
-        user.profile.unotify_accepted(answer.question.get_accepted_answer())
-
-    except Exception:
-        pass
-
-    if answer.question.user == user:
-        answer.accept()
-        user.profile.notify_accepted(answer)
+    if answer.question.user_id == user.pk:
+        # The notifications are swapped while the question is still locked,
+        # concurrent accepts cannot leave two of them.
+        with transaction.atomic():
+            previous = answer.accept()
+            if previous is not None:
+                user.profile.unotify_accepted(previous)
+            user.profile.notify_accepted(answer)
         return HttpResponse()
 
     else:
         return HttpResponseForbidden()
 
 
+def _replace_vote(vote, user, **target):
+    """Replaces the vote of ``user`` on the given question or answer and
+    returns the difference it makes on the votes counter.
+    """
+    delta = 0
+    votes = Activity.objects.filter(
+        Q(activity_type=Activity.UP_VOTE) | Q(activity_type=Activity.DOWN_VOTE),  # noqa: E501
+        user=user, **target)
+    for activity_type in votes.values_list('activity_type', flat=True):
+        delta -= counters.vote_value(activity_type)
+    votes.delete()
+
+    if vote in [Activity.UP_VOTE, Activity.DOWN_VOTE]:
+        Activity.objects.create(activity_type=vote, user=user, **target)
+        delta += counters.vote_value(vote)
+
+    return delta
+
+
 @login_required
 @ajax_required
 def vote(request):
@@ -131,17 +148,15 @@ def vote(request):
     answer = Answer.objects.get(pk=answer_id)
     vote = request.POST['vote']
     user = request.user
-    activity = Activity.objects.filter(
-        Q(activity_type=Activity.UP_VOTE) | Q(activity_type=Activity.DOWN_VOTE),  # noqa: E501
-        user=user, answer=answer_id)
-    if activity:
-        activity.delete()
-
-    if vote in [Activity.UP_VOTE, Activity.DOWN_VOTE]:
-        activity = Activity(activity_type=vote, user=user, answer=answer_id)
-        activity.save()
+    try:
+        with transaction.atomic():
+            delta = _replace_vote(vote, user, answer=answer.pk)
+            counters.increment(answer, 'votes', delta)
+    except IntegrityError:
+        # A concurrent request of the same user voted first.
+        answer = Answer.objects.get(pk=answer.pk)
 
-    return HttpResponse(answer.calculate_votes())
+    return HttpResponse(answer.votes)
 
 
 @login_required
@@ -151,18 +166,15 @@ def question_vote(request):
     question = Question.objects.get(pk=question_id)
     vote = request.POST['vote']
     user = request.user
-    activity = Activity.objects.filter(
-        Q(activity_type=Activity.UP_VOTE) | Q(activity_type=Activity.DOWN_VOTE),  # noqa: E501
-        user=user, question=question_id)
-    if activity:
-        activity.delete()
-
-    if vote in [Activity.UP_VOTE, Activity.DOWN_VOTE]:
-        activity = Activity(activity_type=vote,
-                            user=user, question=question_id)
-        activity.save()
+    try:
+        with transaction.atomic():
+            delta = _replace_vote(vote, user, question=question.pk)
+            counters.increment(question, 'votes', delta)
+    except IntegrityError:
+        # A concurrent request of the same user voted first.
+        question = Question.objects.get(pk=question.pk)
 
-    return HttpResponse(question.calculate_votes())
+    return HttpResponse(question.votes)
 
 
 @login_required
@@ -171,16 +183,22 @@ def favorite(request):
     question_id = request.POST['question']
     question = Question.objects.get(pk=question_id)
     user = request.user
-    activity = Activity.objects.filter(activity_type=Activity.FAVORITE,
-                                       user=user, question=question_id)
-    if activity:
-        activity.delete()
-        user.profile.unotify_favorited(question)
-
-    else:
-        activity = Activity(activity_type=Activity.FAVORITE, user=user,
-                            question=question_id)
-        activity.save()
-        user.profile.notify_favorited(question)
-
-    return HttpResponse(question.calculate_favorites())
+    try:
+        with transaction.atomic():
+            unfavorited, _ = Activity.objects.filter(
+                activity_type=Activity.FAVORITE, user=user,
+                question=question.pk).delete()
+            if unfavorited:
+                counters.decrement(question, 'favorites', unfavorited)
+                user.profile.unotify_favorited(question)
+
+            else:
+                Activity.objects.create(activity_type=Activity.FAVORITE,
+                                        user=user, question=question.pk)
+                counters.increment(question, 'favorites')
+                user.profile.notify_favorited(question)
+    except IntegrityError:
+        # A concurrent request of the same user favorited first.
+        question = Question.objects.get(pk=question.pk)
+
+    return HttpResponse(question.favorites)
@@ -0,0 +1,288 @@
+"""Search box suggestions.
+
+The usernames, published article titles and question titles are kept in
+the process memory as a sorted array of ``(phrase, source, -id)`` keys, one
+per word of every title so a suggestion matches from any of its words. A
+lookup is a ``bisect`` to the first key starting with the typed term
+followed by a walk over at most a few keys, so its cost does not depend on
+the number of entries.
+
+The array is loaded with ``values_list`` queries by a worker thread, see
+``bootcamp.core.jobs``, on the first lookup of the process, which is
+answered from the database meanwhile. It is then updated from the
+``post_save`` and ``post_delete`` signals of the process. The changes made
+by the other worker processes do not reach it through the signals, so it
+is also reloaded in the background once older than
+``AUTOCOMPLETE_INDEX_TIMEOUT`` seconds, ``None`` to never reload it. A
+lookup never waits for a load and a single load runs at a time.
+With ``AUTOCOMPLETE_IN_MEMORY = False`` the suggestions are queried from the
+database instead, still through ``values_list`` only.
+
+The JSON responses are cached for ``AUTOCOMPLETE_CACHE_TIMEOUT`` seconds,
+keyed by the typed term.
+"""
+from __future__ import unicode_literals
+
+import bisect
+import hashlib
+import json
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from bootcamp.core import jobs
+
+PHRASE_MAX_LENGTH = 100
+SUGGESTIONS_LIMIT = 10
+
+
+class AutocompleteSource(object):
+
+    def __init__(self, name, model, label, texts, filters=None):
+        self.name = name
+        self.model_label = model
+        self.label = label
+        self.texts = texts
+        self.filters = filters or {}
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def fields(self):
+        return [field for text in self.texts for field in text]
+
+    def get_queryset(self):
+        return self.model._default_manager.filter(**self.filters)
+
+    def should_index(self, instance):
+        for field, value in self.filters.items():
+            if getattr(instance, field) != value:
+                return False
+
+        return True
+
+    def get_phrases(self, values):
+        """Returns the phrases starting at every word of the texts given by
+        the ``values`` dict of field values.
+        """
+        phrases = set()
+        for text in self.texts:
+            words = ' '.join(values[field] or '' for field in text).lower(
+                ).split()
+            for position in range(len(words)):
+                phrases.add(' '.join(words[position:])[:PHRASE_MAX_LENGTH])
+        return phrases
+
+
+SOURCES = [
+    AutocompleteSource('users', 'auth.User', 'username',
+                       [('username',), ('first_name', 'last_name')]),
+    AutocompleteSource('articles', 'articles.Article', 'title',
+                       [('title',)], filters={'status': 'P'}),
+    AutocompleteSource('questions', 'questions.Question', 'title',
+                       [('title',)]),
+    ]
+
+
+def get_source_for_model(model):
+    for rank, source in enumerate(SOURCES):
+        if source.model is model:
+            return rank, source
+
+
+def normalize(term):
+    return ' '.join(term.lower().split())[:PHRASE_MAX_LENGTH]
+
+
+class AutocompleteIndex(object):
+    """Sorted array of ``(phrase, rank, -id)`` keys, ``rank`` being the
+    position of the source in ``SOURCES``. For a given phrase the users come
+    first, then the articles and the questions, newest first.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, entries):
+        """Replaces the whole content of the index with the given iterable
+        of ``(rank, pk, label, phrases)``.
+        """
+        keys = []
+        stored = {}
+        for rank, pk, label, phrases in entries:
+            entry_keys = [(phrase, rank, -pk) for phrase in phrases]
+            keys.extend(entry_keys)
+            stored[(rank, pk)] = (label, entry_keys)
+        keys.sort()
+        with self._lock:
+            self._keys, self._entries = keys, stored
+            self.loaded_at = time.time()
+
+    def _remove(self, rank, pk):
+        label, keys = self._entries.pop((rank, pk), (None, []))
+        for key in keys:
+            position = bisect.bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+    def add(self, rank, pk, label, phrases):
+        with self._lock:
+            self._remove(rank, pk)
+            keys = [(phrase, rank, -pk) for phrase in phrases]
+            for key in keys:
+                bisect.insort(self._keys, key)
+            self._entries[(rank, pk)] = (label, keys)
+
+    def remove(self, rank, pk):
+        with self._lock:
+            self._remove(rank, pk)
+
+    def lookup(self, term, limit=SUGGESTIONS_LIMIT):
+        """Returns up to ``limit`` ``(rank, pk, label)`` whose phrases start
+        with ``term``.
+        """
+        results = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._keys, (term,))
+            while position < len(self._keys) and len(results) < limit:
+                phrase, rank, negated_pk = self._keys[position]
+                if not phrase.startswith(term):
+                    break
+
+                entry = (rank, -negated_pk)
+                if entry not in seen:
+                    seen.add(entry)
+                    results.append(entry + (self._entries[entry][0],))
+                position += 1
+        return results
+
+
+def _load_entries():
+    for rank, source in enumerate(SOURCES):
+        fields = source.fields
+        rows = source.get_queryset().values_list('pk', source.label, *fields)
+        for row in rows.iterator():
+            values = dict(zip(fields, row[2:]))
+            yield rank, row[0], row[1], source.get_phrases(values)
+
+
+_index = AutocompleteIndex()
+_loading = threading.Lock()
+
+
+def _load_index():
+    try:
+        _index.load(_load_entries())
+    finally:
+        _loading.release()
+
+
+def load_index():
+    """Loads the index by a worker thread, unless a load is running."""
+    if not _loading.acquire(False):
+        return
+
+    try:
+        jobs.get_pool('autocomplete', 1).submit(_load_index)
+    except Exception:
+        _loading.release()
+        raise
+
+
+def get_index():
+    """Returns the index, ``None`` until its first load is done. Schedules
+    the loads without waiting for them.
+    """
+    timeout = getattr(settings, 'AUTOCOMPLETE_INDEX_TIMEOUT', 300)
+    if _index.loaded_at is None or (
+            timeout is not None and
+            _index.loaded_at + timeout < time.time()):
+        load_index()
+    if _index.loaded_at is None:
+        return None
+
+    return _index
+
+
+def reset():
+    """Drops the loaded index, loaded again from the next lookup."""
+    _index.load([])
+    _index.loaded_at = None
+
+
+def update_instance(model, instance):
+    if _index.loaded_at is None:
+        return
+
+    rank, source = get_source_for_model(model)
+    if source.should_index(instance):
+        values = {field: getattr(instance, field) for field in source.fields}
+        _index.add(rank, instance.pk, getattr(instance, source.label),
+                   source.get_phrases(values))
+    else:
+        _index.remove(rank, instance.pk)
+
+
+def remove_instance(model, instance):
+    if _index.loaded_at is not None:
+        rank, source = get_source_for_model(model)
+        _index.remove(rank, instance.pk)
+
+
+def _query_suggestions(term, limit):
+    results = []
+    for rank, source in enumerate(SOURCES):
+        if len(results) >= limit:
+            break
+
+        matches = Q()
+        for field in source.fields:
+            matches |= Q(**{'{0}__istartswith'.format(field): term})
+            matches |= Q(**{'{0}__icontains'.format(field): ' ' + term})
+        rows = source.get_queryset().filter(matches).order_by(
+            '-pk').values_list('pk', source.label)[:limit - len(results)]
+        results.extend((rank, pk, label) for pk, label in rows)
+    return results
+
+
+def get_suggestions(term, limit=SUGGESTIONS_LIMIT):
+    """Returns up to ``limit`` ``{'id', 'label', 'value'}`` dicts of the
+    users, articles and questions matching ``term``.
+    """
+    term = normalize(term)
+    if not term:
+        return []
+
+    index = None
+    if getattr(settings, 'AUTOCOMPLETE_IN_MEMORY', True):
+        index = get_index()
+    if index is not None:
+        results = index.lookup(term, limit)
+    else:
+        results = _query_suggestions(term, limit)
+    return [{'id': pk, 'label': label, 'value': label}
+            for rank, pk, label in results]
+
+
+def get_suggestions_json(term):
+    key = 'autocomplete:{0}'.format(
+        hashlib.md5(normalize(term).encode('utf-8')).hexdigest())
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = json.dumps(get_suggestions(term))
+        cache.set(key, suggestions,
+                  getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 30))
+    return suggestions
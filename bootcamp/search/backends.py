@@ -0,0 +1,280 @@
+"""Full text search over feeds, articles, questions and users.
+
+Every searchable model is described by a ``SearchIndex``: the fields whose
+words are indexed, with their weight in the ranking, and the filters a row
+has to match to be searchable at all (comments and draft articles are not).
+
+The engine is pluggable through the ``SEARCH_BACKEND`` setting:
+
+* ``PostgresSearchBackend`` matches the ``tsvector`` of the indexed fields,
+  served by the GIN expression indexes created by the search migrations,
+  and ranks the rows with ``ts_rank``. The database keeps it up to date.
+* ``DatabaseSearchBackend`` keeps an inverted index in the
+  ``search_searchentry`` table, updated from the ``post_save`` and
+  ``post_delete`` signals, and ranks the rows by the weighted number of
+  occurrences of the searched words. It works on every database.
+
+When the setting is not defined, the PostgreSQL backend is used on
+PostgreSQL and the inverted index everywhere else. Every word of the query
+has to be found, as a prefix of an indexed word, for a row to match.
+"""
+from __future__ import unicode_literals
+
+import re
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils.module_loading import import_string
+
+TERM_MAX_LENGTH = 64
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    """Returns the lowercased words of ``text``."""
+    return [term[:TERM_MAX_LENGTH] for term in
+            TERM_RE.findall((text or '').lower())]
+
+
+class SearchIndex(object):
+
+    def __init__(self, name, model, fields, filters=None,
+                 select_related=()):
+        self.name = name
+        self.model_label = model
+        self.fields = fields
+        self.filters = filters or {}
+        self.select_related = select_related
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_queryset(self):
+        return self.model._default_manager.filter(**self.filters)
+
+    def should_index(self, instance):
+        for field, value in self.filters.items():
+            attname = instance._meta.get_field(field).attname
+            if getattr(instance, attname) != value:
+                return False
+
+        return True
+
+    def get_terms(self, instance):
+        """Returns a dict of the weight of every word of ``instance``."""
+        terms = {}
+        for field, weight in self.fields:
+            for term in tokenize(getattr(instance, field)):
+                terms[term] = terms.get(term, 0) + weight
+        return terms
+
+
+INDEXES = OrderedDict((index.name, index) for index in [
+    SearchIndex('feed', 'feeds.Feed', [('post', 1)],
+                filters={'parent': None, 'is_removed': False},
+                select_related=['user__profile']),
+    SearchIndex('articles', 'articles.Article',
+                [('title', 2), ('content', 1)], filters={'status': 'P'},
+                select_related=['create_user__profile']),
+    SearchIndex('questions', 'questions.Question',
+                [('title', 2), ('description', 1)],
+                select_related=['user__profile']),
+    SearchIndex('users', 'auth.User',
+                [('username', 2), ('first_name', 1), ('last_name', 1)],
+                select_related=['profile']),
+    ])
+
+
+def get_index_for_model(model):
+    for index in INDEXES.values():
+        if index.model is model:
+            return index
+
+
+class BaseSearchBackend(object):
+
+    def index(self, name, instance):
+        """Indexes, or unindexes if it should not be searchable anymore, the
+        given instance of the ``name`` index.
+        """
+        raise NotImplementedError
+
+    def remove(self, name, pk):
+        raise NotImplementedError
+
+    def rebuild(self, names=None):
+        """Rebuilds the given indexes, every index by default, and returns
+        the number of rows indexed.
+        """
+        raise NotImplementedError
+
+    def search(self, name, query, limit=50):
+        """Returns the total number of rows of the ``name`` index matching
+        ``query`` and the ``limit`` most relevant ones.
+        """
+        raise NotImplementedError
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Inverted index stored in the ``search_searchentry`` table: one
+    ``(index, term, object_id, weight)`` row per distinct word of every
+    indexed object. Prefix lookups are turned into ``term`` ranges so they
+    are served by the ``(index, term)`` index.
+    """
+
+    @property
+    def entry_model(self):
+        return apps.get_model('search', 'SearchEntry')
+
+    def _entries(self, index, instance):
+        model = self.entry_model
+        return [model(index=index.name, term=term, object_id=instance.pk,
+                      weight=weight)
+                for term, weight in index.get_terms(instance).items()]
+
+    def index(self, name, instance):
+        index = INDEXES[name]
+        with transaction.atomic():
+            self.remove(name, instance.pk)
+            if index.should_index(instance):
+                self.entry_model.objects.bulk_create(
+                    self._entries(index, instance))
+
+    def remove(self, name, pk):
+        self.entry_model.objects.filter(index=name, object_id=pk).delete()
+
+    def rebuild(self, names=None, batch_size=1000):
+        count = 0
+        for name in names or INDEXES:
+            index = INDEXES[name]
+            with transaction.atomic():
+                self.entry_model.objects.filter(index=name).delete()
+                entries = []
+                for instance in index.get_queryset().order_by(
+                        'pk').iterator():
+                    entries.extend(self._entries(index, instance))
+                    count += 1
+                    if len(entries) >= batch_size:
+                        self.entry_model.objects.bulk_create(entries)
+                        entries = []
+
+                self.entry_model.objects.bulk_create(entries)
+        return count
+
+    def get_scores(self, name, query, candidates_limit=500):
+        """Returns a dict of the score of every object id matching every
+        word of ``query``. The longest, usually rarest, words are looked up
+        first and, once few objects are left, the next lookups are
+        restricted to them.
+        """
+        scores = None
+        for term in sorted(set(tokenize(query)), key=len, reverse=True):
+            entries = self.entry_model.objects.filter(
+                index=name, term__gte=term, term__lt=term + '\uffff')
+            if scores is not None and len(scores) <= candidates_limit:
+                entries = entries.filter(object_id__in=list(scores))
+            matches = dict(entries.values_list('object_id').annotate(
+                Sum('weight')).order_by())
+            if scores is None:
+                scores = matches
+            else:
+                scores = {pk: scores[pk] + weight
+                          for pk, weight in matches.items() if pk in scores}
+            if not scores:
+                return {}
+
+        return scores or {}
+
+    def search(self, name, query, limit=50):
+        index = INDEXES[name]
+        scores = self.get_scores(name, query)
+        ids = sorted(scores, key=lambda pk: (-scores[pk], -pk))[:limit]
+        objects = index.model._default_manager.select_related(
+            *index.select_related).in_bulk(ids)
+        return len(scores), [objects[pk] for pk in ids if pk in objects]
+
+
+def tsvector_sql(index, qualified=True):
+    """Returns the SQL ``tsvector`` expression of ``index``, the same one
+    its GIN index is built on so the planner can use it.
+    """
+    model = index.model
+    prefix = '{0}.'.format(model._meta.db_table) if qualified else ''
+    vectors = []
+    for position, (field, weight) in enumerate(
+            sorted(index.fields, key=lambda field: -field[1])):
+        column = model._meta.get_field(field).column
+        vectors.append(
+            "setweight(to_tsvector('simple', coalesce({0}{1}, '')), "
+            "'{2}')".format(prefix, column, 'ABCD'[min(position, 3)]))
+    return ' || '.join(vectors)
+
+
+def gin_index_name(index):
+    return '{0}_search_gin'.format(index.model._meta.db_table)
+
+
+def tsquery(query):
+    return ' & '.join('{0}:*'.format(term) for term in tokenize(query))
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Matches the rows against their ``tsvector`` with a prefix
+    ``tsquery``. Nothing has to be maintained by the application.
+    """
+
+    def index(self, name, instance):
+        pass
+
+    def remove(self, name, pk):
+        pass
+
+    def rebuild(self, names=None):
+        count = 0
+        with connection.cursor() as cursor:
+            for name in names or INDEXES:
+                index = INDEXES[name]
+                cursor.execute('REINDEX INDEX {0}'.format(
+                    gin_index_name(index)))
+                count += index.get_queryset().count()
+        return count
+
+    def search(self, name, query, limit=50):
+        index = INDEXES[name]
+        terms = tsquery(query)
+        if not terms:
+            return 0, []
+
+        vector = tsvector_sql(index)
+        matches = index.get_queryset().extra(
+            where=["{0} @@ to_tsquery('simple', %s)".format(vector)],
+            params=[terms])
+        ranked = matches.select_related(*index.select_related).extra(
+            select={'search_rank': "ts_rank({0}, to_tsquery('simple', %s))"
+                                   .format(vector)},
+            select_params=[terms],
+            order_by=['-search_rank', '-pk'])
+        return matches.count(), list(ranked[:limit])
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        default = 'bootcamp.search.backends.DatabaseSearchBackend'
+        if connection.vendor == 'postgresql':
+            default = 'bootcamp.search.backends.PostgresSearchBackend'
+        backend_class = import_string(getattr(settings, 'SEARCH_BACKEND',
+                                              default))
+        _backend = backend_class()
+    return _backend
+
+
+def search(name, query, limit=50):
+    return get_backend().search(name, query, limit)
@@ -0,0 +1,50 @@
+from __future__ import division, unicode_literals
+
+import random
+import time
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from bootcamp.search.autocomplete import AutocompleteIndex, normalize
+
+
+class Command(BaseCommand):
+    help = ('Measures the lookup latency of the in-memory autocomplete index '
+            'filled with synthetic titles.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=1000000)
+        parser.add_argument('--words', type=int, default=4)
+        parser.add_argument('--lookups', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        random.seed(options['entries'])
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        vocabulary = [''.join(random.choice(letters) for _ in range(6))
+                      for _ in range(50000)]
+
+        def entries():
+            for pk in range(1, options['entries'] + 1):
+                words = random.sample(vocabulary, options['words'])
+                yield 2, pk, ' '.join(words), set(
+                    ' '.join(words[i:]) for i in range(len(words)))
+
+        index = AutocompleteIndex()
+        start = time.time()
+        index.load(entries())
+        self.stdout.write('Loaded {0} entries in {1:.1f} s.'.format(
+            len(index), time.time() - start))
+
+        self.stdout.write('{0:>8} {1:>12} {2:>12}'.format(
+            'prefix', 'mean (us)', 'max (us)'))
+        for length in (1, 2, 3, 6):
+            terms = [normalize(random.choice(vocabulary)[:length])
+                     for _ in range(options['lookups'])]
+            timings = []
+            for term in terms:
+                timings.append(timeit.timeit(lambda: index.lookup(term),
+                                             number=1))
+            self.stdout.write('{0:>8} {1:>12.1f} {2:>12.1f}'.format(
+                length, sum(timings) / len(timings) * 1e6,
+                max(timings) * 1e6))
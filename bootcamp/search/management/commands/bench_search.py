@@ -0,0 +1,76 @@
+from __future__ import unicode_literals
+
+import random
+import timeit
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from bootcamp.feeds.models import Feed
+from bootcamp.search import backends
+
+COMMON_WORDS = ('the a of and to in is it that for on with this be are '
+                'was as at by not or have from but').split()
+
+
+def _make_vocabulary(size):
+    random.seed(size)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(random.choice(letters) for _ in range(7))
+            for _ in range(size)]
+
+
+class Command(BaseCommand):
+    help = ('Compares the latency of a feed search through LIKE scans with '
+            'the one of the configured search backend. Runs inside a '
+            'transaction which is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--vocabulary', type=int, default=20000)
+        parser.add_argument('--queries', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        backend = backends.get_backend()
+        vocabulary = _make_vocabulary(options['vocabulary'])
+        queries = [vocabulary[0], vocabulary[1][:4],
+                   '{0} {1}'.format(COMMON_WORDS[0], vocabulary[2])]
+        queries.extend(random.sample(vocabulary, options['queries']))
+        with transaction.atomic():
+            user = User.objects.create_user(username='bench_search',
+                                            password='bench')
+            feeds = []
+            for i in range(rows):
+                words = random.sample(vocabulary, 8)
+                words.extend(random.sample(COMMON_WORDS, 4))
+                random.shuffle(words)
+                feeds.append(Feed(user=user, post=' '.join(words)))
+                if len(feeds) == 1000:
+                    Feed.objects.bulk_create(feeds)
+                    feeds = []
+            Feed.objects.bulk_create(feeds)
+            backend.rebuild(['feed'])
+
+            self.stdout.write('{0:>16} {1:>10} {2:>12} {3:>12}'.format(
+                'query', 'matches', 'like (ms)', 'index (ms)'))
+            for query in queries:
+                def like():
+                    matches = Feed.objects.filter(post__icontains=query,
+                                                  parent=None)
+                    return matches.count(), list(matches[:50])
+
+                def indexed():
+                    return backend.search('feed', query)
+
+                before = min(timeit.repeat(like, number=1,
+                                           repeat=options['repeat']))
+                after = min(timeit.repeat(indexed, number=1,
+                                          repeat=options['repeat']))
+                self.stdout.write(
+                    '{0:>16} {1:>10} {2:>12.2f} {3:>12.2f}'.format(
+                        query, indexed()[0], before * 1000, after * 1000))
+
+            transaction.set_rollback(True)
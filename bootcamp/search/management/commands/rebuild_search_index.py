@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from bootcamp.search import backends
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full text search index of feeds, articles, ' \
+           'questions and users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('indexes', nargs='*',
+                            help='Indexes to rebuild, all by default.')
+
+    def handle(self, *args, **options):
+        names = options['indexes']
+        for name in names:
+            if name not in backends.INDEXES:
+                raise CommandError('Unknown search index "{0}".'.format(name))
+
+        count = backends.get_backend().rebuild(names or None)
+        self.stdout.write('Indexed {0} rows.'.format(count))
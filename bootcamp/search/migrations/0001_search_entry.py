@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10 on 2026-10-18 18:38
+from __future__ import unicode_literals
+
+import re
+
+from django.db import migrations, models
+
+# The indexes as this migration builds them: name, model, weighted fields
+# and filters. They are frozen here so that later changes of
+# bootcamp.search.backends.INDEXES do not change what this migration does.
+INDEXES = [
+    ('feed', 'feeds.Feed', [('post', 1)], {'parent': None}),
+    ('articles', 'articles.Article', [('title', 2), ('content', 1)],
+     {'status': 'P'}),
+    ('questions', 'questions.Question', [('title', 2), ('description', 1)],
+     {}),
+    ('users', 'auth.User',
+     [('username', 2), ('first_name', 1), ('last_name', 1)], {}),
+    ]
+
+TERM_MAX_LENGTH = 64
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def get_terms(instance, fields):
+    terms = {}
+    for field, weight in fields:
+        for term in TERM_RE.findall((getattr(instance, field) or '').lower()):
+            term = term[:TERM_MAX_LENGTH]
+            terms[term] = terms.get(term, 0) + weight
+    return terms
+
+
+def tsvector_sql(model, fields):
+    vectors = []
+    for position, (field, weight) in enumerate(
+            sorted(fields, key=lambda field: -field[1])):
+        vectors.append(
+            "setweight(to_tsvector('simple', coalesce({0}, '')), "
+            "'{1}')".format(model._meta.get_field(field).column,
+                            'ABCD'[min(position, 3)]))
+    return ' || '.join(vectors)
+
+
+def gin_index_name(model):
+    return '{0}_search_gin'.format(model._meta.db_table)
+
+
+def build_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, label, fields, filters in INDEXES:
+            model = apps.get_model(label)
+            schema_editor.execute(
+                'CREATE INDEX {0} ON {1} USING gin (({2}))'.format(
+                    gin_index_name(model), model._meta.db_table,
+                    tsvector_sql(model, fields)))
+        return
+
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    entries = []
+    for name, label, fields, filters in INDEXES:
+        model = apps.get_model(label)
+        for instance in model.objects.filter(**filters).iterator():
+            for term, weight in get_terms(instance, fields).items():
+                entries.append(SearchEntry(
+                    index=name, term=term, object_id=instance.pk,
+                    weight=weight))
+    SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for name, label, fields, filters in INDEXES:
+            schema_editor.execute('DROP INDEX IF EXISTS {0}'.format(
+                gin_index_name(apps.get_model(label))))
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0008_alter_user_username_max_length'),
+        ('articles', '0006_auto_20171017_1720'),
+        ('feeds', '0002_timeline'),
+        ('questions', '0003_question_votes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=20)),
+                ('term', models.CharField(max_length=64)),
+                ('object_id', models.PositiveIntegerField()),
+                ('weight', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='searchentry',
+            index_together=set([('index', 'term'), ('index', 'object_id')]),
+        ),
+        migrations.RunPython(build_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+from __future__ import unicode_literals
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.utils.encoding import python_2_unicode_compatible
+
+from bootcamp.search import autocomplete, backends
+
+
+@python_2_unicode_compatible
+class SearchEntry(models.Model):
+    """Occurrences of a word in an object of a search index, used by the
+    ``DatabaseSearchBackend``.
+    """
+    index = models.CharField(max_length=20)
+    term = models.CharField(max_length=backends.TERM_MAX_LENGTH)
+    object_id = models.PositiveIntegerField()
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        index_together = (('index', 'term'), ('index', 'object_id'))
+
+    def __str__(self):
+        return '{0} {1} {2}'.format(self.index, self.term, self.object_id)
+
+
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    index = backends.get_index_for_model(sender)
+    fields = set(field for field, weight in index.fields) | set(index.filters)
+    if update_fields is None or fields & set(update_fields):
+        backends.get_backend().index(index.name, instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    index = backends.get_index_for_model(sender)
+    backends.get_backend().remove(index.name, instance.pk)
+
+
+def update_autocomplete(sender, instance, update_fields=None, **kwargs):
+    rank, source = autocomplete.get_source_for_model(sender)
+    fields = set(source.fields) | set(source.filters)
+    if update_fields is None or fields & set(update_fields):
+        autocomplete.update_instance(sender, instance)
+
+
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete.remove_instance(sender, instance)
+
+
+for search_index in backends.INDEXES.values():
+    post_save.connect(update_search_index, sender=search_index.model_label)
+    post_delete.connect(remove_from_search_index,
+                        sender=search_index.model_label)
+
+for source in autocomplete.SOURCES:
+    post_save.connect(update_autocomplete, sender=source.model_label)
+    post_delete.connect(remove_from_autocomplete, sender=source.model_label)
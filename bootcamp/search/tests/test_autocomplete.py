@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from bootcamp.articles.models import Article
+from bootcamp.questions.models import Question
+from bootcamp.search import autocomplete
+from bootcamp.search.autocomplete import AutocompleteIndex
+
+
+@override_settings(JOBS_ASYNC=False)
+class TestAutocomplete(TestCase):
+    """TestCase class to test the autocomplete suggestions
+    """
+
+    def setUp(self):
+        autocomplete.reset()
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret',
+            first_name='Tess',
+            last_name='Ter'
+        )
+        self.question = Question.objects.create(
+            user=self.user, title='How to test a Django view?',
+            description='Description')
+        self.article = Article.objects.create(
+            create_user=self.user, title='Testing Django views',
+            content='Content', status='P')
+
+    def test_index_lookup(self):
+        index = AutocompleteIndex()
+        index.load([(0, 1, 'tester', {'tester'}),
+                    (2, 1, 'Tea time', {'tea time', 'time'}),
+                    (2, 2, 'Test it', {'test it', 'it'})])
+        self.assertEqual(index.lookup('te'), [
+            (2, 1, 'Tea time'), (2, 2, 'Test it'), (0, 1, 'tester')])
+        self.assertEqual(index.lookup('te', limit=1), [(2, 1, 'Tea time')])
+        self.assertEqual(index.lookup('tim'), [(2, 1, 'Tea time')])
+        index.add(2, 1, 'Coffee time', {'coffee time', 'time'})
+        self.assertEqual(index.lookup('tea'), [])
+        self.assertEqual(index.lookup('co'), [(2, 1, 'Coffee time')])
+        index.remove(2, 1)
+        self.assertEqual(index.lookup('time'), [])
+        self.assertEqual(len(index), 2)
+
+    def test_suggestions(self):
+        self.assertEqual(
+            [suggestion['value'] for suggestion in
+             autocomplete.get_suggestions('DJANGO')],
+            ['How to test a Django view?', 'Testing Django views'])
+        self.assertEqual(autocomplete.get_suggestions('tess t'), [{
+            'id': self.user.pk, 'label': 'test_user', 'value': 'test_user'}])
+        self.assertEqual(autocomplete.get_suggestions('  '), [])
+
+    def test_suggestions_follow_changes(self):
+        autocomplete.get_suggestions('django')
+        self.article.status = 'D'
+        self.article.save()
+        self.question.title = 'Flask views'
+        self.question.save()
+        Question.objects.create(user=self.user, title='Django forms',
+                                description='Description')
+        with self.assertNumQueries(0):
+            suggestions = autocomplete.get_suggestions('django')
+        self.assertEqual([suggestion['value'] for suggestion in suggestions],
+                         ['Django forms'])
+        self.question.delete()
+        self.assertEqual(autocomplete.get_suggestions('flask'), [])
+
+    def test_lookup_does_not_wait_for_load(self):
+        # A load running in another thread holds the lock.
+        self.assertTrue(autocomplete._loading.acquire(False))
+        try:
+            self.assertIsNone(autocomplete.get_index())
+            self.assertEqual(
+                [suggestion['value'] for suggestion in
+                 autocomplete.get_suggestions('django')],
+                ['Testing Django views', 'How to test a Django view?'])
+        finally:
+            autocomplete._loading.release()
+        self.assertIsNotNone(autocomplete.get_index())
+
+    @override_settings(AUTOCOMPLETE_IN_MEMORY=False)
+    def test_database_suggestions(self):
+        self.assertEqual(
+            [suggestion['value'] for suggestion in
+             autocomplete.get_suggestions('django')],
+            ['Testing Django views', 'How to test a Django view?'])
+
+    def test_suggestions_json_is_cached(self):
+        autocomplete.get_suggestions_json('django')
+        with self.assertNumQueries(0):
+            self.assertIn('Testing Django views',
+                          autocomplete.get_suggestions_json('Django'))
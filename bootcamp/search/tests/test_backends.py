@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from bootcamp.articles.models import Article
+from bootcamp.feeds.models import Feed
+from bootcamp.search import backends
+from bootcamp.search.models import SearchEntry
+
+
+class TestDatabaseSearchBackend(TestCase):
+    """TestCase class to test the inverted index search backend
+    """
+
+    def setUp(self):
+        self.backend = backends.DatabaseSearchBackend()
+        self.user = get_user_model().objects.create_user(
+            username='test_user',
+            email='test@gmail.com',
+            password='top_secret'
+        )
+        self.feed = Feed.objects.create(user=self.user,
+                                        post='Django search engine')
+        self.other_feed = Feed.objects.create(
+            user=self.user, post='Search search search for a python search')
+
+    def test_tokenize(self):
+        self.assertEqual(backends.tokenize('Hello, World! hello'),
+                         ['hello', 'world', 'hello'])
+
+    def test_search_ranking(self):
+        count, results = self.backend.search('feed', 'search')
+        self.assertEqual(count, 2)
+        self.assertEqual(results, [self.other_feed, self.feed])
+
+    def test_search_every_word_prefix(self):
+        self.assertEqual(self.backend.search('feed', 'dja eng'),
+                         (1, [self.feed]))
+        self.assertEqual(self.backend.search('feed', 'django python'),
+                         (0, []))
+        self.assertEqual(self.backend.search('feed', '!!'), (0, []))
+
+    def test_index_updated_on_save_and_delete(self):
+        self.feed.post = 'Flask'
+        self.feed.save()
+        self.assertEqual(self.backend.search('feed', 'django'), (0, []))
+        self.assertEqual(self.backend.search('feed', 'flask'),
+                         (1, [self.feed]))
+        self.feed.delete()
+        self.assertFalse(SearchEntry.objects.filter(
+            index='feed', object_id=self.feed.pk).exists())
+
+    def test_filters(self):
+        self.feed.comment(self.user, 'A django comment')
+        article = Article.objects.create(create_user=self.user,
+                                         title='Django draft',
+                                         content='Content', status='D')
+        self.assertEqual(self.backend.search('feed', 'django')[0], 1)
+        self.assertEqual(self.backend.search('articles', 'django'), (0, []))
+        article.status = 'P'
+        article.save()
+        self.assertEqual(self.backend.search('articles', 'django'),
+                         (1, [article]))
+
+    def test_rebuild(self):
+        SearchEntry.objects.all().delete()
+        self.assertEqual(self.backend.rebuild(['feed']), 2)
+        self.assertEqual(self.backend.search('feed', 'django'),
+                         (1, [self.feed]))
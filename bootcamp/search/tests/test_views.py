@@ -1,13 +1,16 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.http import HttpResponseBadRequest
 from django.core.urlresolvers import reverse
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 
 from bootcamp.articles.models import Article
 from bootcamp.feeds.models import Feed
 from bootcamp.questions.models import Question
+from bootcamp.search import autocomplete
 
 
+@override_settings(JOBS_ASYNC=False)
 class TestViews(TestCase):
     """
     Includes tests for all the functionality
@@ -15,6 +18,8 @@ class TestViews(TestCase):
     """
 
     def setUp(self):
+        autocomplete.reset()
+        cache.clear()
         self.client = Client()
         self.other_client = Client()
         self.user = get_user_model().objects.create_user(
@@ -18,6 +18,34 @@ DATABASES = {
     )
 }
 
+# A file, unlike the default in-memory database, lets several connections
+# share the SQLite test database, e.g. in the concurrency tests.
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['TEST'] = {
+        'NAME': PROJECT_DIR.parent.child('test_db.sqlite3'),
+    }
+
+# Redis server shared by the worker processes, e.g. by the live updates.
+REDIS_URL = config('REDIS_URL', default='')
+
+# The unread notifications counters and the new feeds marks are kept in the
+# cache, which has to be shared by the worker processes. Without REDIS_URL,
+# e.g. in development, every process has its own cache and a single worker
+# process has to serve the site.
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
 
 # Application definition
@@ -74,6 +102,17 @@ TEMPLATES = [
     },
 ]
 
+if not DEBUG:
+    # Keep the compiled templates in memory instead of parsing the partials
+    # again on every render.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
 # Internationalization
 # https://docs.djangoproject.com/en/1.6/topics/i18n/
 
@@ -118,3 +157,67 @@ FILE_UPLOAD_TEMP_DIR = '/tmp/'
 FILE_UPLOAD_PERMISSIONS = 0o644
 
 TAGGIT_CASE_INSENSITIVE = True
+
+# Worker threads running the jobs out of the requests, see
+# bootcamp.core.jobs
+JOBS_ASYNC = True
+
+# Storage of the materialized feed timelines, see bootcamp.feeds.timeline
+FEEDS_TIMELINE_BACKEND = 'bootcamp.feeds.timeline.DatabaseTimelineBackend'
+FEEDS_LATEST_CACHE_TIMEOUT = 60
+
+# Feeds with as many likes and comments are hidden at once when removed
+# and purged by a worker thread, see bootcamp.feeds.models
+FEEDS_SOFT_DELETE_THRESHOLD = 1000
+FEEDS_WORKERS = 1
+
+# Live updates, see bootcamp.core.events. Without REDIS_URL the events only
+# reach the streams of their own process, so a single worker process has to
+# serve the site.
+if REDIS_URL:
+    EVENTS_BACKEND = 'bootcamp.core.events.RedisEventsBackend'
+else:
+    EVENTS_BACKEND = 'bootcamp.core.events.MemoryEventsBackend'
+EVENTS_STREAM_TIMEOUT = 300
+EVENTS_KEEPALIVE = 15
+
+# Full text search, see bootcamp.search.backends. Uses the PostgreSQL full
+# text search on PostgreSQL and an inverted index on the other databases
+# unless SEARCH_BACKEND is set.
+
+# Search box suggestions, see bootcamp.search.autocomplete
+AUTOCOMPLETE_IN_MEMORY = True
+AUTOCOMPLETE_INDEX_TIMEOUT = 300
+AUTOCOMPLETE_CACHE_TIMEOUT = 30
+
+# Markdown rendering, see bootcamp.core.markup. Run the render_markdown
+# management command after changing the extensions.
+MARKDOWN_EXTENSIONS = []
+MARKDOWN_CACHE_SIZE = 1000
+
+# Links of the feeds, keyword arguments of bleach.linkify. Run the
+# render_feeds management command after changing them.
+LINKIFY_OPTIONS = {}
+
+# Profile pictures processing, see bootcamp.core.images
+PROFILE_PICTURE_SIZES = (40, 80, 200)
+IMAGE_PROCESSING_ASYNC = True
+IMAGE_WORKERS = 2
+
+# Notifications unread counters, stored HTML and fan-out, see
+# bootcamp.activities.models
+NOTIFICATIONS_UNREAD_CACHE_TIMEOUT = 3600
+NOTIFICATIONS_STORE_HTML = True
+NOTIFICATIONS_COALESCE_WINDOW = 3600
+NOTIFICATIONS_ASYNC_THRESHOLD = 1000
+NOTIFICATIONS_WORKERS = 1
+
+# Exact counts of the paginated lists, see bootcamp.core.pagination
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+
+# Popular tags of the articles, see bootcamp.articles.models
+TAG_CLOUD_CACHE_TIMEOUT = 300
+
+# Counters changes polled by the browsers, see bootcamp.activities.counters.
+# Milliseconds of clock skew and transaction duration tolerated.
+COUNTERS_VERSION_MARGIN = 5000
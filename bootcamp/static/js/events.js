@@ -0,0 +1,18 @@
+/* Live updates pushed by the server through the /events/ stream.
+ *
+ * Every received event is triggered on the document as "bootcamp:<type>",
+ * with the event data as extra parameter. The scripts fall back to polling
+ * when the browser has no EventSource support, bootcamp_events is then null.
+ */
+var bootcamp_events = (function () {
+  if (!window.EventSource) {
+    return null;
+  }
+  var source = new EventSource("/events/");
+  $.each(["hello", "feed", "counter", "notification", "message"], function (i, type) {
+    source.addEventListener(type, function (evt) {
+      $(document).trigger("bootcamp:" + type, [JSON.parse(evt.data)]);
+    });
+  });
+  return source;
+})();
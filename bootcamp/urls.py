@@ -35,6 +35,7 @@ urlpatterns = [
     # For autocomplete suggestions
     url(r'^autocomplete/$', search_views.get_autocomplete_suggestions, name='autocomplete'),
     url(r'^search/$', search_views.search, name='search'),
+    url(r'^events/$', core_views.events, name='events'),
     url(r'^(?P<username>[^/]+)/$', core_views.profile, name='profile'),
     url(r'^i18n/', include('django.conf.urls.i18n', namespace='i18n')),
 